@@ -0,0 +1,160 @@
+import tkinter as tk
+import os
+import sys
+import supervisor
+import ipc
+
+# "hosted" runs apps as Toplevel windows inside the desktop's interpreter,
+# "process" starts a fresh interpreter per app (the original behaviour).
+LAUNCH_MODE = os.environ.get("PSEUDOOS_LAUNCH_MODE", "hosted")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PYTHON_EXEC = "python3" if sys.platform != "win32" else "python"
+
+
+# --- App factories: (window, username, args) -> app instance ---
+def _my_computer(root, username, args):
+    from my_computer import MyComputer
+    return MyComputer(root, username)
+
+def _calculator(root, username, args):
+    from calculator import Calculator
+    return Calculator(root, username)
+
+def _terminal(root, username, args):
+    from terminal import Terminal
+    return Terminal(root, username)
+
+def _notes(root, username, args):
+    from notes import NotesApp
+    return NotesApp(root, username, args[0] if args else None)
+
+def _snake(root, username, args):
+    from snake import SnakeGame
+    return SnakeGame(root, username)
+
+def _pong(root, username, args):
+    from pong import PongGame
+    return PongGame(root, username)
+
+def _tetris(root, username, args):
+    from tetris import InfiniteTetris
+    return InfiniteTetris(root)
+
+def _pathfinder(root, username, args):
+    from pathfinder import PathfinderOS
+    return PathfinderOS(root, username)
+
+def _taskmanager(root, username, args):
+    from taskmanager import TaskManager
+    return TaskManager(root, username)
+
+def _maze(root, username, args):
+    from maze import RetroExplorer
+    root.attributes("-fullscreen", True)
+    root.configure(bg="black")
+    return RetroExplorer(root)
+
+def _shooter(root, username, args):
+    from shooter import DoomClone
+    root.attributes("-fullscreen", True)
+    root.configure(bg="black")
+    return DoomClone(root)
+
+# Apps that hand later launches to the instance already running.
+SINGLE_INSTANCE_APPS = {"notes.py", "calculator.py", "taskmanager.py"}
+
+HOSTED_APPS = {
+    "my_computer.py": _my_computer,
+    "calculator.py": _calculator,
+    "terminal.py": _terminal,
+    "notes.py": _notes,
+    "snake.py": _snake,
+    "pong.py": _pong,
+    "tetris.py": _tetris,
+    "pathfinder.py": _pathfinder,
+    "taskmanager.py": _taskmanager,
+    "maze.py": _maze,
+    "shooter.py": _shooter,
+}
+
+
+class HostedWindow(tk.Toplevel):
+    def __init__(self, master, script_name):
+        super().__init__(master)
+        self.script_name = script_name
+        self.alive = True
+        self.app = None
+
+    def after(self, ms, func=None, *args):
+        # Apps schedule their loops on what they think is a private root.
+        # Drop those callbacks once the window is gone instead of letting
+        # them raise TclError against destroyed widgets.
+        if func is None:
+            return super().after(ms)
+
+        def guarded(*a):
+            if self.alive:
+                func(*a)
+        return super().after(ms, guarded, *args)
+
+    def destroy(self):
+        self.alive = False
+        super().destroy()
+
+
+class AppHost:
+    def __init__(self, root, username):
+        self.root = root
+        self.username = username
+        self.windows = []
+
+    def can_host(self, script_name):
+        return script_name in HOSTED_APPS
+
+    def launch(self, script_name, *args):
+        factory = HOSTED_APPS[script_name]
+        window = HostedWindow(self.root, script_name)
+        try:
+            window.app = factory(window, self.username, args)
+        except Exception:
+            window.destroy()
+            raise
+        self.windows = [w for w in self.windows if w.alive]
+        self.windows.append(window)
+        return window
+
+
+_host = None
+_pool = None
+
+def install_host(host):
+    global _host
+    _host = host
+
+def current_host():
+    return _host
+
+def install_pool(pool):
+    global _pool
+    _pool = pool
+
+def spawn_script(script_name, username, *args):
+    if _pool is not None and script_name in HOSTED_APPS:
+        try:
+            proc = _pool.launch(script_name, username, *args)
+            supervisor.session().register(proc, script_name, username)
+            return proc
+        except Exception as e:
+            print(f"[apphost] Warm worker launch of {script_name} failed ({e}), starting a new process")
+    script_path = os.path.join(BASE_DIR, script_name)
+    return supervisor.session().spawn([PYTHON_EXEC, script_path, username, *args], script_name, username)
+
+def launch_app(script_name, username, *args):
+    if script_name in SINGLE_INSTANCE_APPS and ipc.forward(username, script_name, args):
+        return None
+    if LAUNCH_MODE == "hosted" and _host is not None and _host.can_host(script_name):
+        try:
+            return _host.launch(script_name, *args)
+        except Exception as e:
+            print(f"[apphost] Hosted launch of {script_name} failed ({e}), starting a new process")
+    return spawn_script(script_name, username, *args)
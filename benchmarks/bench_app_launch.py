@@ -0,0 +1,101 @@
+# Compares the per-process launch path against hosted Toplevel windows.
+#
+#   python3 benchmarks/bench_app_launch.py [--runs N] [app.py ...]
+#
+# Reports time-to-first-frame per app and total RSS of everything that had to
+# stay resident to keep the apps open. Needs a display (or Xvfb).
+import tkinter as tk
+import os
+import sys
+import time
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from apphost import AppHost, HOSTED_APPS, PYTHON_EXEC
+
+DEFAULT_APPS = ["calculator.py", "notes.py", "terminal.py", "my_computer.py",
+                "snake.py", "pong.py", "tetris.py", "pathfinder.py"]
+
+
+def rss_kb(pid="self"):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def child_main(script_name):
+    # Runs inside a spawned interpreter: build the app exactly as its own
+    # __main__ would, wait for the first frame, then report and hold.
+    root = tk.Tk()
+    HOSTED_APPS[script_name](root, "bench", ())
+    root.wait_visibility()
+    root.update()
+    print(f"{time.time()} {rss_kb()}", flush=True)
+    sys.stdin.readline()
+
+
+def bench_process(apps):
+    procs, frames = [], {}
+    for script_name in apps:
+        start = time.time()
+        p = subprocess.Popen([PYTHON_EXEC, os.path.abspath(__file__), "--child", script_name],
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=BASE_DIR)
+        mapped_at, rss = p.stdout.readline().split()
+        frames[script_name] = float(mapped_at) - start
+        procs.append((p, int(rss)))
+    # The desktop itself is one more interpreter with a fullscreen root.
+    total = rss_kb() + sum(rss for _, rss in procs)
+    for p, _ in procs:
+        p.stdin.close()
+        p.wait()
+    return frames, total
+
+
+def bench_hosted(apps):
+    root = tk.Tk()
+    root.update()
+    host = AppHost(root, "bench")
+    frames = {}
+    for script_name in apps:
+        start = time.time()
+        window = host.launch(script_name)
+        window.wait_visibility()
+        window.update()
+        frames[script_name] = time.time() - start
+    total = rss_kb()
+    root.destroy()
+    return frames, total
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "--child":
+        child_main(args[1])
+        return
+
+    runs = 1
+    if args and args[0] == "--runs":
+        runs = int(args[1])
+        args = args[2:]
+    apps = args or DEFAULT_APPS
+
+    os.chdir(BASE_DIR)
+    for mode, bench in (("process", bench_process), ("hosted", bench_hosted)):
+        for run in range(runs):
+            frames, total = bench(apps)
+            print(f"== {mode} (run {run + 1}/{runs})")
+            for script_name, secs in frames.items():
+                print(f"  {script_name:<16} first frame {secs * 1000:8.1f} ms")
+            print(f"  total first frame  {sum(frames.values()) * 1000:8.1f} ms")
+            print(f"  total RSS          {total / 1024:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Calculator batch mode against evaluating one expression at a time.
+#
+#   python3 benchmarks/bench_calc_batch.py [--lines 100000] [--points 1000000]
+#
+# A file of generated expressions is evaluated line by line with
+# calcengine.evaluate (the calculator's own path) and with
+# calcbatch.evaluate_lines, and x^2 + sqrt(x) is evaluated over a range both
+# ways. The outputs are compared; formatting is included in every timing.
+# Lines and a range whose results are small but whose integer steps pass
+# 2^53, where float64 would lose the answer, are compared as well.
+# Install NumPy to see the vectorized numbers.
+import os
+import sys
+import time
+import random
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import calcbatch
+import calcengine
+
+RANGE_EXPRESSION = "x^2 + sqrt(x)"
+CANCELLING_RANGE = "(x^4 + x) - x^4"
+
+
+def make_lines(count):
+    rng = random.Random(1)
+    shapes = [
+        lambda: f"{rng.randint(0, 999)} {rng.choice('+-*/')} {rng.randint(1, 99)}",
+        lambda: f"sqrt({rng.uniform(0, 1000):.3f}) + {rng.randint(1, 9)}π",
+        lambda: f"({rng.randint(1, 50)} + {rng.random():.4f}) * {rng.randint(1, 9)}^2 mod 7",
+        lambda: f"{rng.randint(2, 9)}^{rng.randint(2, 70)}",
+        lambda: f"{rng.randint(1, 20)}!",
+        lambda: f"ln({rng.randint(0, 5)}) / {rng.randint(0, 3)}",
+    ]
+    return [rng.choice(shapes)() for _ in range(count)]
+
+
+def cancelling_lines():
+    # Each shape several times over, so batch mode vectorizes it.
+    lines = [f"(9007199254740991 + {k}) - 9007199254740990" for k in range(1, 50)]
+    lines += [f"({k}^34 + {k}) - {k}^34" for k in range(2, 40)]
+    lines += [f"94906267 * {94906267 + k} - 94906267 * {94906266 + k}" for k in range(30)]
+    return lines
+
+
+def one_at_a_time(text, **variables):
+    try:
+        return calcengine.format_result(calcengine.evaluate(text, **variables))
+    except calcengine.ExpressionError as e:
+        return calcbatch.ERROR + str(e)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    args = sys.argv[1:]
+    lines, points = 100000, 1000000
+    while args:
+        if args[0] == "--lines":
+            lines = int(args[1])
+        elif args[0] == "--points":
+            points = int(args[1])
+        args = args[2:]
+
+    print(f"NumPy: {'yes' if calcbatch.numpy is not None else 'no (scalar fallback)'}")
+    exprs = make_lines(lines)
+    calcengine.compile_expression.cache_clear()
+    single, single_s = timed(lambda: [one_at_a_time(line) for line in exprs])
+    batch, batch_s = timed(lambda: calcbatch.evaluate_lines(exprs, {}))
+    assert single == batch
+    print(f"{lines:,} expressions: one at a time {lines / single_s:>12,.0f}/s   batch {lines / batch_s:>12,.0f}/s"
+          f"   ({single_s / batch_s:.1f}x)")
+
+    exact = cancelling_lines()
+    assert calcbatch.evaluate_lines(exact, {}) == [one_at_a_time(line) for line in exact]
+    funcs = calcbatch.range_functions(CANCELLING_RANGE)
+    assert calcbatch.evaluate_range(funcs, 0, 1, 0, 20000)[1] == \
+        [one_at_a_time(CANCELLING_RANGE, x=x) for x in range(20000)]
+    print(f"{len(exact)} lines and 20,000 points with integer steps past 2^53: batch matches the engine")
+
+    funcs = calcbatch.range_functions(RANGE_EXPRESSION)
+    single, single_s = timed(lambda: [one_at_a_time(RANGE_EXPRESSION, x=x) for x in range(points)])
+    (xs, batch), batch_s = timed(lambda: calcbatch.evaluate_range(funcs, 0, 1, 0, points))
+    assert single == batch
+    print(f"{points:,} points of {RANGE_EXPRESSION}: one at a time {points / single_s:>12,.0f}/s   "
+          f"batch {points / batch_s:>12,.0f}/s   ({single_s / batch_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
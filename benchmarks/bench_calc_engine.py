@@ -0,0 +1,68 @@
+# Calculator expression engine against the old eval() path.
+#
+#   python3 benchmarks/bench_calc_engine.py [--runs N]
+#
+# For each expression: eval() of the Python spelling the old buttons built,
+# a cold parse and compile by the engine, and a cached evaluate. Also shows
+# how quickly over-budget expressions are rejected; under eval() 9**9**9
+# never finishes.
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import math
+import calcengine
+
+# (engine syntax, what the old calculator passed to eval)
+EXPRESSIONS = [
+    ("1+2*3", "1+2*3"),
+    ("(12.5-3)/4 mod 3", "(12.5-3)/4 % 3"),
+    ("2^10 + sqrt(16)", "2**10 + math.sqrt(16)"),
+    ("π*3^2", f"{math.pi}*3**2"),
+    ("e^2 - 1/3 + (4+5)*(6-7)^3", f"{math.e}**2 - 1/3 + (4+5)*(6-7)**3"),
+    ("+".join(["1.5*2"] * 50), "+".join(["1.5*2"] * 50)),
+]
+OVER_BUDGET = ["9^9^9", "(2^30)!", "10^(10^8)"]
+
+
+def per_call_us(func, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def main():
+    args = sys.argv[1:]
+    runs = 20000
+    while args:
+        if args[0] == "--runs":
+            runs = int(args[1])
+        args = args[2:]
+
+    cold = calcengine.compile_expression.__wrapped__
+    print(f"{'expression':<30} {'eval us':>9} {'parse+compile us':>17} {'cached us':>10}")
+    for text, python in EXPRESSIONS:
+        assert abs(calcengine.evaluate(text) - eval(python)) < 1e-9
+        old = per_call_us(lambda: eval(python), runs)
+        compiled = per_call_us(lambda: cold(text, ()), max(1, runs // 10))
+        cached = per_call_us(lambda: calcengine.evaluate(text), runs)
+        label = text if len(text) <= 30 else text[:27] + "..."
+        print(f"{label:<30} {old:>9.2f} {compiled:>17.2f} {cached:>10.2f}")
+
+    print()
+    for text in OVER_BUDGET:
+        start = time.perf_counter()
+        try:
+            calcengine.evaluate(text)
+            outcome = "evaluated"
+        except calcengine.BudgetError as e:
+            outcome = f"rejected: {e}"
+        print(f"{text:<12} {(time.perf_counter() - start) * 1000:8.3f} ms  {outcome}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# Opening the calculator history: the old history.txt path against the
+# paged store.
+#
+#   python3 benchmarks/bench_calc_history.py [--entries 100000]
+#
+# Writes a history.txt with that many entries, times the old load (read,
+# splitlines, one Text insert per entry), migrates it, then times opening the
+# store with its newest page rendered in one insert, paging older entries
+# and searching. The Text timings need a display (or Xvfb) and are skipped
+# without one.
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import calchistory
+
+RECENT = 200
+
+
+def make_text():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.withdraw()
+    return tk.Text(root)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    args = sys.argv[1:]
+    entries = 100000
+    while args:
+        if args[0] == "--entries":
+            entries = int(args[1])
+        args = args[2:]
+
+    workdir = tempfile.mkdtemp(prefix="pseudoos-calc-history-")
+    try:
+        legacy = os.path.join(workdir, calchistory.LEGACY_FILE)
+        with open(legacy, "w") as f:
+            for i in range(entries):
+                f.write(f"Sat 2026-01-03 10:{i // 60 % 60:02d}:{i % 60:02d}: {i}*3+1 = {i * 3 + 1}\n")
+        text = make_text()
+
+        def old_load():
+            with open(legacy) as f:
+                lines = f.read().splitlines()
+            if text is not None:
+                for line in lines:
+                    text.config(state="normal")
+                    text.insert("end", line + "\n")
+                    text.config(state="disabled")
+            return lines
+
+        _, old_ms = timed(old_load)
+        label = "read + per-entry insert" if text is not None else "read + splitlines (no display)"
+        print(f"{entries:,} entries, old history.txt: {label} {old_ms:.1f} ms")
+
+        _, migrate_ms = timed(lambda: calchistory.HistoryStore(workdir).close())
+        print(f"one-off migration to the store: {migrate_ms:.1f} ms")
+
+        def new_open():
+            store = calchistory.HistoryStore(workdir)
+            recent = store.page(RECENT)
+            if text is not None:
+                text.config(state="normal")
+                text.delete("1.0", "end")
+                text.insert("end", "".join(calchistory.format_entry(e) + "\n" for e in recent))
+                text.config(state="disabled")
+            return store, recent
+
+        (store, recent), open_ms = timed(new_open)
+        print(f"open store + newest {RECENT} rendered in one insert: {open_ms:.2f} ms")
+        pages = 0
+        first = recent[0][0]
+        start = time.perf_counter()
+        while pages < 50:
+            older = store.page(RECENT, before=first)
+            if not older:
+                break
+            first = older[0][0]
+            pages += 1
+        print(f"page of {RECENT} older entries: {(time.perf_counter() - start) * 1000 / max(pages, 1):.2f} ms")
+        for query in ("12345", "99*3", "nothing-matches"):
+            found, ms = timed(lambda: store.page(RECENT, query=query))
+            print(f"search {query!r}: {len(found)} shown in {ms:.1f} ms")
+        store.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Frame times of the calculator's Plot view.
+#
+#   python3 benchmarks/bench_calc_plot.py [--width 1200] [--height 700] [--samples 1000000]
+#
+# Times the first and a cached draw of a few curves, then zooms out and back
+# in (panning as it goes) until --samples samples are cached and pans across
+# them. Each frame is what the canvas gets redrawn from: calcplot's
+# polylines. The canvas calls themselves need a display and are not timed.
+# Without NumPy every frame samples each pixel column through the engine.
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import calcplot
+
+CURVES = ["sin(x)", "tan(x)", "sqrt(x)", "1/x", "x!", "sin(1/x)", "ln(x)"]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def summary(frames):
+    frames = sorted(frames)
+    return (f"median {frames[len(frames) // 2]:.2f} ms, p95 {frames[int(len(frames) * 0.95)]:.2f} ms, "
+            f"max {frames[-1]:.1f} ms")
+
+
+def main():
+    args = sys.argv[1:]
+    width, height, target = 1200, 700, 1000000
+    while args:
+        if args[0] == "--width":
+            width = int(args[1])
+        elif args[0] == "--height":
+            height = int(args[1])
+        elif args[0] == "--samples":
+            target = int(args[1])
+        args = args[2:]
+
+    print(f"{width}x{height} view, {'NumPy' if calcplot.numpy is not None else 'no NumPy'}")
+    for text in CURVES:
+        plot = calcplot.Plot(text)
+        runs, first_ms = timed(lambda: plot.polylines(-10, 10, -3, 3, width, height))
+        runs, cached_ms = timed(lambda: plot.polylines(-10, 10, -3, 3, width, height))
+        points = sum(map(len, runs)) // 2
+        print(f"{text:9} first {first_ms:5.1f} ms, cached {cached_ms:4.1f} ms, "
+              f"{plot.samples:,} samples, {len(runs)} lines, {points:,} points")
+
+    if calcplot.numpy is None:
+        return
+    plot = calcplot.Plot("sin(x) + 0.2sin(37x) + 0.05sin(1000x)")
+    x0, x1, y0, y1 = -10.0, 10.0, -1.6, 1.6
+    frames = []
+    while plot.samples < target and len(frames) < 20000:
+        factor = 0.97 if len(frames) // 80 % 2 else 1.03
+        middle, half = (x0 + x1) / 2 + (x1 - x0) * 0.01, (x1 - x0) / 2 * factor
+        x0, x1 = middle - half, middle + half
+        frames.append(timed(lambda: plot.polylines(x0, x1, y0, y1, width, height))[1])
+    print(f"zoom/pan, {len(frames)} frames until {plot.samples:,} samples in {len(plot.tiles)} tiles: "
+          f"{summary(frames)}")
+    frames = []
+    for _ in range(300):
+        shift = (x1 - x0) * 5 / width
+        x0, x1 = x0 + shift, x1 + shift
+        frames.append(timed(lambda: plot.polylines(x0, x1, y0, y1, width, height))[1])
+    print(f"pan over {plot.samples:,} cached samples: {summary(frames)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Bulk file operations in My Computer: how long the calling (Tk) thread is
+# blocked, and copy throughput per copy method.
+#
+#   python3 benchmarks/bench_file_ops.py [--files 100000] [--big-mb 512]
+#
+# Deletes a folder of --files small files with shutil.rmtree on the calling
+# thread, as the old delete did, then again through fileops while the
+# calling thread polls every 200 ms as the window does, timing the longest
+# poll. Copies one --big-mb file with each method fileops can use.
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import fileops
+
+
+def make_folder(path, files):
+    os.makedirs(path)
+    for i in range(files):
+        sub = os.path.join(path, f"dir{i // 1000:03d}")
+        if i % 1000 == 0:
+            os.mkdir(sub)
+        with open(os.path.join(sub, f"file{i:06d}"), "w") as f:
+            f.write("x" * (i % 512))
+
+
+def main():
+    args = sys.argv[1:]
+    files, big_mb = 100000, 512
+    while args:
+        if args[0] == "--files":
+            files = int(args[1])
+        elif args[0] == "--big-mb":
+            big_mb = int(args[1])
+        args = args[2:]
+
+    workdir = tempfile.mkdtemp(prefix="pseudoos-fileops-")
+    try:
+        folder = os.path.join(workdir, "many")
+        make_folder(folder, files)
+        start = time.perf_counter()
+        shutil.rmtree(folder)
+        print(f"delete {files:,} files, shutil.rmtree on the calling thread: blocked "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+        make_folder(folder, files)
+        start = time.perf_counter()
+        job = fileops.get().submit("delete", [folder])
+        longest = 0.0
+        while not job.finished.wait(0.2):
+            poll = time.perf_counter()
+            job.describe()
+            longest = max(longest, time.perf_counter() - poll)
+        print(f"delete through fileops: {(time.perf_counter() - start) * 1000:.0f} ms in the background, "
+              f"longest poll {longest * 1000:.2f} ms; {job.describe()}")
+
+        big = os.path.join(workdir, "big.bin")
+        with open(big, "wb") as f:
+            for _ in range(big_mb):
+                f.write(os.urandom(1 << 20))
+        for method in ("copy_file_range", "sendfile", "read"):
+            job = fileops.FileJob("copy", [big], workdir)
+            job.copy_method = method
+            dst = os.path.join(workdir, f"copy-{method}.bin")
+            job.start()
+            try:
+                job.copy_file(big, dst)
+            except (OSError, AttributeError) as e:
+                print(f"copy {big_mb} MB with {method}: not available ({e})")
+                continue
+            seconds = time.perf_counter() - job.started
+            print(f"copy {big_mb} MB with {method}: {seconds * 1000:.0f} ms, {big_mb / seconds:,.0f} MB/s"
+                  + (f" (fell back to {job.copy_method})" if job.copy_method != method else ""))
+            os.unlink(dst)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
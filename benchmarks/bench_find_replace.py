@@ -0,0 +1,108 @@
+# Find and replace in Notes on a large buffer.
+#
+#   python3 benchmarks/bench_find_replace.py [--mb 50]
+#
+# Times the pieces Notes runs for find/replace on a generated document:
+# counting literal and regex matches over the Python copy of the buffer,
+# the search behind one "Next", highlighting one screenful, replace-all as a
+# single subn, and replace-all block by block as large-file mode does it.
+# Also reports the longest single slice, which is how long the UI can go
+# without repainting. The widget update itself needs a display and is not
+# included.
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import textsearch
+from bigfile import LargeDocument
+
+CASES = [("literal", "timeout", False), ("regex", r"worker-\d+7 ", True)]
+
+
+def make_text(mb):
+    line = "2026-01-01 12:00:%02d INFO worker-%05d handled request %d, no timeout\n"
+    lines, size, i = [], 0, 0
+    while size < mb * 1024 * 1024:
+        text = line % (i % 60, i % 100000, i) if i % 50 else line.replace("no timeout", "timeout after 30s") % (i % 60, i % 100000, i)
+        lines.append(text)
+        size += len(text)
+        i += 1
+    return "".join(lines)
+
+
+def run(steps):
+    # Drives a generator the way SlicedJob does and returns the total and
+    # longest slice in ms.
+    longest = 0
+    start = time.perf_counter()
+    done = False
+    while not done:
+        slice_start = time.perf_counter()
+        deadline = slice_start + textsearch.SLICE_SECONDS
+        try:
+            while time.perf_counter() < deadline:
+                next(steps)
+        except StopIteration:
+            done = True
+        longest = max(longest, time.perf_counter() - slice_start)
+    return (time.perf_counter() - start) * 1000, longest * 1000
+
+
+def main():
+    args = sys.argv[1:]
+    mb = 50
+    while args:
+        if args[0] == "--mb":
+            mb = int(args[1])
+        args = args[2:]
+
+    text = make_text(mb)
+    screen = text[len(text) // 2:len(text) // 2 + 60 * 80]
+    workdir = tempfile.mkdtemp(prefix="pseudoos-find-")
+    try:
+        print(f"document: {len(text) / 1048576:.0f} MB, {text.count(chr(10))} lines")
+        for name, query, regex in CASES:
+            pattern = textsearch.compile_query(query, regex=regex)
+            progress = {"count": 0}
+            total, longest = run(textsearch.count_matches(pattern, [text], progress))
+
+            start = time.perf_counter()
+            pattern.search(text, len(text) // 2)
+            next_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            sum(1 for _ in pattern.finditer(screen))
+            screen_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            _, replaced = pattern.subn("X", text)
+            subn_ms = (time.perf_counter() - start) * 1000
+
+            path = os.path.join(workdir, "doc.txt")
+            with open(path, "w") as f:
+                f.write(text)
+            doc = LargeDocument(path)
+            doc.build_index()
+            blocks = ((i, doc.read_block(i)) for i in range(len(doc.blocks)))
+            block_progress = {"count": 0}
+            block_total, block_longest = run(textsearch.replace_segments(pattern, "X", blocks, doc.set_block, block_progress))
+            doc.close()
+
+            print(f"{name} {query!r}: {progress['count']} matches")
+            print(f"  count:                {total:8.1f} ms (longest slice {longest:.1f} ms)")
+            print(f"  next from mid-buffer: {next_ms:8.3f} ms")
+            print(f"  highlight one screen: {screen_ms:8.3f} ms")
+            print(f"  replace all (subn):   {subn_ms:8.1f} ms, {replaced} replaced")
+            print(f"  replace all (blocks): {block_total:8.1f} ms (longest slice {block_longest:.1f} ms), "
+                  f"{block_progress['count']} replaced")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
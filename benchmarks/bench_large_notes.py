@@ -0,0 +1,88 @@
+# Large-file mode for Notes: indexing, block reads and saves.
+#
+#   python3 benchmarks/bench_large_notes.py [--mb 200]
+#
+# Writes a log-like file of the given size, then times what Notes does with
+# it in large-file mode: building the block index, reading one block for the
+# viewport, saving a same-size edit in place and saving an edit that changes
+# the file's length. The old path (read the whole file and decode it) is
+# timed for comparison; the widget insert it also did is not included.
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from bigfile import LargeDocument
+
+
+def write_file(path, mb):
+    line = "2026-01-01 12:00:00 INFO worker-%05d processed request in %4d ms\n"
+    with open(path, "w") as f:
+        i = 0
+        while f.tell() < mb * 1024 * 1024:
+            f.write("".join(line % (i + j, (i + j) % 9999) for j in range(10000)))
+            i += 10000
+
+
+def main():
+    args = sys.argv[1:]
+    mb = 200
+    while args:
+        if args[0] == "--mb":
+            mb = int(args[1])
+        args = args[2:]
+
+    workdir = tempfile.mkdtemp(prefix="pseudoos-notes-")
+    try:
+        path = os.path.join(workdir, "big.log")
+        write_file(path, mb)
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            f.read()
+        full_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        doc = LargeDocument(path)
+        doc.build_index()
+        index = time.perf_counter() - start
+
+        middle = len(doc.blocks) // 2
+        start = time.perf_counter()
+        text = doc.read_block(middle)
+        read = time.perf_counter() - start
+
+        doc.set_block(middle, text.replace("INFO", "WARN", 1))
+        start = time.perf_counter()
+        doc.save()
+        in_place = time.perf_counter() - start
+
+        doc.set_block(middle, "inserted line\n" + doc.read_block(middle))
+        start = time.perf_counter()
+        doc.save()
+        rewrite = time.perf_counter() - start
+
+        ok = (os.path.getsize(path) == size + len("inserted line\n")
+              and doc.read_block(middle).startswith("inserted line\n")
+              and "WARN" in doc.read_block(middle))
+        doc.close()
+
+        print(f"file: {size / 1048576:.0f} MB, {len(doc.blocks)} blocks")
+        print(f"whole-file read + decode (old load): {full_read * 1000:8.1f} ms")
+        print(f"block index (background thread):    {index * 1000:8.1f} ms")
+        print(f"read one block for the viewport:    {read * 1000:8.3f} ms")
+        print(f"save, same-size edit (in place):    {in_place * 1000:8.3f} ms")
+        print(f"save, edit that changes the length: {rewrite * 1000:8.1f} ms")
+        print("PASS" if ok else "FAIL")
+        sys.exit(0 if ok else 1)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
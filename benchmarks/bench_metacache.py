@@ -0,0 +1,183 @@
+# Filesystem calls made by Terminal and My Computer navigation: the old
+# listdir/isdir/scandir code against the shared metacache.DirCache, with
+# inotify and with the mtime-polling fallback.
+#
+#   python3 benchmarks/bench_metacache.py [--depth 8] [--files 200] [--rounds 5]
+#
+# Builds a tree --depth folders deep with --files files per folder, then
+# replays a session several times over: cd down to the bottom running ls at
+# each level, tree from halfway down, cd back up; then My Computer opening
+# each folder on the way down, going back, and one create + delete at the
+# top. The first session, which fills the cache, is reported apart. Calls
+# are counted at the os module (stat, lstat, listdir, scandir, each
+# DirEntry.stat and the inotify read); each is one system call.
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import metacache
+
+COUNTED = ["stat", "lstat", "listdir", "scandir", "read"]
+calls = {name: 0 for name in COUNTED + ["DirEntry.stat"]}
+
+
+class CountedEntry:
+    def __init__(self, entry):
+        self.entry = entry
+        self.name = entry.name
+
+    def is_dir(self, follow_symlinks=True):
+        return self.entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def stat(self, follow_symlinks=True):
+        calls["DirEntry.stat"] += 1
+        return self.entry.stat(follow_symlinks=follow_symlinks)
+
+
+class CountedScandir:
+    def __init__(self, it):
+        self.it = it
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.it.close()
+
+    def __iter__(self):
+        return (CountedEntry(entry) for entry in self.it)
+
+
+def install_counters():
+    for name in COUNTED:
+        real = getattr(os, name)
+
+        def counted(*args, _real=real, _name=name, **kwargs):
+            calls[_name] += 1
+            result = _real(*args, **kwargs)
+            return CountedScandir(result) if _name == "scandir" else result
+        setattr(os, name, counted)
+
+
+# --- The code before the cache ---
+class OldApps:
+    def ls(self, path):
+        return sorted(os.listdir(path))
+
+    def tree(self, path):
+        names = []
+        for name in sorted(os.listdir(path)):
+            names.append(name)
+            if os.path.isdir(os.path.join(path, name)):
+                names += self.tree(os.path.join(path, name))
+        return names
+
+    def cd(self, path):
+        return os.path.isdir(os.path.abspath(path))
+
+    def open_folder(self, path):
+        return metacache.scan_dir(path)
+
+
+class CachedApps:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def ls(self, path):
+        return sorted(entry[0] for entry in self.cache.listing(path))
+
+    def tree(self, path):
+        names = []
+        for name, is_dir, size, mtime in sorted(self.cache.listing(path)):
+            names.append(name)
+            if is_dir:
+                names += self.tree(os.path.join(path, name))
+        return names
+
+    def cd(self, path):
+        return self.cache.is_dir(os.path.abspath(path))
+
+    def open_folder(self, path):
+        return self.cache.listing(path)
+
+
+def session(apps, levels):
+    for path in levels:
+        apps.cd(path)
+        apps.ls(path)
+    apps.tree(levels[len(levels) // 2])
+    for path in reversed(levels):
+        apps.cd(path)
+    for path in levels:
+        apps.open_folder(path)
+    for path in reversed(levels):
+        apps.open_folder(path)
+    new_file = os.path.join(levels[0], "new.txt")
+    open(new_file, "w").close()
+    apps.open_folder(levels[0])
+    os.remove(new_file)
+    apps.open_folder(levels[0])
+
+
+def main():
+    args = sys.argv[1:]
+    depth, files, rounds = 8, 200, 5
+    while args:
+        if args[0] == "--depth":
+            depth = int(args[1])
+        elif args[0] == "--files":
+            files = int(args[1])
+        elif args[0] == "--rounds":
+            rounds = int(args[1])
+        args = args[2:]
+
+    workdir = tempfile.mkdtemp(prefix="pseudoos-metacache-")
+    cwd = os.getcwd()
+    try:
+        os.chdir(workdir)
+        levels = [os.path.abspath(os.path.join("users", "bench"))]
+        for level in range(depth):
+            levels.append(os.path.join(levels[-1], f"level{level}"))
+        for path in levels:
+            os.makedirs(path, exist_ok=True)
+            for i in range(files):
+                with open(os.path.join(path, f"file{i:04d}.txt"), "w") as f:
+                    f.write("x" * i)
+        install_counters()
+
+        inotify = metacache.DirCache("bench")
+        polling = metacache.DirCache("bench")
+        if polling.inotify is not None:
+            os.close(polling.inotify.fd)
+            polling.inotify = None
+        runs = [("old listdir/isdir", OldApps()), ("cache, polling", CachedApps(polling))]
+        if inotify.inotify is not None:
+            runs.append(("cache, inotify", CachedApps(inotify)))
+        else:
+            print("no inotify here: only the polling fallback is measured")
+        print(f"{depth + 1} folders deep, {files} files each, {rounds} rounds")
+        for label, apps in runs:
+            # The first session fills the cache; the rest are what repeat
+            # navigation costs.
+            for first, count in ((True, 1), (False, rounds)):
+                for name in calls:
+                    calls[name] = 0
+                start = time.perf_counter()
+                for _ in range(count):
+                    session(apps, levels)
+                ms = (time.perf_counter() - start) * 1000 / count
+                detail = ", ".join(f"{name} {n // count}" for name, n in calls.items() if n)
+                print(f"{label:18} {'first' if first else 'later'} {sum(calls.values()) // count:6} calls "
+                      f"per session ({detail}); {ms:.1f} ms")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# Listing a large folder in My Computer: the old listdir + isdir + one
+# Frame and two Buttons per entry against one scandir pass and recycled rows.
+#
+#   python3 benchmarks/bench_my_computer.py [--entries 100000] [--widgets 20000]
+#
+# Creates a folder with that many files (one in fifty a subfolder), then
+# times the listing, the re-sorts, and the widget side: the old code's
+# widgets for the first --widgets entries (it would make them for every
+# entry) and the new view's load, scrolls and re-sorts. The widget timings
+# need a display (or Xvfb) and are skipped without one.
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import metacache
+import my_computer
+
+
+def make_root():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.geometry("1200x800")
+    return root
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def old_listing(path):
+    items = sorted(os.listdir(path))
+    return [(item, os.path.isdir(os.path.join(path, item))) for item in items]
+
+
+def old_widgets(root, items):
+    import tkinter as tk
+    frame = tk.Frame(root, bg="black")
+    frame.pack(fill="both", expand=True)
+    for item, is_dir in items:
+        item_frame = tk.Frame(frame, bg="black")
+        item_frame.pack(fill="x", padx=40, pady=2)
+        tk.Button(item_frame, text=f"[Folder] {item}" if is_dir else f"[File]   {item}",
+                  fg="#00FF00", bg="black", anchor="w", relief="flat").pack(side="left", fill="x", expand=True)
+        tk.Button(item_frame, text="Delete", fg="red", bg="black").pack(side="right")
+    root.update()
+    return frame
+
+
+def main():
+    args = sys.argv[1:]
+    entries, widgets = 100000, 20000
+    while args:
+        if args[0] == "--entries":
+            entries = int(args[1])
+        elif args[0] == "--widgets":
+            widgets = int(args[1])
+        args = args[2:]
+
+    workdir = tempfile.mkdtemp(prefix="pseudoos-my-computer-")
+    try:
+        for i in range(entries):
+            path = os.path.join(workdir, f"item{i:06d}")
+            if i % 50 == 0:
+                os.mkdir(path)
+            else:
+                with open(path + ".txt", "w") as f:
+                    f.write("x" * (i % 4096))
+
+        items, old_ms = timed(lambda: old_listing(workdir))
+        print(f"{entries:,} entries, old listdir + sort + isdir each: {old_ms:.0f} ms")
+        scanned, scan_ms = timed(lambda: metacache.scan_dir(workdir))
+        print(f"one scandir pass with sizes and mtimes: {scan_ms:.0f} ms")
+        for key in my_computer.SORT_KEYS:
+            _, sort_ms = timed(lambda: scanned.sort(key=my_computer.SORT_KEYS[key]))
+            print(f"sort by {key}: {sort_ms:.1f} ms")
+
+        root = make_root()
+        if root is None:
+            print("no display: widget timings skipped")
+            return
+        before = rss_mb()
+        frame, widget_ms = timed(lambda: old_widgets(root, items[:widgets]))
+        print(f"old widgets for {min(widgets, entries):,} entries: {widget_ms:.0f} ms, "
+              f"+{rss_mb() - before:.0f} MB")
+        frame.destroy()
+        root.update()
+
+        # Built without its first listing, then pointed at the test folder.
+        app = my_computer.MyComputer.__new__(my_computer.MyComputer)
+        app.load_directory = lambda: None
+        app.__init__(root, "bench")
+        del app.load_directory
+        app.base_dir = app.current_path = workdir
+        root.update()
+        before = rss_mb()
+        _, load_ms = timed(lambda: (app.load_directory(), root.update()))
+        print(f"new view, scan + sort + {len(app.rows)} rows: {load_ms:.0f} ms, +{rss_mb() - before:.0f} MB")
+        frames = []
+        for step in range(200):
+            frames.append(timed(lambda: (app.scroll_rows("scroll", 3, "units"), root.update()))[1])
+        frames.sort()
+        print(f"scroll by {my_computer.WHEEL_ROWS} rows: median {frames[100]:.2f} ms, max {frames[-1]:.1f} ms")
+        for key in ("Size", "Modified", "Name"):
+            _, sort_ms = timed(lambda: (app.set_sort(key), root.update()))
+            print(f"re-sort by {key} and redraw: {sort_ms:.0f} ms")
+        root.destroy()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Full-text search over a user's notes.
+#
+#   python3 benchmarks/bench_note_search.py [--notes 10000]
+#
+# Fills a temporary users/<name>/notes tree with generated notes, then times
+# the first index build, a rescan from the saved snapshot, single-file
+# updates and a set of queries. The old way of finding something, reading
+# every note and checking for the word, is timed for comparison.
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import statistics
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from noteindex import NoteIndex
+
+WORDS = [f"w{i}" for i in range(20000)] + ["meeting", "budget", "roadmap", "invoice", "holiday"]
+QUERIES = ["meeting", "budget roadmap", "invoice holiday meeting", "w42", "w123 w9999", "road", "nothinglikethis"]
+
+
+def write_notes(notes_dir, count):
+    rng = random.Random(1)
+    for i in range(count):
+        folder = os.path.join(notes_dir, f"folder{i % 50}")
+        os.makedirs(folder, exist_ok=True)
+        lines = [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(rng.randint(5, 40))]
+        with open(os.path.join(folder, f"note{i}.txt"), "w") as f:
+            f.write("\n".join(lines))
+
+
+def run_scan(username):
+    index = NoteIndex(username)
+    start = time.perf_counter()
+    index.rescan()
+    index.ready.wait()
+    return index, time.perf_counter() - start
+
+
+def main():
+    args = sys.argv[1:]
+    count = 10000
+    while args:
+        if args[0] == "--notes":
+            count = int(args[1])
+        args = args[2:]
+
+    workdir = tempfile.mkdtemp(prefix="pseudoos-search-")
+    cwd = os.getcwd()
+    try:
+        os.chdir(workdir)
+        notes_dir = os.path.abspath(os.path.join("users", "bench", "notes"))
+        write_notes(notes_dir, count)
+
+        index, build = run_scan("bench")
+        _, rescan = run_scan("bench")
+
+        target = os.path.join(notes_dir, "folder0", "note0.txt")
+        with open(target, "a") as f:
+            f.write("\nzebracrossing")
+        start = time.perf_counter()
+        index.update(target)
+        while not index.search("zebracrossing"):
+            time.sleep(0.0005)
+        update = time.perf_counter() - start
+
+        print(f"{count} notes: first build {build:.2f}s, rescan from snapshot {rescan:.2f}s, "
+              f"single-file update visible after {update * 1000:.1f} ms")
+        print(f"{'query':<26} {'results':>8} {'median ms':>10} {'scan all ms':>12}")
+        for query in QUERIES:
+            times = []
+            for _ in range(20):
+                start = time.perf_counter()
+                results = index.search(query)
+                times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            words = query.split()
+            for dirpath, _, filenames in os.walk(notes_dir):
+                for name in filenames:
+                    with open(os.path.join(dirpath, name)) as f:
+                        text = f.read()
+                    all(w in text for w in words)
+            scan = time.perf_counter() - start
+            print(f"{query:<26} {len(results):>8} {statistics.median(times) * 1000:>10.3f} {scan * 1000:>12.1f}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Launch latency with and without the warm worker pool.
+#
+#   python3 benchmarks/bench_pool_launch.py [--runs N] [app.py]
+#
+# "cold" hands the launch to a freshly spawned worker, which is what a plain
+# Popen pays; "warm" hands it to a worker that finished preloading first.
+# Latency is measured from the launch request to the app's first frame.
+# Needs a display (or Xvfb).
+import os
+import sys
+import statistics
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from zygote import WorkerPool
+
+
+def measure(pool, script_name):
+    pool.launch(script_name, "bench")
+    worker = pool.last_worker
+    worker.started.wait(60)
+    latency = worker.launch_latency()
+    worker.terminate()
+    worker.proc.wait()
+    return latency
+
+
+def main():
+    args = sys.argv[1:]
+    runs = 5
+    if args and args[0] == "--runs":
+        runs = int(args[1])
+        args = args[2:]
+    script_name = args[0] if args else "calculator.py"
+    os.chdir(BASE_DIR)
+
+    cold_pool = WorkerPool(size=0, refill_delay="off")
+    cold = [measure(cold_pool, script_name) for _ in range(runs)]
+    cold_pool.shutdown()
+
+    warm = []
+    warm_pool = WorkerPool(size=1, refill_delay="off")
+    for _ in range(runs):
+        warm_pool.fill()
+        for worker in warm_pool.idle:
+            worker.ready.wait(60)
+        warm.append(measure(warm_pool, script_name))
+    warm_pool.shutdown()
+
+    for label, samples in (("cold", cold), ("warm", warm)):
+        samples = [s * 1000 for s in samples if s is not None]
+        print(f"{label:<5} {script_name}: median {statistics.median(samples):8.1f} ms"
+              f"  min {min(samples):8.1f} ms  max {max(samples):8.1f} ms  (n={len(samples)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# Boot-to-desktop startup benchmark.
+#
+#   python3 benchmarks/bench_startup.py [--runs N] [--timeout SECS]
+#   python3 benchmarks/bench_startup.py --report TRACE_FILE
+#
+# Runs os.py -> boot.py -> login.py -> desktop.py unattended in a scratch
+# working directory with PSEUDOOS_TRACE set, stops the session once the
+# desktop is ready for input, and prints a per-stage breakdown. The first
+# run starts with no byte-code caches (cold), the rest reuse them (warm).
+# The --report form summarises a trace recorded by hand. Needs a display
+# (or Xvfb).
+import os
+import sys
+import time
+import shutil
+import signal
+import tempfile
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import startup_trace
+
+STAGES = ["os", "boot", "login", "desktop"]
+BENCH_USER = "bench"
+BENCH_PASSWORD = "bench"
+
+
+def first(events, stage, event):
+    for e in events:
+        if e["stage"] == stage and e["event"] == event:
+            return e["ts"]
+    return None
+
+
+def breakdown(events):
+    rows = []
+    for i, stage in enumerate(STAGES):
+        spawn = first(events, stage, "spawn")
+        imports = first(events, stage, "imports_done")
+        mapped = first(events, stage, "mapped")
+        ready = first(events, stage, "ready")
+        handoff = first(events, STAGES[i + 1], "spawn") if i + 1 < len(STAGES) else None
+        exit_ts = first(events, stage, "exit")
+        rows.append((stage, spawn, imports, mapped, ready, handoff, exit_ts))
+    return rows
+
+
+def span(a, b):
+    return f"{(b - a) * 1000:9.1f}" if a is not None and b is not None else "        -"
+
+
+def report(events, label):
+    rows = breakdown(events)
+    print(f"== {label}")
+    print("  stage    spawn>imports imports>mapped mapped>ready ready>handoff handoff>exit   (ms)")
+    for stage, spawn, imports, mapped, ready, handoff, exit_ts in rows:
+        print(f"  {stage:<8} {span(spawn, imports)}     {span(imports, mapped)}      "
+              f"{span(mapped, ready)}    {span(ready, handoff)}     {span(handoff, exit_ts)}")
+    start = rows[0][1]
+    end = rows[-1][4]
+    print(f"  total boot-to-desktop: {span(start, end).strip()} ms")
+    return (end - start) if start is not None and end is not None else None
+
+
+def clear_bytecode():
+    for dirpath, dirnames, _ in os.walk(BASE_DIR):
+        if "__pycache__" in dirnames:
+            shutil.rmtree(os.path.join(dirpath, "__pycache__"), ignore_errors=True)
+
+
+def run_once(workdir, timeout):
+    trace_file = os.path.join(workdir, "trace.jsonl")
+    if os.path.exists(trace_file):
+        os.remove(trace_file)
+    env = dict(os.environ,
+               PSEUDOOS_TRACE=trace_file,
+               PSEUDOOS_AUTOBOOT="1",
+               PSEUDOOS_AUTOLOGIN=f"{BENCH_USER}:{BENCH_PASSWORD}")
+
+    startup_trace.TRACE_FILE = trace_file
+    startup_trace.spawning("os")
+    splash = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, "os.py")], cwd=workdir, env=env)
+
+    events = []
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        time.sleep(0.05)
+        if os.path.exists(trace_file):
+            events = startup_trace.load(trace_file)
+            if first(events, "desktop", "ready") is not None:
+                break
+
+    for pid in {e["pid"] for e in events} - {os.getpid()}:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+    splash.wait()
+    return events
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "--report":
+        report(startup_trace.load(args[1]), args[1])
+        return
+
+    runs, timeout = 3, 60.0
+    while args:
+        if args[0] == "--runs":
+            runs = int(args[1])
+        elif args[0] == "--timeout":
+            timeout = float(args[1])
+        args = args[2:]
+
+    workdir = tempfile.mkdtemp(prefix="pseudoos-startup-")
+    with open(os.path.join(workdir, "users.txt"), "w") as f:
+        f.write(f"{BENCH_USER}|{BENCH_PASSWORD}\n")
+
+    totals = {"cold": [], "warm": []}
+    try:
+        for run in range(runs):
+            kind = "cold" if run == 0 else "warm"
+            if kind == "cold":
+                clear_bytecode()
+            total = report(run_once(workdir, timeout), f"{kind} run {run + 1}/{runs}")
+            if total is not None:
+                totals[kind].append(total)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for kind, samples in totals.items():
+        if samples:
+            print(f"{kind} startup: {min(samples) * 1000:.1f} ms best, "
+                  f"{sum(samples) / len(samples) * 1000:.1f} ms mean over {len(samples)} run(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Terminal output throughput: the old write_output (state toggle, insert and
+# see per call) against the buffered pipeline with its bounded scrollback.
+#
+#   python3 benchmarks/bench_terminal_output.py [--lines 1000000] [--old-lines 20000]
+#
+# Writes --lines lines through Terminal.write_output the way tree and grep
+# do, one call per line, and reports lines per second until they are on
+# screen: once as a single burst from one command, and once streamed in
+# chunks with the event loop running in between. The old path is timed on
+# --old-lines lines (it slows down as the widget grows, so the full count
+# would take minutes) with the same widget. Needs a display (or Xvfb).
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import terminal
+
+STREAM_CHUNK = 5000
+
+
+def old_write(output, text):
+    import tkinter as tk
+    output.config(state="normal")
+    output.insert(tk.END, text)
+    output.config(state="disabled")
+    output.see(tk.END)
+
+
+def drain(root, term):
+    # Runs the event loop until everything written is on screen.
+    while term.pending or term.flush_after is not None:
+        root.update()
+    root.update()
+
+
+def main():
+    args = sys.argv[1:]
+    lines, old_lines = 1000000, 20000
+    while args:
+        if args[0] == "--lines":
+            lines = int(args[1])
+        elif args[0] == "--old-lines":
+            old_lines = int(args[1])
+        args = args[2:]
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        print(f"needs a display (or Xvfb): {e}")
+        return
+    root.geometry("1200x800")
+    term = terminal.Terminal(root, "bench")
+    drain(root, term)
+    text = [f"users/bench/notes/folder{i // 100:05d}/note{i:07d}.txt\n" for i in range(lines)]
+
+    term.output.config(state="normal")
+    term.output.delete("1.0", tk.END)
+    start = time.perf_counter()
+    for line in text[:old_lines]:
+        old_write(term.output, line)
+    root.update()
+    seconds = time.perf_counter() - start
+    print(f"old write_output: {old_lines:,} lines in {seconds:.2f} s, {old_lines / seconds:,.0f} lines/s, "
+          f"{int(term.output.index('end-1c').split('.')[0]):,} lines kept")
+
+    term.output.config(state="normal")
+    term.output.delete("1.0", tk.END)
+    start = time.perf_counter()
+    for line in text:
+        term.write_output(line)
+    drain(root, term)
+    seconds = time.perf_counter() - start
+    print(f"buffered, one burst: {lines:,} lines in {seconds:.2f} s, {lines / seconds:,.0f} lines/s, "
+          f"{int(term.output.index('end-1c').split('.')[0]):,} lines kept")
+
+    start = time.perf_counter()
+    for first in range(0, lines, STREAM_CHUNK):
+        for line in text[first:first + STREAM_CHUNK]:
+            term.write_output(line)
+        root.update()
+    drain(root, term)
+    seconds = time.perf_counter() - start
+    print(f"buffered, streamed in chunks of {STREAM_CHUNK:,}: {lines / seconds:,.0f} lines/s, "
+          f"{int(term.output.index('end-1c').split('.')[0]):,} lines kept "
+          f"(scrollback {terminal.SCROLLBACK_LINES:,})")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# Login and registration latency for the user store at growing sizes.
+#
+#   python3 benchmarks/bench_userstore.py [--sizes 10000,100000,1000000] [--iterations N]
+#
+# Filler accounts are written with a single KDF round so large stores can be
+# built quickly; the accounts that are timed use the configured cost. The
+# login and register columns time the store calls alone, the screen columns
+# LoginScreen.login and .register as the buttons run them (with stand-in
+# entries, silenced message boxes and no desktop launch). The legacy column
+# is the old users.txt linear scan for the last account.
+import os
+import sys
+import time
+import shutil
+import tempfile
+import statistics
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import login
+from userstore import UserStore, KDF_ITERATIONS
+
+CHUNK = 50000
+SAMPLES = 20
+
+
+def timed(func, samples=SAMPLES):
+    times = []
+    for i in range(samples):
+        start = time.perf_counter()
+        func(i)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+class Field:
+    def __init__(self):
+        self.value = ""
+
+    def get(self):
+        return self.value
+
+
+class MessageBoxes:
+    # Counts the errors a screen would have shown.
+    def __init__(self):
+        self.errors = []
+
+    def showerror(self, title, message):
+        self.errors.append(message)
+
+    def showinfo(self, title, message):
+        pass
+
+    def showwarning(self, title, message):
+        pass
+
+
+def login_screen(store):
+    screen = login.LoginScreen.__new__(login.LoginScreen)
+    screen.store = store
+    screen.username_entry, screen.password_entry = Field(), Field()
+    screen.launch_desktop = lambda username: None
+    return screen
+
+
+def screen_call(screen, action, username, password):
+    screen.username_entry.value = username
+    screen.password_entry.value = password
+    action()
+
+
+def legacy_scan(path, username):
+    with open(path) as f:
+        for line in f:
+            user, pw = line.strip().split("|")
+            if user == username:
+                return pw
+    return None
+
+
+def bench_size(workdir, size, iterations):
+    db_path = os.path.join(workdir, f"users-{size}.db")
+    store = UserStore(db_path, iterations=iterations, legacy_path=None)
+    start = time.perf_counter()
+    for base in range(0, size, CHUNK):
+        store.create_many(((f"user{i}", "pw") for i in range(base, min(size, base + CHUNK))), iterations=1)
+    build = time.perf_counter() - start
+
+    store.create("probe", "secret")
+    lookup = timed(lambda i: store.exists(f"user{size - 1 - i}"))
+    login_ms = timed(lambda i: store.verify("probe", "secret"))
+    register = timed(lambda i: store.create(f"new{i}", "secret"))
+    screen = login_screen(store)
+    screen_login = timed(lambda i: screen_call(screen, screen.login, "probe", "secret"))
+    screen_register = timed(lambda i: screen_call(screen, screen.register, f"screen{i}", "secret"))
+    if login.messagebox.errors:
+        print(f"screen errors: {login.messagebox.errors[:3]}")
+
+    legacy_path = os.path.join(workdir, "users.txt")
+    with open(legacy_path, "w") as f:
+        for i in range(size):
+            f.write(f"user{i}|pw\n")
+    legacy = timed(lambda i: legacy_scan(legacy_path, f"user{size - 1}"), samples=3)
+
+    store.close()
+    os.remove(db_path)
+    return build, lookup, login_ms, register, screen_login, screen_register, legacy
+
+
+def main():
+    args = sys.argv[1:]
+    sizes = [10000, 100000, 1000000]
+    iterations = KDF_ITERATIONS
+    while args:
+        if args[0] == "--sizes":
+            sizes = [int(s) for s in args[1].split(",")]
+        elif args[0] == "--iterations":
+            iterations = int(args[1])
+        args = args[2:]
+
+    workdir = tempfile.mkdtemp(prefix="pseudoos-userstore-")
+    # register() creates the user's folder relative to the working directory.
+    os.chdir(workdir)
+    login.messagebox = MessageBoxes()
+    try:
+        print(f"KDF: PBKDF2-SHA256, {iterations} iterations; median of {SAMPLES} samples")
+        print(f"{'accounts':>10} {'build s':>9} {'lookup ms':>10} {'login ms':>9} {'register ms':>12} "
+              f"{'screen login ms':>16} {'screen register ms':>19} {'legacy scan ms':>15}")
+        for size in sizes:
+            build, lookup, login_ms, register, screen_login, screen_register, legacy = \
+                bench_size(workdir, size, iterations)
+            print(f"{size:>10} {build:>9.2f} {lookup:>10.3f} {login_ms:>9.1f} {register:>12.1f} "
+                  f"{screen_login:>16.1f} {screen_register:>19.1f} {legacy:>15.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Regression check for the Notes edit hook: Tcl errors from the Text widget
+# must go back to the Tcl caller, not end the Tk main loop.
+#
+#   python3 benchmarks/check_notes_edit_hook.py
+#
+# Installs the NotesApp edit hook on a stand-in for the Text widget's
+# command that fails the way a Text widget does with nothing selected, and
+# runs what Tk's copy, cut and <<Clear>> bindings run:
+# "get" and "delete" on sel.first sel.last inside a Tcl catch. Passes if the
+# catch sees the error, nothing is recorded as an edit, and mainloop
+# returns without re-raising it, while other calls still return the
+# widget's result and inserts are still recorded. Needs no display.
+import os
+import sys
+import tkinter as tk
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from notes import NotesApp
+
+NO_SELECTION = 'error {text doesn\'t contain any characters tagged with "sel"}'
+
+
+class FakeText:
+    def __init__(self, tcl):
+        self.tk = tcl.tk
+
+    def __str__(self):
+        return "text"
+
+    def bind(self, *args, **kwargs):
+        pass
+
+
+def main():
+    tcl = tk.Tcl()
+    tcl.eval("proc text {args} {\n"
+             "    if {[string match *sel.* $args]} { " + NO_SELECTION + " }\n"
+             "    if {[lindex $args 0] eq \"index\"} { return [lindex $args 1] }\n"
+             "    return [list done {*}$args]\n"
+             "}")
+    app = NotesApp.__new__(NotesApp)
+    app.text_area = FakeText(tcl)
+    app.edit_serial = 0
+    app.dirty = False
+    app.journal_file = None
+    app.large = None
+    app.install_edit_hook()
+
+    ok = True
+    for script in ("text get sel.first sel.last", "text delete sel.first sel.last"):
+        caught = tcl.eval("catch {" + script + "}")
+        print(f"catch {{{script}}} -> {caught}")
+        ok = ok and caught == "1"
+    try:
+        tcl.mainloop()
+    except tk.TclError as e:
+        print(f"mainloop re-raised: {e}")
+        ok = False
+    if app.dirty:
+        print("a failed delete was recorded as an edit")
+        ok = False
+    if tcl.eval("text get 1.0 end") != "done get 1.0 end":
+        print("a forwarded call lost its result")
+        ok = False
+    tcl.eval("text insert 1.0 hello")
+    if not app.dirty:
+        print("an insert was not recorded")
+        ok = False
+    print("PASS" if ok else "FAIL")
+
+
+if __name__ == "__main__":
+    main()
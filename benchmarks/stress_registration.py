@@ -0,0 +1,86 @@
+# Concurrent registration stress test for the user store.
+#
+#   python3 benchmarks/stress_registration.py [--procs N] [--names M]
+#
+# Starts N processes against one fresh store that still has a legacy
+# users.txt (including a malformed line) waiting to be migrated. Every
+# process tries to register the same M names in a different order, so each
+# name is contended by all of them. Passes if every name was created exactly
+# once, the legacy accounts were imported once, and no process crashed.
+import os
+import sys
+import time
+import shutil
+import tempfile
+import multiprocessing
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from userstore import UserStore, UserExistsError
+
+LEGACY_ACCOUNTS = 50
+
+
+def register_all(workdir, worker, names, results):
+    os.chdir(workdir)
+    store = UserStore(iterations=1)
+    created = 0
+    order = names[worker:] + names[:worker]
+    for name in order:
+        try:
+            store.create(name, "pw")
+            created += 1
+        except UserExistsError:
+            pass
+    store.close()
+    results.put(created)
+
+
+def main():
+    args = sys.argv[1:]
+    procs, names = 8, 500
+    while args:
+        if args[0] == "--procs":
+            procs = int(args[1])
+        elif args[0] == "--names":
+            names = int(args[1])
+        args = args[2:]
+
+    workdir = tempfile.mkdtemp(prefix="pseudoos-stress-")
+    with open(os.path.join(workdir, "users.txt"), "w") as f:
+        for i in range(LEGACY_ACCOUNTS):
+            f.write(f"legacy{i}|pw\n")
+            if i == LEGACY_ACCOUNTS // 2:
+                f.write("this line is corrupt\n")
+
+    name_list = [f"user{i}" for i in range(names)]
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=register_all, args=(workdir, w, name_list, results))
+               for w in range(procs)]
+    start = time.perf_counter()
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join()
+    elapsed = time.perf_counter() - start
+
+    crashed = [p.exitcode for p in workers if p.exitcode != 0]
+    created = [results.get() for _ in range(procs - len(crashed))]
+    os.chdir(workdir)
+    store = UserStore(iterations=1)
+    total = store.count()
+    store.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{procs} processes x {names} contended names in {elapsed:.2f}s "
+          f"({procs * names / elapsed:.0f} attempts/s)")
+    print(f"created {sum(created)} (expected {names}), store holds {total} "
+          f"(expected {names + LEGACY_ACCOUNTS}), crashed processes: {len(crashed)}")
+    ok = not crashed and sum(created) == names and total == names + LEGACY_ACCOUNTS
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
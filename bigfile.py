@@ -0,0 +1,122 @@
+import os
+import mmap
+import threading
+
+# Files at least this big open in Notes' large-file mode: the file is
+# memory-mapped and only a few blocks around the viewport live in the widget.
+LARGE_FILE_THRESHOLD = int(os.environ.get("PSEUDOOS_NOTES_LARGE_FILE", str(8 * 1024 * 1024)))
+# Nominal block size. Each block is extended to the next newline so it always
+# holds whole lines and decodes on its own.
+BLOCK_BYTES = 256 * 1024
+COPY_CHUNK = 4 * 1024 * 1024
+
+
+def is_large(path):
+    try:
+        return os.path.getsize(path) >= LARGE_FILE_THRESHOLD
+    except OSError:
+        return False
+
+
+class LargeDocument:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "r+b")
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        # (offset, length) of each block in the file, appended by the
+        # indexing thread; readers only look at the blocks already there.
+        self.blocks = []
+        self.indexed = 0
+        self.done = False
+        self.cancelled = False
+        # Block number -> replacement bytes for blocks edited since the last
+        # save. Blocks are always replaced whole.
+        self.patches = {}
+
+    def start_indexing(self):
+        threading.Thread(target=self.build_index, daemon=True).start()
+
+    def build_index(self):
+        offset = 0
+        try:
+            while offset < self.size and not self.cancelled:
+                end = min(self.size, offset + BLOCK_BYTES)
+                if end < self.size:
+                    newline = self.map.find(b"\n", end)
+                    end = self.size if newline < 0 else newline + 1
+                self.blocks.append((offset, end - offset))
+                self.indexed = end
+                offset = end
+        except ValueError:
+            # The map was closed under us.
+            return
+        self.done = True
+
+    def progress(self):
+        return self.indexed / self.size if self.size else 1.0
+
+    def block_bytes(self, i):
+        if i in self.patches:
+            return self.patches[i]
+        offset, length = self.blocks[i]
+        return self.map[offset:offset + length]
+
+    def read_block(self, i):
+        return self.block_bytes(i).decode("utf-8", errors="replace")
+
+    def set_block(self, i, text):
+        # Text that reads back as it was shown keeps the block's own bytes,
+        # so invalid UTF-8 that read_block replaced with U+FFFD is only
+        # rewritten in blocks that were actually edited.
+        offset, length = self.blocks[i]
+        if text == self.map[offset:offset + length].decode("utf-8", errors="replace"):
+            self.patches.pop(i, None)
+        else:
+            self.patches[i] = text.encode("utf-8")
+
+    def modified(self):
+        return bool(self.patches)
+
+    def save(self, path=None):
+        # Blocks that kept their size are patched in place; otherwise the
+        # untouched blocks are copied straight out of the map into a new file
+        # that replaces the target.
+        path = path or self.path
+        if path == self.path and not self.patches:
+            return
+        if path == self.path and all(len(data) == self.blocks[i][1] for i, data in self.patches.items()):
+            for i, data in sorted(self.patches.items()):
+                offset = self.blocks[i][0]
+                self.map[offset:offset + len(data)] = data
+                # flush() wants a page-aligned start.
+                start = offset - offset % mmap.ALLOCATIONGRANULARITY
+                self.map.flush(start, offset + len(data) - start)
+            self.patches = {}
+            return
+        tmp = path + ".tmp"
+        blocks = []
+        with open(tmp, "wb") as out:
+            for i, (offset, length) in enumerate(self.blocks):
+                blocks.append((out.tell(), len(self.patches[i]) if i in self.patches else length))
+                if i in self.patches:
+                    out.write(self.patches[i])
+                    continue
+                for start in range(offset, offset + length, COPY_CHUNK):
+                    out.write(self.map[start:min(offset + length, start + COPY_CHUNK)])
+            out.flush()
+            os.fsync(out.fileno())
+        self.map.close()
+        self.file.close()
+        os.replace(tmp, path)
+        self.path = path
+        self.file = open(path, "r+b")
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.blocks = blocks
+        self.patches = {}
+
+    def close(self):
+        self.cancelled = True
+        self.map.close()
+        self.file.close()
@@ -1,9 +1,48 @@
 import tkinter as tk
+from tkinter import font as tkfont
 import time
 import threading
-import subprocess
+import queue
+import compileall
+import platform
 import sys
 import os
+import metacache
+import supervisor
+from userstore import UserStore
+import startup_trace
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+USER_DIR = "users"
+FONT_SIZES = [12, 14, 16, 18, 20, 24, 30, 36, 48, 60]
+
+
+# --- Warm-up tasks, run on worker threads ---
+def compile_modules():
+    if not compileall.compile_dir(BASE_DIR, maxlevels=0, quiet=1):
+        raise RuntimeError("some modules failed to compile")
+    count = len([name for name in os.listdir(BASE_DIR) if name.endswith(".py")])
+    return f"Byte-compiled {count} system modules"
+
+def index_user_store():
+    # Opening the store runs the one-time users.txt migration, so login
+    # doesn't have to. Boot is also when the store gets compacted.
+    store = UserStore()
+    try:
+        compacted = store.compact()
+        return (f"User store: {store.count()} account(s) indexed"
+                + (", compacted" if compacted else "")
+                + (f", {len(store.problems)} problem(s) reported" if store.problems else ""))
+    finally:
+        store.close()
+
+def scan_user_tree():
+    os.makedirs(USER_DIR, exist_ok=True)
+    snapshot = metacache.scan_tree(USER_DIR)
+    metacache.save_snapshot(snapshot)
+    files = sum(1 for d in snapshot.values() for entry in d["entries"] if not entry[1])
+    return f"Mounted /home: {len(snapshot)} folders, {files} files cached"
+
 
 class BootScreen:
     def __init__(self, root):
@@ -23,51 +62,87 @@ class BootScreen:
         self.text_area.pack(expand=True, fill="both")
         self.text_area.config(state=tk.DISABLED)
 
-        threading.Thread(target=self.boot_sequence).start()
+        self.results = queue.Queue()
+        self.pending = 0
+        self.fonts = []
+        self.start_time = time.time()
+        self.root.after_idle(self.boot_sequence)
 
-    def print_line(self, text, delay=0.4):
+    def print_line(self, text):
         self.text_area.config(state=tk.NORMAL)
         self.text_area.insert(tk.END, text + "\n")
         self.text_area.see(tk.END)
         self.text_area.config(state=tk.DISABLED)
-        self.root.update()
-        time.sleep(delay)
 
     def boot_sequence(self):
-        boot_lines = [
-            "[   OK   ] Initializing BIOS...",
-            "[   OK   ] Detecting hardware components...",
-            "[   OK   ] CPU: PseudoCore v1.3 @ 2.6GHz",
-            "[   OK   ] RAM: 2048MB Virtual SDRAM",
-            "[   OK   ] VGA Display: 800x600@60Hz",
-            "[   OK   ] Keyboard and Mouse detected",
-            "[   OK   ] Loading Pseudo Kernel...",
-            "[   OK   ] Mounting /pseudo/root",
-            "[   OK   ] Mounting /home/user",
-            "[   OK   ] Establishing loopback interface",
-            "[   OK   ] Pseudo Network: connected (192.168.0.42)",
-            "[   OK   ] Loading Pseudo Drivers...",
-            "[   OK   ] Starting system services",
-            "[   OK   ] Launching GUI Shell",
-            "[ SYSTEM ] Welcome to PseudoOS.",
-            "[ SYSTEM ] Type 'help' to get started.",
+        self.print_line(f"[   OK   ] CPU: {os.cpu_count() or 1} core(s), {platform.machine() or 'unknown'}")
+        self.print_line(f"[   OK   ] Loading Pseudo Kernel (Python {platform.python_version()})...")
+
+        tasks = [
+            ("Byte-compiling system modules", compile_modules),
+            ("Loading user store", index_user_store),
+            ("Scanning home folders", scan_user_tree),
         ]
+        self.pending = len(tasks) + 1
+        for label, func in tasks:
+            threading.Thread(target=self.run_task, args=(label, func), daemon=True).start()
+
+        # Fonts belong to Tk, so they are loaded here on the Tk thread
+        # while the workers run.
+        self.root.after_idle(self.preload_fonts)
+        self.poll_results()
+
+    def run_task(self, label, func):
+        try:
+            self.results.put((True, func()))
+        except Exception as e:
+            self.results.put((False, f"{label}: {e}"))
+
+    def preload_fonts(self):
+        try:
+            for size in FONT_SIZES:
+                for weight in ("normal", "bold"):
+                    f = tkfont.Font(family="Courier New", size=size, weight=weight)
+                    f.metrics()
+                    self.fonts.append(f)
+            self.results.put((True, f"Preloaded {len(self.fonts)} console fonts"))
+        except Exception as e:
+            self.results.put((False, f"Preloading fonts: {e}"))
+
+    def poll_results(self):
+        while True:
+            try:
+                ok, message = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            self.print_line(("[   OK   ] " if ok else "[ FAILED ] ") + message)
+
+        if self.pending > 0:
+            self.root.after(20, self.poll_results)
+        else:
+            self.finish_boot()
 
-        for line in boot_lines:
-            self.print_line(line)
+    def finish_boot(self):
+        self.print_line("[   OK   ] Launching GUI Shell")
+        self.print_line(f"[ SYSTEM ] Boot completed in {time.time() - self.start_time:.2f}s.")
+        self.print_line("[ SYSTEM ] Welcome to PseudoOS.")
 
         # Launch login.py first
         login_script = os.path.join(os.path.dirname(__file__), "login.py")
         python_exec = "python3" if sys.platform != "win32" else "python"
 
         try:
-            subprocess.Popen([python_exec, login_script])
+            startup_trace.spawning("login")
+            supervisor.session().spawn([python_exec, login_script], "login")
             self.root.after(500, self.root.destroy)  # Delayed close
         except Exception as e:
+            self.print_line(f"[ FAILED ] Could not launch login.py: {e}")
             print(f"[ERROR] Failed to launch login.py: {e}")
-            time.sleep(5)
 
 if __name__ == "__main__":
+    startup_trace.begin("boot")
     root = tk.Tk()
+    startup_trace.watch_window(root)
     app = BootScreen(root)
     root.mainloop()
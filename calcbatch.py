@@ -0,0 +1,376 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import functools
+import calcengine
+import calchistory
+
+try:
+    import numpy
+except ImportError:
+    # Without NumPy each value goes through the engine's compiled function,
+    # which is still compiled once per expression shape rather than per line.
+    numpy = None
+
+# Batch evaluation for the calculator, also usable from a shell:
+#
+#   python3 calcbatch.py <user> --file exprs.txt [--out results.txt]
+#   python3 calcbatch.py <user> --expr "x^2 + sqrt(x)" --range 0 1e6 [step] [--out results.txt]
+#
+# A file is evaluated in chunks of lines. Lines that differ only in their
+# numbers ("2+3", "7+1.5") share one function, parsed and compiled the first
+# time that shape is seen and called with each line's numbers; with NumPy it
+# runs once over the whole group. A range evaluates one expression over every x in start..stop.
+# Results are streamed to the output file in order and a summary is added to
+# the calculator history.
+#
+# Vectorized values are float64. Anything that isn't finite or is too large
+# to be exact in a float64 is evaluated again by the engine, so errors and
+# big integers come out exactly as in the calculator. That includes values
+# whose result is small but where a step the engine does in exact integers
+# ((2^53 + 1) - 2^53, say) reached 2^53 on the way: the vectorized function
+# passes each such step through _int, which notes the values that did.
+# Expressions with ! are always left to the engine.
+CHUNK = int(os.environ.get("PSEUDOOS_CALC_BATCH_CHUNK", "65536"))
+EXACT_LIMIT = 2.0 ** 53
+PROGRESS_SECONDS = 0.2
+ERROR = "Error: "
+# A number as calcengine.tokenize reads it, not counting digits inside names.
+NUMBER = re.compile(r"(?<![A-Za-z_0-9π.])(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+(?![A-Za-z_]))?")
+
+
+def _int(over, value):
+    # A step the engine may compute in exact integers: notes which of its
+    # values are too large for a float64 to hold exactly. Up to that point
+    # every such step is exact in float64 as well, so this catches the first
+    # one that isn't.
+    over.append(numpy.abs(value) >= EXACT_LIMIT)
+    return value
+
+
+if numpy is not None:
+    VECTOR_HELPERS = {
+        "_pow": numpy.power, "_sqrt": numpy.sqrt, "_abs": numpy.abs,
+        "_sin": numpy.sin, "_cos": numpy.cos, "_tan": numpy.tan, "_ln": numpy.log, "_log": numpy.log10,
+        "_int": _int,
+    }
+
+
+@functools.lru_cache(maxsize=calcengine.CACHE_SIZE)
+def shape_function(body, variables, vector):
+    # A vector body comes from vector_source and takes a list for _int as
+    # its last argument.
+    if vector:
+        return calcengine.compile_source(body, variables + ("_over",), VECTOR_HELPERS)
+    return calcengine.compile_source(body, variables, calcengine.HELPERS)
+
+
+def vector_source(node):
+    # (source, may be an integer) for node, as calcengine.to_source but with
+    # every + - * ^ step that can stay an integer in the engine wrapped in
+    # _int. Columns are treated as integers whatever they hold.
+    kind = node[0]
+    if kind == "num":
+        return repr(node[1]), isinstance(node[1], int)
+    if kind == "var":
+        return f"_int(_over, {node[1]})", True
+    if kind == "neg":
+        source, whole = vector_source(node[1])
+        return f"(-{source})", whole
+    if kind == "call":
+        source, whole = vector_source(node[2])
+        return f"_{node[1]}({source})", whole and node[1] in ("sqrt", "abs")
+    if kind == "pow":
+        base, base_whole = vector_source(node[1])
+        exponent, exponent_whole = vector_source(node[2])
+        source = f"_pow({base}, {exponent})"
+        if base_whole and exponent_whole:
+            return f"_int(_over, {source})", True
+        return source, False
+    if kind == "fact":
+        raise ValueError("! is not vectorized")
+    source, whole = vector_source(node[1])
+    for op, operand in node[2]:
+        operand_source, operand_whole = vector_source(operand)
+        source = f"({source} {op} {operand_source})"
+        whole = whole and operand_whole and op != "/"
+        if whole and op != "%":
+            source = f"_int(_over, {source})"
+    return source, whole
+
+
+def exact(func, args):
+    # Result text for one value, evaluated by the engine.
+    try:
+        return calcengine.format_result(calcengine.call(func, *args))
+    except calcengine.ExpressionError as e:
+        return ERROR + str(e)
+
+
+def vector_columns(func, columns, count):
+    # Runs func over whole columns; returns the values and the indices of
+    # the ones that must be redone exactly.
+    over = []
+    with numpy.errstate(all="ignore"):
+        values = func(*columns, over)
+    values = numpy.broadcast_to(numpy.asarray(values, dtype=numpy.float64), (count,))
+    redo = ~numpy.isfinite(values) | (numpy.abs(values) >= EXACT_LIMIT)
+    for step in over:
+        redo |= step
+    return values, numpy.flatnonzero(redo).tolist()
+
+
+def format_column(values):
+    # format_result over a float64 array: whole numbers without the ".0",
+    # everything else as repr.
+    whole = (values == numpy.floor(values)) & (numpy.abs(values) < 1e16)
+    texts = numpy.empty(len(values), dtype=object)
+    texts[whole] = list(map(str, values[whole].astype(numpy.int64).tolist()))
+    texts[~whole] = list(map(repr, values[~whole].tolist()))
+    return texts.tolist()
+
+
+def number_value(text):
+    # As calcengine.tokenize reads a number; inf for one it rejects as too
+    # large, including integers longer than int() will parse.
+    try:
+        return float(text) if "." in text or "e" in text or "E" in text else int(text)
+    except ValueError:
+        return math.inf
+
+
+def line_shape(line, numbers):
+    # (body, parameter names, vector body or None) of the function shared by
+    # every line that differs from this one only in its numbers, or None if
+    # this line has to be evaluated on its own (it doesn't parse, for one).
+    try:
+        # The line itself must parse: with names in place of its numbers
+        # the template would accept "1 2" as a product.
+        calcengine.parse(line)
+        tokens = calcengine.tokenize(line)
+    except (calcengine.ExpressionError, RecursionError, MemoryError):
+        return None
+    names = []
+    words = []
+    for kind, value, pos in tokens[:-1]:
+        if kind == "num":
+            names.append(f"_c{len(names)}")
+            words.append(names[-1])
+        else:
+            words.append(value)
+    if len(names) != len(numbers):
+        return None
+    try:
+        node = calcengine.parse(" ".join(words), tuple(names))
+        body = calcengine.to_source(node)
+        vector = vector_source(node)[0] if numpy is not None and "_fact(" not in body else None
+        return body, tuple(names), vector
+    except (calcengine.ExpressionError, RecursionError, MemoryError):
+        return None
+
+
+def exact_line(line):
+    try:
+        return calcengine.format_result(calcengine.evaluate(line))
+    except calcengine.ExpressionError as e:
+        return ERROR + str(e)
+
+
+def evaluate_lines(lines, shapes):
+    # Result texts for a chunk of expressions, in order. shapes caches
+    # line_shape by the line with its numbers blanked out.
+    results = [None] * len(lines)
+    groups = {}
+    for i, line in enumerate(lines):
+        numbers = NUMBER.findall(line)
+        key = NUMBER.sub("#", line)
+        if key not in shapes:
+            shapes[key] = line_shape(line, numbers)
+        shape = shapes[key]
+        if shape is None or len(numbers) != len(shape[1]):
+            results[i] = exact_line(line)
+            continue
+        consts = list(map(number_value, numbers))
+        if any(isinstance(c, int) and c >= EXACT_LIMIT or c == math.inf for c in consts):
+            # Not exact in a float64, or rejected by the tokenizer.
+            results[i] = exact_line(line)
+            continue
+        groups.setdefault(shape, []).append((i, consts))
+
+    for (body, names, vector), members in groups.items():
+        try:
+            func = shape_function(body, names, False)
+        except calcengine.ExpressionError as e:
+            for i, consts in members:
+                results[i] = ERROR + str(e)
+            continue
+        if vector is None or len(members) == 1:
+            for i, consts in members:
+                results[i] = exact(func, consts)
+            continue
+        columns = numpy.array([consts for _, consts in members], dtype=numpy.float64).reshape(len(members), len(names)).T
+        values, redo = vector_columns(shape_function(vector, names, True), columns, len(members))
+        texts = format_column(values)
+        for j in redo:
+            texts[j] = exact(func, members[j][1])
+        for (i, consts), text in zip(members, texts):
+            results[i] = text
+    return results
+
+
+def range_functions(text):
+    # (exact, vectorized or None) functions of x for a range.
+    func = calcengine.compile_expression(text, ("x",))
+    node = calcengine.parse(text, ("x",))
+    if numpy is None or "_fact(" in calcengine.to_source(node):
+        return func, None
+    return func, shape_function(vector_source(node)[0], ("x",), True)
+
+
+def evaluate_range(funcs, start, step, first, count):
+    # (x texts, result texts) for x = start + k * step, k = first .. first + count - 1.
+    func, vfunc = funcs
+    if vfunc is None:
+        xs = [start + k * step for k in range(first, first + count)]
+        return list(map(calcengine.format_result, xs)), [exact(func, (x,)) for x in xs]
+    xs = start + numpy.arange(first, first + count) * step
+    values, redo = vector_columns(vfunc, [xs.astype(numpy.float64)], count)
+    texts = format_column(values)
+    if redo:
+        exact_xs = xs.tolist()
+        for j in redo:
+            texts[j] = exact(func, (exact_xs[j],))
+    return list(map(str, xs.tolist())) if xs.dtype.kind == "i" else format_column(xs), texts
+
+
+def parse_number(text):
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"not a finite number: {text}")
+    return int(value) if value.is_integer() and abs(value) < EXACT_LIMIT else value
+
+
+def range_count(start, stop, step):
+    if step == 0 or (stop - start) / step < 0:
+        raise ValueError("step must move from start towards stop")
+    # Inclusive of stop, allowing for float rounding in (stop - start) / step.
+    return int(math.floor((stop - start) / step + 1e-9)) + 1
+
+
+def run_file(path, out, progress):
+    # Returns (count, errors). progress(done, fraction) is called per chunk.
+    count = errors = 0
+    shapes = {}
+    total = max(1, os.path.getsize(path))
+    read = 0
+    with open(path, "rb") as src:
+        while True:
+            lines = []
+            for raw in src:
+                read += len(raw)
+                line = raw.decode("utf-8", errors="replace").strip()
+                if line:
+                    lines.append(line)
+                    if len(lines) == CHUNK:
+                        break
+            if not lines:
+                break
+            results = evaluate_lines(lines, shapes)
+            out.write("".join(f"{line} = {text}\n" for line, text in zip(lines, results)))
+            count += len(lines)
+            errors += sum(1 for text in results if text.startswith(ERROR))
+            progress(count, read / total)
+    return count, errors
+
+
+def run_range(text, start, stop, step, out, progress):
+    funcs = range_functions(text)
+    total = range_count(start, stop, step)
+    errors = 0
+    for first in range(0, total, CHUNK):
+        x_texts, results = evaluate_range(funcs, start, step, first, min(CHUNK, total - first))
+        out.write("".join(f"{x}\t{text}\n" for x, text in zip(x_texts, results)))
+        errors += sum(1 for text in results if text.startswith(ERROR))
+        progress(first + len(results), (first + len(results)) / total)
+    return total, errors
+
+
+def default_output(username):
+    return os.path.join("users", username, "calc", time.strftime("batch-%Y%m%d-%H%M%S.txt"))
+
+
+def main(argv):
+    usage = ("usage: calcbatch.py <user> (--file PATH | --expr EXPR --range START STOP [STEP])"
+             " [--out PATH] [--progress]")
+    if not argv or argv[0].startswith("-"):
+        print(usage, file=sys.stderr)
+        return 2
+    username, args = argv[0], argv[1:]
+    source = expr = out_path = None
+    bounds = []
+    report = False
+    try:
+        while args:
+            if args[0] == "--file":
+                source, args = args[1], args[2:]
+            elif args[0] == "--expr":
+                expr, args = args[1], args[2:]
+            elif args[0] == "--range":
+                args = args[1:]
+                while args and not args[0].startswith("--") and len(bounds) < 3:
+                    bounds.append(parse_number(args[0]))
+                    args = args[1:]
+            elif args[0] == "--out":
+                out_path, args = args[1], args[2:]
+            elif args[0] == "--progress":
+                report, args = True, args[1:]
+            else:
+                raise ValueError(f"unknown option {args[0]}")
+        if (source is None) == (expr is None) or (expr is not None and len(bounds) < 2):
+            raise ValueError("give either --file, or --expr with --range")
+    except (IndexError, ValueError) as e:
+        print(f"calcbatch: {e}\n{usage}", file=sys.stderr)
+        return 2
+
+    out_path = out_path or default_output(username)
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    last = [0.0]
+
+    def progress(done, fraction):
+        now = time.perf_counter()
+        if report and now - last[0] >= PROGRESS_SECONDS:
+            last[0] = now
+            print(json.dumps({"done": done, "fraction": fraction}), flush=True)
+
+    start = time.perf_counter()
+    try:
+        with open(out_path, "w", encoding="utf-8") as out:
+            if source is not None:
+                label, unit = source, "expressions"
+                count, errors = run_file(source, out, progress)
+            else:
+                if len(bounds) == 2:
+                    bounds.append(1)
+                label = f"{expr} for x in {bounds[0]}..{bounds[1]}" + (f" step {bounds[2]}" if bounds[2] != 1 else "")
+                unit = "points"
+                count, errors = run_range(expr, *bounds, out, progress)
+    except (OSError, ValueError, calcengine.ExpressionError) as e:
+        print(json.dumps({"error": str(e)}) if report else f"calcbatch: {e}", flush=True)
+        return 1
+    seconds = time.perf_counter() - start
+
+    summary = (f"{count:,} {unit}, {errors:,} errors in {seconds:.2f}s "
+               f"({count / max(seconds, 1e-9):,.0f} {unit}/s"
+               f"{', vectorized' if numpy is not None else ''}) -> {out_path}")
+    store = calchistory.HistoryStore(os.path.join("users", username, "calc"))
+    entry = store.add(f"batch {label}", summary)
+    store.close()
+    print(json.dumps({"entry": entry}) if report else summary, flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,278 @@
+import os
+import re
+import math
+import functools
+
+# Expression engine for the calculator. Input is tokenized and parsed into a
+# small AST, which is turned into Python source made only of literals,
+# operators and calls to the helpers below, then compiled once. Compiled
+# expressions are kept in an LRU cache keyed by their text.
+#
+# Operators, loosest first: + -, * / % mod, unary -, ^ (right-assoc, ** is
+# accepted too), postfix !. A name or parenthesis right after a value
+# multiplies, so 2π and 3(1+2) work.
+CACHE_SIZE = 512
+# Largest integer result, in bits, that ^ and ! may produce. 9^9^9 would
+# need about 1.2 billion bits.
+MAX_RESULT_BITS = int(os.environ.get("PSEUDOOS_CALC_MAX_BITS", "4000000"))
+
+TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+(?![A-Za-z_]))?)
+      | (?P<name>[A-Za-z_π][A-Za-z_0-9]*)
+      | (?P<op>\*\*|[-+*/%^()!,])
+    )""", re.VERBOSE)
+
+CONSTANTS = {"pi": math.pi, "π": math.pi, "e": math.e}
+FUNCTIONS = ("sqrt", "abs", "sin", "cos", "tan", "ln", "log")
+
+
+class ExpressionError(Exception):
+    pass
+
+
+class BudgetError(ExpressionError):
+    pass
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ExpressionError(f"Unexpected {text[pos:].strip()[:1]!r} at position {pos + 1}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "num":
+            try:
+                # int() refuses literals longer than sys.get_int_max_str_digits().
+                value = float(value) if any(c in value for c in ".eE") else int(value)
+            except ValueError:
+                value = math.inf
+            if value == math.inf:
+                raise ExpressionError(f"Number too large at position {match.start(kind) + 1}")
+        elif kind == "op" and value == "**":
+            value = "^"
+        elif kind == "name" and value == "mod":
+            kind = "op"
+        tokens.append((kind, value, match.start(kind)))
+        pos = match.end()
+    tokens.append(("end", None, len(text)))
+    return tokens
+
+
+class Parser:
+    def __init__(self, text, variables=()):
+        self.tokens = tokenize(text)
+        self.variables = variables
+        self.i = 0
+
+    def peek(self):
+        return self.tokens[self.i]
+
+    def take(self):
+        token = self.tokens[self.i]
+        self.i += 1
+        return token
+
+    def expect(self, value):
+        kind, got, pos = self.take()
+        if got != value:
+            raise ExpressionError(f"Expected {value!r} at position {pos + 1}")
+
+    def parse(self):
+        if self.peek()[0] == "end":
+            raise ExpressionError("Empty expression")
+        node = self.sum()
+        kind, value, pos = self.peek()
+        if kind != "end":
+            raise ExpressionError(f"Unexpected {value!r} at position {pos + 1}")
+        return node
+
+    # Runs of the same precedence become one ("chain", first, [(op, node)])
+    # node, so long sums stay flat instead of nesting once per operator.
+    def sum(self):
+        first, rest = self.product(), []
+        while self.peek()[1] in ("+", "-") and self.peek()[0] == "op":
+            op = self.take()[1]
+            rest.append((op, self.product()))
+        return ("chain", first, rest) if rest else first
+
+    def product(self):
+        first, rest = self.unary(), []
+        while True:
+            kind, value, pos = self.peek()
+            if kind == "op" and value in ("*", "/", "%", "mod"):
+                self.take()
+                rest.append(("%" if value == "mod" else value, self.unary()))
+            elif kind == "name" or value == "(":
+                # Implicit multiplication: 2π, 3(4), (1+2)(3+4).
+                rest.append(("*", self.power()))
+            else:
+                return ("chain", first, rest) if rest else first
+
+    def unary(self):
+        kind, value, pos = self.peek()
+        if kind == "op" and value in ("-", "+"):
+            self.take()
+            operand = self.unary()
+            return ("neg", operand) if value == "-" else operand
+        return self.power()
+
+    def power(self):
+        node = self.postfix()
+        if self.peek()[:2] == ("op", "^"):
+            self.take()
+            # Right-associative, and binds tighter than a leading minus on
+            # its left but not on its right: -2^2 = -4, 2^-1 = 0.5.
+            node = ("pow", node, self.unary())
+        return node
+
+    def postfix(self):
+        node = self.atom()
+        while self.peek()[:2] == ("op", "!"):
+            self.take()
+            node = ("fact", node)
+        return node
+
+    def atom(self):
+        kind, value, pos = self.take()
+        if kind == "num":
+            return ("num", value)
+        if kind == "op" and value == "(":
+            node = self.sum()
+            self.expect(")")
+            return node
+        if kind == "name":
+            if value in FUNCTIONS:
+                if self.peek()[1] != "(":
+                    raise ExpressionError(f"{value} needs parentheses at position {pos + 1}")
+                self.take()
+                arg = self.sum()
+                self.expect(")")
+                return ("call", value, arg)
+            if value in self.variables:
+                return ("var", value)
+            if value in CONSTANTS:
+                return ("num", CONSTANTS[value])
+            raise ExpressionError(f"Unknown name {value!r} at position {pos + 1}")
+        if kind == "end":
+            raise ExpressionError("Expression ended early")
+        raise ExpressionError(f"Unexpected {value!r} at position {pos + 1}")
+
+
+def parse(text, variables=()):
+    return Parser(text, variables).parse()
+
+
+def to_source(node):
+    kind = node[0]
+    if kind == "num":
+        return repr(node[1])
+    if kind == "var":
+        return node[1]
+    if kind == "neg":
+        return f"(-{to_source(node[1])})"
+    if kind == "fact":
+        return f"_fact({to_source(node[1])})"
+    if kind == "call":
+        return f"_{node[1]}({to_source(node[2])})"
+    if kind == "pow":
+        return f"_pow({to_source(node[1])}, {to_source(node[2])})"
+    # Python evaluates these left to right with the same precedence.
+    return "(" + to_source(node[1]) + "".join(f" {op} {to_source(n)}" for op, n in node[2]) + ")"
+
+
+# --- Runtime helpers. Integer results are checked against the budget before
+# they are computed, so a huge power fails at once instead of hanging. ---
+def _check_bits(bits):
+    if bits > MAX_RESULT_BITS:
+        raise BudgetError(f"Result too large (about {int(bits * 0.30103):,} digits)")
+
+
+def _pow(a, b):
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1:
+        _check_bits(b * math.log2(abs(a)))
+    try:
+        result = a ** b
+    except OverflowError:
+        raise BudgetError("Result too large")
+    if isinstance(result, complex):
+        raise ExpressionError("Result is not a real number")
+    return result
+
+
+def _fact(n):
+    if isinstance(n, float) and n.is_integer():
+        n = int(n)
+    if not isinstance(n, int) or n < 0:
+        raise ExpressionError("Factorial needs a whole number ≥ 0")
+    if n > 1:
+        _check_bits(math.lgamma(n + 1) / math.log(2))
+    return math.factorial(n)
+
+
+def _sqrt(x):
+    if x < 0:
+        raise ExpressionError("Square root of a negative number")
+    return math.isqrt(x) if isinstance(x, int) and math.isqrt(x) ** 2 == x else math.sqrt(x)
+
+
+HELPERS = {
+    "_pow": _pow, "_fact": _fact, "_sqrt": _sqrt, "_abs": abs,
+    "_sin": math.sin, "_cos": math.cos, "_tan": math.tan, "_ln": math.log, "_log": math.log10,
+}
+
+
+def compile_source(body, variables=(), helpers=HELPERS):
+    # body must be something to_source produced; helpers supplies the _pow,
+    # _fact, ... it calls.
+    try:
+        code = compile(f"lambda {', '.join(variables)}: {body}", "<expression>", "eval")
+    except (SyntaxError, RecursionError, MemoryError):
+        raise ExpressionError("Expression is nested too deeply")
+    return eval(code, {"__builtins__": {}, **helpers})
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text, variables=()):
+    # Returns a function taking the variables, in order, as arguments.
+    try:
+        body = to_source(parse(text, variables))
+    except (RecursionError, MemoryError):
+        raise ExpressionError("Expression is nested too deeply")
+    return compile_source(body, variables)
+
+
+def evaluate(text, **variables):
+    return call(compile_expression(text, tuple(variables)), *variables.values())
+
+
+def call(func, *args):
+    # Runs a compiled expression, turning Python's errors into ExpressionError.
+    try:
+        result = func(*args)
+    except ZeroDivisionError:
+        raise ExpressionError("Division by zero")
+    except OverflowError:
+        raise BudgetError("Result too large")
+    except (ValueError, TypeError) as e:
+        raise ExpressionError(str(e))
+    if isinstance(result, float) and not math.isfinite(result):
+        raise BudgetError("Result too large") if math.isinf(result) else ExpressionError("Undefined result")
+    return result
+
+
+def format_result(value):
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e16:
+            return str(int(value))
+        return repr(value)
+    if isinstance(value, int) and value.bit_length() > 10000:
+        # str() of a huge int is slow and capped; show it in scientific form.
+        exponent = math.floor(math.log10(abs(value)))
+        mantissa = 10 ** (math.log10(abs(value)) - exponent)
+        return f"{'-' if value < 0 else ''}{mantissa:.10f}e+{exponent}"
+    return str(value)
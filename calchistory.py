@@ -0,0 +1,109 @@
+import os
+import time
+import sqlite3
+
+# Calculator history, one SQLite database per user in users/<name>/calc.
+# Entries are (id, stamp, expression, result); ids grow with time, so pages
+# are read by primary-key range and never by offset. Only the newest
+# MAX_ENTRIES are kept.
+HISTORY_DB = "history.db"
+LEGACY_FILE = "history.txt"
+MAX_ENTRIES = int(os.environ.get("PSEUDOOS_CALC_HISTORY_MAX", "100000"))
+STAMP_FORMAT = "%a %Y-%m-%d %H:%M:%S"
+
+
+def format_entry(entry):
+    entry_id, stamp, expression, result = entry
+    return f"{time.strftime(STAMP_FORMAT, time.localtime(stamp))}: {expression} = {result}".replace("\n", " ")
+
+
+def parse_legacy_line(line, default_stamp):
+    # "<stamp>: <expression> = <result>", as the old history.txt had them.
+    text = line.rstrip("\n")
+    try:
+        stamp = time.mktime(time.strptime(text[:23], STAMP_FORMAT))
+        text = text[25:] if text[23:25] == ": " else None
+    except ValueError:
+        stamp = default_stamp
+    if not text or " = " not in text:
+        return None
+    expression, _, result = text.rpartition(" = ")
+    return stamp, expression, result
+
+
+class HistoryStore:
+    def __init__(self, user_dir):
+        os.makedirs(user_dir, exist_ok=True)
+        self.path = os.path.join(user_dir, HISTORY_DB)
+        self.db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " id INTEGER PRIMARY KEY, stamp REAL NOT NULL, expression TEXT NOT NULL, result TEXT NOT NULL)"
+        )
+        legacy_path = os.path.join(user_dir, LEGACY_FILE)
+        if os.path.exists(legacy_path):
+            self.migrate_legacy(legacy_path)
+
+    def close(self):
+        self.db.close()
+
+    def add(self, expression, result, stamp=None):
+        stamp = time.time() if stamp is None else stamp
+        cursor = self.db.execute("INSERT INTO entries (stamp, expression, result) VALUES (?, ?, ?)",
+                                 (stamp, expression, result))
+        entry_id = cursor.lastrowid
+        if MAX_ENTRIES:
+            self.db.execute("DELETE FROM entries WHERE id <= ?", (entry_id - MAX_ENTRIES,))
+        return (entry_id, stamp, expression, result)
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def page(self, limit, before=None, after=None, query=None):
+        # Up to limit entries, oldest first: the newest ones, or the newest
+        # ones before id `before`, or the oldest ones after id `after`. With
+        # a query, only entries whose expression or result contains it.
+        where, args = [], []
+        if before is not None:
+            where.append("id < ?")
+            args.append(before)
+        if after is not None:
+            where.append("id > ?")
+            args.append(after)
+        if query:
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where.append("(expression LIKE ? ESCAPE '\\' OR result LIKE ? ESCAPE '\\')")
+            args += [pattern, pattern]
+        sql = "SELECT id, stamp, expression, result FROM entries"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        order = "ASC" if after is not None else "DESC"
+        rows = self.db.execute(f"{sql} ORDER BY id {order} LIMIT ?", args + [limit]).fetchall()
+        return rows if after is not None else rows[::-1]
+
+    def clear(self):
+        self.db.execute("DELETE FROM entries")
+        self.db.execute("VACUUM")
+
+    def migrate_legacy(self, legacy_path):
+        # One-shot import of history.txt, renamed before the commit like the
+        # user store's legacy file.
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if not os.path.exists(legacy_path):
+                self.db.execute("ROLLBACK")
+                return 0
+            default_stamp = os.path.getmtime(legacy_path)
+            with open(legacy_path, "r", encoding="utf-8", errors="replace") as f:
+                lines = f.readlines()
+            if MAX_ENTRIES:
+                lines = lines[-MAX_ENTRIES:]
+            rows = [row for row in (parse_legacy_line(line, default_stamp) for line in lines) if row]
+            self.db.executemany("INSERT INTO entries (stamp, expression, result) VALUES (?, ?, ?)", rows)
+            os.replace(legacy_path, legacy_path + ".migrated")
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return len(rows)
@@ -0,0 +1,243 @@
+import os
+import math
+from collections import OrderedDict
+import calcengine
+import calcbatch
+
+numpy = calcbatch.numpy
+
+# Sampling for the calculator's Plot mode, cached like map tiles. A tile is
+# TILE_PX pixel columns at one power-of-two zoom level; it is sampled once
+# and kept reduced to first/min/max/last per column, so drawing costs the
+# same however many samples are behind it. A pan samples only the tiles it
+# exposes, and zooming back to a level finds its tiles in the cache.
+#
+# Sampling is adaptive: seeds every BASE_PX columns, then an interval is
+# halved while its midpoint strays from the chord by more than TOLERANCE_PX,
+# down to MIN_PX. Each level of halving is one vectorized call over every
+# pending interval of every new tile. The view is drawn as one canvas line
+# item per unbroken run of the curve.
+#
+# Without NumPy the view is sampled once per pixel column through the
+# engine on every draw and nothing is cached.
+TILE_PX = 256
+# Tiles kept per plot, about 10 KB each.
+MAX_TILES = int(os.environ.get("PSEUDOOS_CALC_PLOT_TILES", "2048"))
+BASE_PX = 4
+# Samples a new tile may take on average per column.
+MAX_PER_PX = 16
+MIN_PX = 1 / 64
+TOLERANCE_PX = 0.5
+MAX_LEVELS = 16
+# Screen coordinates are clamped to this far outside the canvas; Tk draws
+# nothing sensible with coordinates near the limits of an int.
+CLAMP_PX = 100000
+
+
+def _float_pow(a, b):
+    try:
+        result = float(a) ** b
+    except (OverflowError, ZeroDivisionError):
+        return math.nan
+    return math.nan if isinstance(result, complex) else result
+
+
+def _float_fact(n):
+    try:
+        return math.gamma(n + 1)
+    except (OverflowError, ValueError):
+        return math.nan
+
+
+# Plots only need floats, so ^ and ! never build big integers here.
+PLOT_HELPERS = dict(calcengine.HELPERS, _pow=_float_pow, _fact=_float_fact)
+if numpy is not None:
+    VECTOR_PLOT_HELPERS = dict(calcbatch.VECTOR_HELPERS,
+                               _fact=lambda v: numpy.frompyfunc(_float_fact, 1, 1)(v).astype(numpy.float64))
+
+
+class Plot:
+    def __init__(self, text):
+        # Raises calcengine.ExpressionError for an expression that doesn't parse.
+        body = calcengine.to_source(calcengine.parse(text, ("x",)))
+        self.text = text
+        self.func = calcengine.compile_source(body, ("x",), PLOT_HELPERS)
+        self.vfunc = None
+        if numpy is not None:
+            self.vfunc = calcengine.compile_source(body, ("x",), VECTOR_PLOT_HELPERS)
+        # (x level, y level, tile index) -> (columns, samples behind them),
+        # least recently used first.
+        self.tiles = OrderedDict()
+        self.samples = 0
+        self.evaluated = 0
+
+    def value(self, x):
+        try:
+            y = float(self.func(x))
+        except (ArithmeticError, ValueError, TypeError, calcengine.ExpressionError):
+            return math.nan
+        return y if math.isfinite(y) else math.nan
+
+    def values(self, xs):
+        self.evaluated += len(xs)
+        with numpy.errstate(all="ignore"):
+            ys = numpy.array(numpy.broadcast_to(numpy.asarray(self.vfunc(xs), dtype=numpy.float64), xs.shape))
+        ys[~numpy.isfinite(ys)] = numpy.nan
+        return ys
+
+    # --- Tiles. At x level lx a pixel column is 2**-lx wide and tile k
+    # holds global columns k * TILE_PX .. (k + 1) * TILE_PX - 1, as rows
+    # first, low, high, last and a 1/0 row for columns that have samples. ---
+    def make_tiles(self, lx, ly, indexes):
+        sx, sy = 2.0 ** lx, 2.0 ** ly
+        per_tile = TILE_PX // BASE_PX
+        indexes = numpy.array(indexes)
+        starts = indexes * (TILE_PX / sx)
+        seeds_x = starts[:, None] + numpy.arange(per_tile + 1) * (BASE_PX / sx)
+        seeds_y = self.values(seeds_x.ravel()).reshape(seeds_x.shape)
+        # Seeds are evenly spaced, so an inner seed's chord value is the
+        # mean of its neighbours. Intervals never cross a tile's edge.
+        split = numpy.isnan(seeds_y[:, :-1]) != numpy.isnan(seeds_y[:, 1:])
+        with numpy.errstate(invalid="ignore"):
+            bent = numpy.abs(seeds_y[:, 1:-1] - (seeds_y[:, :-2] + seeds_y[:, 2:]) / 2) * sy > TOLERANCE_PX
+        split[:, :-1] |= bent
+        split[:, 1:] |= bent
+        new_x, new_y = self.subdivide(seeds_x[:, :-1][split], seeds_y[:, :-1][split],
+                                      seeds_x[:, 1:][split], seeds_y[:, 1:][split],
+                                      sx, sy, len(indexes) * TILE_PX * MAX_PER_PX)
+        xs = numpy.concatenate((seeds_x.ravel(), new_x))
+        ys = numpy.concatenate((seeds_y.ravel(), new_y))
+        order = numpy.argsort(xs, kind="stable")
+        xs, ys = xs[order], ys[order]
+
+        # Reduce the samples to columns and spread them over the tiles.
+        cols = numpy.floor(xs * sx).astype(numpy.int64)
+        row = numpy.searchsorted(indexes, cols // TILE_PX)
+        keep = (row < len(indexes)) & (indexes[numpy.minimum(row, len(indexes) - 1)] == cols // TILE_PX)
+        cols, row, ys = cols[keep], row[keep], ys[keep]
+        starts = numpy.concatenate(([0], numpy.flatnonzero(numpy.diff(cols)) + 1))
+        ends = numpy.concatenate((starts[1:], [len(cols)])) - 1
+        low = numpy.fmin.reduceat(ys, starts)
+        high = numpy.fmax.reduceat(ys, starts)
+        blocks = numpy.full((len(indexes), 5, TILE_PX), numpy.nan)
+        blocks[:, 4, :] = 0
+        at = (row[starts], cols[starts] % TILE_PX)
+        blocks[at[0], 0, at[1]] = numpy.where(numpy.isnan(ys[starts]), low, ys[starts])
+        blocks[at[0], 1, at[1]] = low
+        blocks[at[0], 2, at[1]] = high
+        blocks[at[0], 3, at[1]] = numpy.where(numpy.isnan(ys[ends]), high, ys[ends])
+        blocks[at[0], 4, at[1]] = 1
+        counts = numpy.bincount(row, minlength=len(indexes)).tolist()
+        for k, block, count in zip(indexes.tolist(), blocks, counts):
+            self.tiles[(lx, ly, k)] = (block, count)
+            self.samples += count
+
+    def subdivide(self, xl, yl, xr, yr, sx, sy, budget):
+        # Halves the given intervals until they are straight to within
+        # TOLERANCE_PX; returns the new samples.
+        new_x, new_y = [numpy.empty(0)], [numpy.empty(0)]
+        for level in range(MAX_LEVELS):
+            if not len(xl) or budget <= 0:
+                break
+            if len(xl) > budget:
+                xl, yl, xr, yr = xl[:budget], yl[:budget], xr[:budget], yr[:budget]
+            xm = (xl + xr) / 2
+            ym = self.values(xm)
+            new_x.append(xm)
+            new_y.append(ym)
+            budget -= len(xm)
+            nan_m = numpy.isnan(ym)
+            with numpy.errstate(invalid="ignore"):
+                bent = numpy.abs(ym - (yl + yr) / 2) * sy > TOLERANCE_PX
+            split = (bent | (numpy.isnan(yl) != nan_m) | (nan_m != numpy.isnan(yr))) & ((xr - xl) * sx > 2 * MIN_PX)
+            xl, yl, xr, yr = (numpy.concatenate((xl[split], xm[split])), numpy.concatenate((yl[split], ym[split])),
+                              numpy.concatenate((xm[split], xr[split])), numpy.concatenate((ym[split], yr[split])))
+        return numpy.concatenate(new_x), numpy.concatenate(new_y)
+
+    def columns(self, lx, ly, j0, j1):
+        # Rows for global columns j0 .. j1 - 1, sampling missing tiles.
+        k0, k1 = j0 // TILE_PX, (j1 - 1) // TILE_PX
+        keys = [(lx, ly, k) for k in range(k0, k1 + 1)]
+        missing = [key[2] for key in keys if key not in self.tiles]
+        if missing:
+            self.make_tiles(lx, ly, missing)
+        for key in keys:
+            self.tiles.move_to_end(key)
+        while len(self.tiles) > max(MAX_TILES, len(keys)):
+            block, count = self.tiles.popitem(last=False)[1]
+            self.samples -= count
+        block = numpy.concatenate([self.tiles[key][0] for key in keys], axis=1)
+        return block[:, j0 - k0 * TILE_PX:j1 - k0 * TILE_PX]
+
+    # --- Views ---
+    def fit_y(self, x0, x1, width):
+        # A y range showing most of the curve in x0..x1, ignoring spikes.
+        # Measured on one sample per column: adaptive samples are densest
+        # exactly where the curve spikes.
+        if self.vfunc is not None:
+            ys = self.values(x0 + (numpy.arange(width) + 0.5) * (x1 - x0) / width)
+            ys = ys[~numpy.isnan(ys)]
+            lo, hi = numpy.percentile(ys, [1, 99]).tolist() if len(ys) else (0.0, 0.0)
+        else:
+            ys = sorted(y for y in (self.value(x0 + (x1 - x0) * (c + 0.5) / width) for c in range(width))
+                        if not math.isnan(y))
+            lo, hi = (ys[len(ys) // 100], ys[-1 - len(ys) // 100]) if ys else (0.0, 0.0)
+        pad = (hi - lo) * 0.1 or max(1.0, abs(lo) * 0.1)
+        return lo - pad, hi + pad
+
+    def polylines(self, x0, x1, y0, y1, width, height):
+        # Canvas coordinates for the view, one flat [x, y, x, y, ...] list
+        # per unbroken run of the curve.
+        sx, sy = width / (x1 - x0), height / (y1 - y0)
+        top, bottom = y1 + (y1 - y0), y0 - (y1 - y0)
+        if self.vfunc is None:
+            runs, run = [], []
+            previous = math.nan
+            for c in range(width):
+                y = self.value(x0 + (c + 0.5) / sx)
+                if math.isnan(y) or previous > top and y < bottom or previous < bottom and y > top:
+                    if len(run) > 2:
+                        runs.append(run)
+                    run = []
+                if not math.isnan(y):
+                    run += [c + 0.5, min(max((y1 - y) * sy, -CLAMP_PX), CLAMP_PX)]
+                previous = y
+            if len(run) > 2:
+                runs.append(run)
+            return runs
+        # The tile level is the next finer power of two, so each canvas
+        # column takes one or two tile columns. Columns just outside the
+        # view are included so the line runs to the edges.
+        lx, ly = math.ceil(math.log2(sx)), math.ceil(math.log2(sy))
+        scale = 2.0 ** lx
+        j0 = math.floor(x0 * scale) - 2 * BASE_PX
+        j1 = math.ceil(x1 * scale) + 2 * BASE_PX
+        rows = self.columns(lx, ly, j0, j1)
+        present = numpy.flatnonzero(rows[4])
+        if not len(present):
+            return []
+        rows = rows[:, present]
+        cols = numpy.floor(((j0 + present + 0.5) / scale - x0) * sx)
+        starts = numpy.concatenate(([0], numpy.flatnonzero(numpy.diff(cols)) + 1))
+        ends = numpy.concatenate((starts[1:], [len(cols)])) - 1
+        low = numpy.fmin.reduceat(rows[1], starts)
+        high = numpy.fmax.reduceat(rows[2], starts)
+        first = numpy.where(numpy.isnan(rows[0][starts]), low, rows[0][starts])
+        last = numpy.where(numpy.isnan(rows[3][ends]), high, rows[3][ends])
+        points = numpy.empty((len(starts), 4, 2))
+        # Drawn where the tile columns behind them are, not at the middle
+        # of the canvas column.
+        middle = ((j0 + (present[starts] + present[ends] + 1) / 2) / scale - x0) * sx
+        points[:, :, 0] = numpy.clip(middle, -CLAMP_PX, CLAMP_PX)[:, None]
+        points[:, :, 1] = numpy.clip((y1 - numpy.stack((first, low, high, last), axis=1)) * sy, -CLAMP_PX, CLAMP_PX)
+        # A column whose samples are all undefined breaks the line, and so
+        # does a pole: a column running off both ends of the view, or the
+        # curve leaving at one end and coming back at the other.
+        top, bottom = y1 + (y1 - y0), y0 - (y1 - y0)
+        with numpy.errstate(invalid="ignore"):
+            gap = numpy.isnan(low) | ((high > top) & (low < bottom))
+            jump = (((last[:-1] > top) & (first[1:] < bottom)) | ((last[:-1] < bottom) & (first[1:] > top)))
+        cut = numpy.concatenate((jump, [True]))
+        starts = numpy.flatnonzero(~gap & numpy.concatenate(([True], gap[:-1] | jump)))
+        stops = numpy.flatnonzero(~gap & (numpy.concatenate((gap[1:], [True])) | cut)) + 1
+        return [points[start:stop].ravel().tolist() for start, stop in zip(starts, stops)]
@@ -1,18 +1,40 @@
 import tkinter as tk
-from tkinter import messagebox
-import math
+from tkinter import filedialog, messagebox
 import time
 import os
 import sys
+from collections import deque
+import ipc
+import ticker
+import calcengine
+import calcworker
+import calchistory
+import calcplot
+
+POLL_MS = 50
+# Entries kept in memory and shown when the calculator opens; older ones are
+# read from the store a page at a time as the history box scrolls up.
+RECENT_ENTRIES = int(os.environ.get("PSEUDOOS_CALC_HISTORY_RECENT", "200"))
+HISTORY_PAGE = 200
+MAX_RENDERED = 1000
+HISTORY_SEARCH_DELAY_MS = 150
+# Plot view zoom per mouse wheel notch, and the widest and narrowest x range.
+PLOT_ZOOM = 1.25
+PLOT_SPAN = (1e-9, 1e12)
 
 class Calculator:
     def __init__(self, root, username):
         self.root = root
         self.username = username
-        self.history = []
         self.user_dir = os.path.join("users", self.username, "calc")
-        os.makedirs(self.user_dir, exist_ok=True)
-        self.history_file = os.path.join(self.user_dir, "history.txt")
+        self.store = calchistory.HistoryStore(self.user_dir)
+        self.history = deque(maxlen=RECENT_ENTRIES)
+        # ids of the entries in the history box, top to bottom.
+        self.view_ids = deque()
+        self.view_query = ""
+        self.at_oldest = self.at_newest = True
+        self.page_after = None
+        self.search_after = None
 
         self.root.title("PseudoOS Calculator")
         self.root.configure(bg="black")
@@ -20,8 +42,18 @@ class Calculator:
         self.root.bind("<Key>", self.key_input)
 
         self.expression = ""
+        self.worker = calcworker.CalcWorker(self.username)
+        self.worker.start()
+        self.pending_expression = None
+        self.poll_job = None
+        self.batch_panel = None
+        self.batch_job = None
+        self.batch_poll = None
+        self.plot_panel = None
+        self.plot = None
         self.build_ui()
         self.update_clock()
+        ipc.serve(self.root, self.username, "calculator.py", lambda args: ipc.raise_window(self.root))
 
     def build_ui(self):
         self.clock_label = tk.Label(self.root, font=("Courier New", 14), fg="#00FF00", bg="black")
@@ -30,6 +62,13 @@ class Calculator:
         self.display = tk.Entry(self.root, font=("Courier New", 24), bg="black", fg="#00FF00",
                                 insertbackground="#00FF00", justify="right")
         self.display.pack(fill="x", padx=10, pady=20)
+        self.display.bind("<Destroy>", lambda e: self.close_workers())
+
+        self.busy_frame = tk.Frame(self.root, bg="black")
+        tk.Label(self.busy_frame, text="Computing…", font=("Courier New", 14), fg="#00FF00",
+                 bg="black").pack(side="left", padx=10)
+        tk.Button(self.busy_frame, text="Cancel", command=self.cancel_calculation,
+                  fg="#00FF00", bg="black").pack(side="left", padx=10)
 
         btn_rows = [
             ['7', '8', '9', '/'],
@@ -52,33 +91,35 @@ class Calculator:
         extra = tk.Frame(self.root, bg="black")
         extra.pack(pady=10)
         tk.Button(extra, text="Clear", command=self.clear, fg="#00FF00", bg="black").pack(side="left", padx=5)
+        tk.Button(extra, text="Batch", command=self.open_batch_panel, fg="#00FF00", bg="black").pack(side="left", padx=5)
+        tk.Button(extra, text="Plot", command=self.open_plot_panel, fg="#00FF00", bg="black").pack(side="left", padx=5)
         tk.Button(extra, text="Delete History", command=self.delete_history, fg="#00FF00", bg="black").pack(side="left", padx=5)
         tk.Button(extra, text="Exit", command=self.root.destroy, fg="#00FF00", bg="black").pack(side="left", padx=5)
 
+        search = tk.Frame(self.root, bg="black")
+        search.pack(fill="x", padx=10)
+        tk.Label(search, text="Search history:", font=("Courier New", 12), fg="#00FF00", bg="black").pack(side="left")
+        self.history_search = tk.Entry(search, font=("Courier New", 12), bg="black", fg="#00FF00",
+                                       insertbackground="#00FF00")
+        self.history_search.pack(side="left", fill="x", expand=True, padx=5)
+        self.history_search.bind("<KeyRelease>", self.schedule_history_search)
+
         self.history_box = tk.Text(self.root, height=10, bg="black", fg="#00FF00", font=("Courier New", 12))
         self.history_box.pack(fill="both", expand=True, padx=10, pady=10)
-        self.history_box.config(state="disabled")
+        self.history_box.config(state="disabled", yscrollcommand=self.on_history_scroll)
 
         self.load_history()
 
     def update_clock(self):
-        current_time = time.strftime("%a, %Y-%m-%d %H:%M:%S")
-        self.clock_label.config(text=current_time)
-        self.root.after(1000, self.update_clock)
+        ticker.get(self.root).bind_label(self.clock_label, "%a, %Y-%m-%d %H:%M:%S")
 
     def button_press(self, char):
         if char == "=":
             self.calculate()
-        elif char == "π":
-            self.expression += str(math.pi)
-        elif char == "e":
-            self.expression += str(math.e)
         elif char == "sqrt":
-            self.expression += "math.sqrt("
-        elif char == "^":
-            self.expression += "**"
+            self.expression += "sqrt("
         elif char == "mod":
-            self.expression += "%"
+            self.expression += " mod "
         else:
             self.expression += char
 
@@ -86,8 +127,10 @@ class Calculator:
         self.display.insert(tk.END, self.expression)
 
     def key_input(self, event):
+        if event.widget is self.history_search:
+            return
         key = event.char
-        if key in '0123456789.+-*/()%':
+        if key in '0123456789.+-*/()%^!':
             self.expression += key
         elif key == '\r':
             self.calculate()
@@ -98,52 +141,387 @@ class Calculator:
         self.display.insert(tk.END, self.expression)
 
     def calculate(self):
-        try:
-            result = str(eval(self.expression))
-            timestamp = time.strftime("%a %Y-%m-%d %H:%M:%S")
-            entry = f"{timestamp}: {self.expression} = {result}"
-            self.history.append(entry)
-            self.save_history(entry)
-            self.update_history_box(entry)
-            self.display.delete(0, tk.END)
-            self.display.insert(tk.END, result)
-            self.expression = ""
-        except Exception as e:
-            messagebox.showerror("Error", f"Invalid Expression\n\n{e}")
+        # Evaluation happens in the worker process; poll_result picks up the
+        # answer so the window keeps responding meanwhile.
+        if self.pending_expression is not None:
+            return
+        self.pending_expression = self.expression
+        self.worker.submit(self.expression)
+        self.busy_frame.pack(after=self.display, pady=5)
+        self.poll_job = ticker.get(self.root).every(POLL_MS, self.poll_result, owner=self.display)
+
+    def poll_result(self):
+        reply = self.worker.poll()
+        if reply is None:
+            return
+        expression = self.pending_expression
+        self.end_calculation()
+        ok, result = reply
+        if not ok:
+            messagebox.showerror("Error", f"Invalid Expression\n\n{result}")
             self.expression = ""
+            return
+        self.add_history_entry(self.store.add(expression, result))
+        self.display.delete(0, tk.END)
+        self.display.insert(tk.END, result)
+        self.expression = ""
+
+    def cancel_calculation(self):
+        self.worker.cancel()
+        self.end_calculation()
+
+    def end_calculation(self):
+        self.pending_expression = None
+        if self.poll_job is not None:
+            self.poll_job.cancel()
+            self.poll_job = None
+        self.busy_frame.pack_forget()
+
+    def close_workers(self):
+        self.worker.close()
+        if self.batch_job is not None:
+            self.batch_job.cancel()
+        self.store.close()
+
+    # --- Batch evaluation: calcbatch.py runs in its own process and reports
+    # progress as JSON lines; the summary lands in the history. ---
+    def open_batch_panel(self):
+        if self.batch_panel is not None and self.batch_panel.winfo_exists():
+            self.batch_panel.lift()
+            return
+        panel = self.batch_panel = tk.Toplevel(self.root)
+        panel.title("Batch Evaluation")
+        panel.configure(bg="black")
+        panel.geometry("700x260")
+        form = tk.Frame(panel, bg="black")
+        form.pack(fill="x", padx=10, pady=10)
+        form.columnconfigure(1, weight=1)
+        self.batch_fields = {}
+        fields = [("Expression in x", self.expression or "x^2 + sqrt(x)"), ("From", "0"), ("To", "1000000"), ("Step", "1")]
+        for row, (label, default) in enumerate(fields):
+            tk.Label(form, text=label, fg="#00FF00", bg="black", font=("Courier New", 12)).grid(row=row, column=0, sticky="w")
+            entry = tk.Entry(form, bg="black", fg="#00FF00", insertbackground="#00FF00", font=("Courier New", 12))
+            entry.insert(0, default)
+            entry.grid(row=row, column=1, sticky="ew", padx=10, pady=2)
+            self.batch_fields[label] = entry
+        buttons = tk.Frame(panel, bg="black")
+        buttons.pack(pady=5)
+        self.batch_range_btn = tk.Button(buttons, text="Run Range", command=self.run_batch_range, fg="#00FF00", bg="black")
+        self.batch_range_btn.pack(side="left", padx=5)
+        self.batch_file_btn = tk.Button(buttons, text="Run File...", command=self.run_batch_file, fg="#00FF00", bg="black")
+        self.batch_file_btn.pack(side="left", padx=5)
+        self.batch_cancel_btn = tk.Button(buttons, text="Cancel", command=self.cancel_batch, fg="#00FF00", bg="black")
+        self.batch_cancel_btn.pack(side="left", padx=5)
+        self.batch_status = tk.Label(panel, text="", fg="#00FF00", bg="black", font=("Courier New", 12),
+                                     wraplength=660, justify="left")
+        self.batch_status.pack(fill="x", padx=10, pady=5)
+        self.update_batch_buttons()
+
+    def update_batch_buttons(self):
+        if self.batch_panel is None or not self.batch_panel.winfo_exists():
+            return
+        running = self.batch_job is not None
+        self.batch_range_btn.config(state="disabled" if running else "normal")
+        self.batch_file_btn.config(state="disabled" if running else "normal")
+        self.batch_cancel_btn.config(state="normal" if running else "disabled")
+
+    def set_batch_status(self, text):
+        if self.batch_panel is not None and self.batch_panel.winfo_exists():
+            self.batch_status.config(text=text)
+
+    def ask_batch_output(self):
+        return filedialog.asksaveasfilename(parent=self.batch_panel, initialdir=os.path.abspath(self.user_dir),
+                                            initialfile=time.strftime("batch-%Y%m%d-%H%M%S.txt"),
+                                            defaultextension=".txt", filetypes=[("Text Files", "*.txt")])
+
+    def run_batch_range(self):
+        fields = [self.batch_fields[name].get().strip() for name in ("Expression in x", "From", "To", "Step")]
+        if not all(fields):
+            messagebox.showerror("Batch", "Fill in the expression, From, To and Step.", parent=self.batch_panel)
+            return
+        out = self.ask_batch_output()
+        if out:
+            expression, start, stop, step = fields
+            self.start_batch(["--expr", expression, "--range", start, stop, step, "--out", out])
+
+    def run_batch_file(self):
+        source = filedialog.askopenfilename(parent=self.batch_panel, title="Expressions, one per line",
+                                            initialdir=os.path.abspath(self.user_dir),
+                                            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+        if not source:
+            return
+        out = self.ask_batch_output()
+        if out:
+            self.start_batch(["--file", source, "--out", out])
+
+    def start_batch(self, args):
+        self.batch_job = calcworker.BatchJob(self.username, args)
+        self.batch_error = None
+        self.set_batch_status("Starting...")
+        self.update_batch_buttons()
+        self.batch_poll = ticker.get(self.root).every(POLL_MS, self.poll_batch, owner=self.history_box)
+
+    def poll_batch(self):
+        for message in self.batch_job.poll():
+            if "done" in message:
+                self.set_batch_status(f"{message['done']:,} evaluated ({message['fraction']:.0%})")
+            elif "entry" in message:
+                # calcbatch.py has already added it to the store.
+                self.add_history_entry(tuple(message["entry"]))
+                self.set_batch_status(message["entry"][3])
+            elif "error" in message:
+                self.batch_error = message["error"]
+            elif "exited" in message:
+                self.end_batch()
+                if self.batch_error:
+                    self.set_batch_status("Failed.")
+                    messagebox.showerror("Batch", self.batch_error)
+                elif message["exited"] != 0:
+                    self.set_batch_status(f"Stopped (exit status {message['exited']}).")
+                return
+
+    def cancel_batch(self):
+        if self.batch_job is not None:
+            self.batch_job.cancel()
+            self.end_batch()
+            self.set_batch_status("Cancelled.")
+
+    def end_batch(self):
+        self.batch_job = None
+        if self.batch_poll is not None:
+            self.batch_poll.cancel()
+            self.batch_poll = None
+        self.update_batch_buttons()
+
+    # --- Plot: calcplot samples the curve and keeps it cached per zoom level;
+    # the canvas reuses one line item per unbroken run of the curve. Redraws
+    # are coalesced, so a drag or a burst of wheel events draws once per
+    # idle. ---
+    def open_plot_panel(self):
+        if self.plot_panel is not None and self.plot_panel.winfo_exists():
+            self.plot_panel.lift()
+            return
+        panel = self.plot_panel = tk.Toplevel(self.root)
+        panel.title("Plot")
+        panel.configure(bg="black")
+        panel.geometry("900x640")
+        form = tk.Frame(panel, bg="black")
+        form.pack(fill="x", padx=10, pady=10)
+        tk.Label(form, text="y =", fg="#00FF00", bg="black", font=("Courier New", 12)).pack(side="left")
+        self.plot_entry = tk.Entry(form, bg="black", fg="#00FF00", insertbackground="#00FF00", font=("Courier New", 12))
+        self.plot_entry.insert(0, self.expression if "x" in self.expression else "sin(x)")
+        self.plot_entry.pack(side="left", fill="x", expand=True, padx=10)
+        self.plot_entry.bind("<Return>", lambda e: self.show_plot())
+        tk.Button(form, text="Plot", command=self.show_plot, fg="#00FF00", bg="black").pack(side="left", padx=5)
+        tk.Button(form, text="Fit", command=self.fit_plot, fg="#00FF00", bg="black").pack(side="left", padx=5)
+        self.plot_status = tk.Label(panel, text="Drag to pan, scroll to zoom.", fg="#00FF00", bg="black",
+                                    font=("Courier New", 10), anchor="w")
+        self.plot_status.pack(side="bottom", fill="x", padx=10, pady=5)
+        self.plot_canvas = tk.Canvas(panel, bg="black", highlightthickness=0)
+        self.plot_canvas.pack(fill="both", expand=True, padx=10)
+        self.plot_axes = [self.plot_canvas.create_line(0, 0, 0, 0, fill="#006600", state="hidden") for _ in range(2)]
+        self.plot_lines = []
+        self.plot_shown = 0
+        self.plot_after = None
+        self.plot_drag = None
+        self.plot = None
+        self.plot_view = [-10.0, 10.0, -2.0, 2.0]
+        self.plot_canvas.bind("<Configure>", lambda e: self.schedule_plot())
+        self.plot_canvas.bind("<ButtonPress-1>", self.start_plot_drag)
+        self.plot_canvas.bind("<B1-Motion>", self.drag_plot)
+        self.plot_canvas.bind("<MouseWheel>", lambda e: self.zoom_plot(e, e.delta > 0))
+        self.plot_canvas.bind("<Button-4>", lambda e: self.zoom_plot(e, True))
+        self.plot_canvas.bind("<Button-5>", lambda e: self.zoom_plot(e, False))
+        panel.after_idle(self.show_plot)
+
+    def show_plot(self):
+        text = self.plot_entry.get().strip()
+        if not text:
+            return
+        try:
+            self.plot = calcplot.Plot(text)
+        except calcengine.ExpressionError as e:
+            messagebox.showerror("Plot", f"Invalid Expression\n\n{e}", parent=self.plot_panel)
+            return
+        self.fit_plot()
+
+    def fit_plot(self):
+        if self.plot is None:
+            return
+        x0, x1 = self.plot_view[:2]
+        self.plot_view[2:] = self.plot.fit_y(x0, x1, max(self.plot_canvas.winfo_width(), 100))
+        self.schedule_plot()
+
+    def schedule_plot(self):
+        if self.plot_after is None:
+            self.plot_after = self.plot_canvas.after_idle(self.draw_plot)
+
+    def draw_plot(self):
+        self.plot_after = None
+        canvas = self.plot_canvas
+        if self.plot is None or not canvas.winfo_exists():
+            return
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if width < 2 or height < 2:
+            return
+        start = time.perf_counter()
+        x0, x1, y0, y1 = self.plot_view
+        runs = self.plot.polylines(x0, x1, y0, y1, width, height)
+        for i, run in enumerate(runs):
+            if i == len(self.plot_lines):
+                self.plot_lines.append(canvas.create_line(0, 0, 0, 0, fill="#00FF00"))
+            canvas.coords(self.plot_lines[i], run)
+            if i >= self.plot_shown:
+                canvas.itemconfig(self.plot_lines[i], state="normal")
+        for item in self.plot_lines[len(runs):self.plot_shown]:
+            canvas.itemconfig(item, state="hidden")
+        self.plot_shown = len(runs)
+
+        axis_x, axis_y = -x0 * width / (x1 - x0), y1 * height / (y1 - y0)
+        canvas.coords(self.plot_axes[0], axis_x, 0, axis_x, height)
+        canvas.coords(self.plot_axes[1], 0, axis_y, width, axis_y)
+        canvas.itemconfig(self.plot_axes[0], state="normal" if 0 <= axis_x < width else "hidden")
+        canvas.itemconfig(self.plot_axes[1], state="normal" if 0 <= axis_y < height else "hidden")
+        ms = (time.perf_counter() - start) * 1000
+        cached = f"{self.plot.samples:,} samples cached" if self.plot.vfunc is not None else "sampled per pixel"
+        self.plot_status.config(text=f"x {x0:.6g} .. {x1:.6g}   y {y0:.6g} .. {y1:.6g}   {cached}   {ms:.1f} ms")
+
+    def start_plot_drag(self, event):
+        self.plot_drag = (event.x, event.y, list(self.plot_view))
+
+    def drag_plot(self, event):
+        if self.plot_drag is None:
+            return
+        start_x, start_y, (x0, x1, y0, y1) = self.plot_drag
+        dx = (event.x - start_x) * (x1 - x0) / max(self.plot_canvas.winfo_width(), 1)
+        dy = (event.y - start_y) * (y1 - y0) / max(self.plot_canvas.winfo_height(), 1)
+        self.plot_view = [x0 - dx, x1 - dx, y0 + dy, y1 + dy]
+        self.schedule_plot()
+
+    def zoom_plot(self, event, zoom_in):
+        # Zooms both axes around the point under the cursor.
+        factor = 1 / PLOT_ZOOM if zoom_in else PLOT_ZOOM
+        x0, x1, y0, y1 = self.plot_view
+        if not PLOT_SPAN[0] <= (x1 - x0) * factor <= PLOT_SPAN[1]:
+            return
+        fx = event.x / max(self.plot_canvas.winfo_width(), 1)
+        fy = event.y / max(self.plot_canvas.winfo_height(), 1)
+        cx, cy = x0 + (x1 - x0) * fx, y1 - (y1 - y0) * fy
+        self.plot_view = [cx - (cx - x0) * factor, cx + (x1 - cx) * factor,
+                          cy - (cy - y0) * factor, cy + (y1 - cy) * factor]
+        self.schedule_plot()
 
     def clear(self):
         self.expression = ""
         self.display.delete(0, tk.END)
 
-    def save_history(self, entry):
-        with open(self.history_file, "a") as f:
-            f.write(entry + "\n")
-
+    # --- History: the newest entries are rendered in one insert when the
+    # calculator opens; scrolling to either end of the box reads the next
+    # page from the store and drops entries from the far end past
+    # MAX_RENDERED. ---
     def load_history(self):
-        if os.path.exists(self.history_file):
-            with open(self.history_file, "r") as f:
-                self.history = f.read().splitlines()
-            for entry in self.history:
-                self.update_history_box(entry)
+        self.history.extend(self.store.page(RECENT_ENTRIES))
+        self.show_entries(list(self.history), len(self.history) < RECENT_ENTRIES)
+
+    def show_entries(self, entries, at_oldest, query=""):
+        self.view_query = query
+        self.view_ids = deque(entry[0] for entry in entries)
+        self.at_oldest, self.at_newest = at_oldest, True
+        self.history_box.config(state="normal")
+        self.history_box.delete("1.0", tk.END)
+        self.history_box.insert(tk.END, "".join(calchistory.format_entry(e) + "\n" for e in entries))
+        self.history_box.config(state="disabled")
+        self.history_box.see(tk.END)
 
-    def update_history_box(self, entry):
+    def add_history_entry(self, entry):
+        self.history.append(entry)
+        if self.view_query:
+            return
+        if not self.at_newest:
+            self.show_entries(list(self.history), False)
+            return
+        self.insert_entries([entry], tk.END)
+        self.history_box.see(tk.END)
+
+    def insert_entries(self, entries, where):
         self.history_box.config(state="normal")
-        self.history_box.insert(tk.END, entry + "\n")
+        self.history_box.insert("1.0" if where == "top" else tk.END,
+                                "".join(calchistory.format_entry(e) + "\n" for e in entries))
+        if where == "top":
+            self.view_ids.extendleft(entry[0] for entry in reversed(entries))
+            excess = len(self.view_ids) - MAX_RENDERED
+            if excess > 0:
+                self.history_box.delete(f"{len(self.view_ids) - excess + 1}.0", f"{len(self.view_ids) + 1}.0")
+                for _ in range(excess):
+                    self.view_ids.pop()
+                self.at_newest = False
+        else:
+            self.view_ids.extend(entry[0] for entry in entries)
+            excess = len(self.view_ids) - MAX_RENDERED
+            if excess > 0:
+                self.history_box.delete("1.0", f"{excess + 1}.0")
+                for _ in range(excess):
+                    self.view_ids.popleft()
+                self.at_oldest = False
         self.history_box.config(state="disabled")
+        return excess
+
+    def on_history_scroll(self, first, last):
+        # yscrollcommand: fires while the box is being changed too, so the
+        # paging itself runs after the current update.
+        if self.page_after is None and ((float(first) <= 0 and not self.at_oldest)
+                                        or (float(last) >= 1 and not self.at_newest)):
+            self.page_after = self.history_box.after_idle(self.page_history)
+
+    def page_history(self):
+        self.page_after = None
+        if not self.history_box.winfo_exists() or not self.view_ids:
+            return
+        first, last = self.history_box.yview()
+        top_line = int(self.history_box.index("@0,0").split(".")[0])
+        if first <= 0 and not self.at_oldest:
+            older = self.store.page(HISTORY_PAGE, before=self.view_ids[0], query=self.view_query)
+            self.at_oldest = len(older) < HISTORY_PAGE
+            if older:
+                self.insert_entries(older, "top")
+                # Keep the line that was at the top where it was.
+                self.history_box.yview(f"{top_line + len(older)}.0")
+        elif last >= 1 and not self.at_newest:
+            newer = self.store.page(HISTORY_PAGE, after=self.view_ids[-1], query=self.view_query)
+            self.at_newest = len(newer) < HISTORY_PAGE
+            if newer:
+                dropped = max(0, self.insert_entries(newer, tk.END))
+                self.history_box.yview(f"{max(1, top_line - dropped)}.0")
+
+    def schedule_history_search(self, event=None):
+        if self.search_after is not None:
+            self.history_search.after_cancel(self.search_after)
+        self.search_after = self.history_search.after(HISTORY_SEARCH_DELAY_MS, self.search_history)
+
+    def search_history(self):
+        self.search_after = None
+        if not self.history_box.winfo_exists():
+            return
+        query = self.history_search.get().strip()
+        if query == self.view_query:
+            return
+        if not query:
+            self.show_entries(list(self.history), len(self.history) < RECENT_ENTRIES)
+            return
+        entries = self.store.page(HISTORY_PAGE, query=query)
+        self.show_entries(entries, len(entries) < HISTORY_PAGE, query)
 
     def delete_history(self):
         if messagebox.askyesno("Delete", "Are you sure you want to delete all history?"):
-            self.history = []
-            if os.path.exists(self.history_file):
-                os.remove(self.history_file)
-            self.history_box.config(state="normal")
-            self.history_box.delete("1.0", tk.END)
-            self.history_box.config(state="disabled")
+            self.store.clear()
+            self.history.clear()
+            self.show_entries([], True, self.view_query)
             messagebox.showinfo("Deleted", "History cleared.")
 
 if __name__ == "__main__":
     username = sys.argv[1] if len(sys.argv) > 1 else "guest"
+    if ipc.forward(username, "calculator.py", []):
+        sys.exit(0)
     root = tk.Tk()
     app = Calculator(root, username)
     root.mainloop()
@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import queue
+import signal
+import threading
+import subprocess
+import supervisor
+
+try:
+    import resource
+except ImportError:
+    # No rlimits (Windows): Cancel is the only way to stop a runaway job.
+    resource = None
+
+from apphost import BASE_DIR, PYTHON_EXEC
+
+# Calculator expressions are evaluated in a separate process so big integer
+# arithmetic can't freeze the window. Each evaluation gets its own CPU-time
+# allowance; the address-space cap applies to the worker as a whole. Inside
+# the worker the engine's result-size budget is raised, since these limits
+# now bound the cost.
+CPU_SECONDS = int(os.environ.get("PSEUDOOS_CALC_CPU_SECONDS", "10"))
+MEMORY_MB = int(os.environ.get("PSEUDOOS_CALC_MEMORY_MB", "1024"))
+WORKER_MAX_BITS = int(os.environ.get("PSEUDOOS_CALC_WORKER_MAX_BITS", str(256 * 1024 * 1024)))
+# How the kernel stops a process over its CPU limit.
+CPU_LIMIT_SIGNALS = {-s for s in (getattr(signal, "SIGXCPU", None), getattr(signal, "SIGKILL", None)) if s}
+
+
+class CalcWorker:
+    def __init__(self, username):
+        self.username = username
+        self.proc = None
+        self.replies = queue.Queue()
+        self.next_id = 0
+        self.pending = None
+
+    def start(self):
+        if self.proc is not None and self.proc.poll() is None:
+            return
+        self.proc = subprocess.Popen(
+            [PYTHON_EXEC, os.path.join(BASE_DIR, "calcworker.py"), "--worker"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1
+        )
+        supervisor.session().register(self.proc, "calc-worker", self.username)
+        threading.Thread(target=self._read_replies, args=(self.proc,), daemon=True).start()
+
+    def _read_replies(self, proc):
+        for line in proc.stdout:
+            try:
+                self.replies.put(json.loads(line))
+            except ValueError:
+                continue
+        # The worker is gone: killed by a limit, cancelled or crashed.
+        returncode = proc.wait()
+        self.replies.put({"id": None, "exited": returncode, "proc": proc})
+
+    def submit(self, expression):
+        # Returns the request id; the reply turns up in poll().
+        self.next_id += 1
+        self.pending = self.next_id
+        request = json.dumps({"id": self.next_id, "expression": expression}) + "\n"
+        for attempt in range(2):
+            self.start()
+            try:
+                self.proc.stdin.write(request)
+                self.proc.stdin.flush()
+                break
+            except (BrokenPipeError, OSError):
+                # It died since the last request; start another.
+                self.cancel()
+                self.pending = self.next_id
+        return self.next_id
+
+    def poll(self):
+        # Returns (ok, text) for the pending request once it is settled.
+        while True:
+            try:
+                reply = self.replies.get_nowait()
+            except queue.Empty:
+                return None
+            if reply["id"] is None:
+                if reply["proc"] is not self.proc or self.pending is None:
+                    continue
+                self.pending = None
+                if reply["exited"] in CPU_LIMIT_SIGNALS:
+                    return False, f"Stopped: used more than {CPU_SECONDS}s of CPU time"
+                return False, f"Calculation process exited ({reply['exited']})"
+            if reply["id"] == self.pending:
+                self.pending = None
+                return reply["ok"], reply["text"]
+
+    def cancel(self):
+        # The worker can't be interrupted mid-operation, so it is killed and
+        # a fresh one is started for the next calculation.
+        self.pending = None
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.kill()
+        self.proc = None
+
+    def close(self):
+        self.cancel()
+
+
+class BatchJob:
+    # A calcbatch.py run started from the calculator. poll() returns the
+    # progress messages it has printed since the last call.
+    def __init__(self, username, args):
+        self.messages = queue.Queue()
+        self.proc = supervisor.session().spawn(
+            [PYTHON_EXEC, os.path.join(BASE_DIR, "calcbatch.py"), username, *args, "--progress"],
+            "calc-batch", username, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        stray = []
+        for line in self.proc.stdout:
+            try:
+                self.messages.put(json.loads(line))
+            except ValueError:
+                # A traceback or usage message; passed on in one piece.
+                stray.append(line.rstrip())
+        returncode = self.proc.wait()
+        if stray:
+            self.messages.put({"error": "\n".join(stray[-20:])})
+        self.messages.put({"exited": returncode})
+
+    def poll(self):
+        found = []
+        while True:
+            try:
+                found.append(self.messages.get_nowait())
+            except queue.Empty:
+                return found
+
+    def cancel(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+
+
+def set_cpu_allowance():
+    if resource is None:
+        return
+    used = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(used.ru_utime + used.ru_stime) + 1 + CPU_SECONDS
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def worker_main():
+    import calcengine
+
+    calcengine.MAX_RESULT_BITS = WORKER_MAX_BITS
+    if resource is not None and hasattr(resource, "RLIMIT_AS"):
+        limit = MEMORY_MB * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+        except (ValueError, OSError):
+            pass
+    for line in sys.stdin:
+        request = json.loads(line)
+        set_cpu_allowance()
+        try:
+            reply = {"ok": True, "text": calcengine.format_result(calcengine.evaluate(request["expression"]))}
+        except calcengine.ExpressionError as e:
+            reply = {"ok": False, "text": str(e)}
+        except MemoryError:
+            reply = {"ok": False, "text": f"Stopped: needed more than {MEMORY_MB} MB of memory"}
+        except Exception as e:
+            reply = {"ok": False, "text": f"{type(e).__name__}: {e}"}
+        reply["id"] = request["id"]
+        print(json.dumps(reply), flush=True)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--worker"]:
+        worker_main()
@@ -1,8 +1,13 @@
 import tkinter as tk
 import os
-import subprocess
 import sys
-from datetime import datetime
+import ticker
+import startup_trace
+import supervisor
+import ipc
+from shutdown import ShutdownScreen
+from apphost import AppHost, LAUNCH_MODE, install_host, install_pool, launch_app
+from zygote import POOL_SIZE, WorkerPool
 
 class Desktop:
     def __init__(self, root, username):
@@ -16,6 +21,14 @@ class Desktop:
         self.user_dir = os.path.join("users", self.username)
         os.makedirs(self.user_dir, exist_ok=True)
 
+        self.host = AppHost(self.root, self.username)
+        install_host(self.host)
+        # Apps that run in their own process are handed pre-warmed workers.
+        self.pool = None
+        if LAUNCH_MODE == "process" and POOL_SIZE > 0:
+            self.pool = WorkerPool()
+            install_pool(self.pool)
+
         self.create_desktop_icons()
         self.create_taskbar()
         self.update_clock()
@@ -33,6 +46,7 @@ class Desktop:
         self.create_icon(icon_frame, "Tetris", self.launch_tetris)
         self.create_icon(icon_frame, "Path Finder", self.launch_pathfinder)
         self.create_icon(icon_frame, "Maze", self.launch_maze)  # NEW LINE
+        self.create_icon(icon_frame, "Task Manager", self.launch_taskmanager)
 
     def create_icon(self, parent, name, command):
         btn = tk.Button(parent, text=name, width=20, height=2, 
@@ -54,15 +68,10 @@ class Desktop:
         self.clock_label.pack(side="right", padx=10)
 
     def update_clock(self):
-        now = datetime.now()
-        time_str = now.strftime("%A, %d %B %Y | %H:%M:%S")
-        self.clock_label.config(text=time_str)
-        self.root.after(1000, self.update_clock)
+        ticker.get(self.root).bind_label(self.clock_label, "%A, %d %B %Y | %H:%M:%S")
 
     def launch_script(self, script_name):
-        script_path = os.path.join(os.path.dirname(__file__), script_name)
-        python_exec = "python3" if sys.platform != "win32" else "python"
-        subprocess.Popen([python_exec, script_path, self.username])
+        return launch_app(script_name, self.username)
 
     def launch_my_computer(self): self.launch_script("my_computer.py")
     def launch_calculator(self): self.launch_script("calculator.py")
@@ -74,17 +83,25 @@ class Desktop:
     def launch_pathfinder(self): self.launch_script("pathfinder.py")
     def launch_maze(self): self.launch_script("maze.py")  # NEW LINE
 
-    def shutdown(self):
-        shutdown_script = os.path.join(os.path.dirname(__file__), "shutdown.py")
-        python_exec = "python3" if sys.platform != "win32" else "python"
+    def launch_taskmanager(self):
+        # Always hosted: it reads this session's process registry.
+        if ipc.forward(self.username, "taskmanager.py", []):
+            return
         try:
-            subprocess.Popen([python_exec, shutdown_script])
-            self.root.after(2000, lambda: os._exit(0))
+            self.host.launch("taskmanager.py")
         except Exception as e:
-            print(f"Shutdown failed: {e}")
+            print(f"[desktop] Hosted task manager failed ({e}), starting a new process")
+            self.launch_script("taskmanager.py")
+
+    def shutdown(self):
+        # Runs in this process so it can drain the children we supervise.
+        ShutdownScreen(tk.Toplevel(self.root), desktop=self)
 
 if __name__ == "__main__":
     username = sys.argv[1] if len(sys.argv) > 1 else "guest"
+    startup_trace.begin("desktop")
+    supervisor.become_session_leader()
     root = tk.Tk()
+    startup_trace.watch_window(root)
     app = Desktop(root, username)
     root.mainloop()
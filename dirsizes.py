@@ -0,0 +1,120 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Recursive folder sizes for My Computer: total bytes, file count and the
+# newest mtime under each folder. Each directory is one task on a shared
+# thread pool (scandir releases the GIL, so the walk runs in parallel) and
+# submits its subfolders as further tasks. A folder's result is queued as
+# soon as its last directory is done.
+#
+# Every directory's own totals are cached against its mtime_ns, so walking
+# an unchanged tree again costs one stat per directory. A file rewritten in
+# place doesn't change its directory's mtime; its old size is counted until
+# something is added, removed or renamed there.
+WORKERS = int(os.environ.get("PSEUDOOS_DIRSIZE_WORKERS", str(min(8, (os.cpu_count() or 1) * 2))))
+# Directories whose own totals are remembered.
+MAX_CACHED = int(os.environ.get("PSEUDOOS_DIRSIZE_CACHE", "200000"))
+
+_pool = None
+_pool_lock = threading.Lock()
+# path -> (mtime_ns, bytes, files, newest mtime, [subfolder paths])
+_cache = {}
+
+
+def pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="dirsizes")
+        return _pool
+
+
+def scan_own(path):
+    # (mtime_ns, bytes, files, newest mtime, subfolders) for path's direct
+    # entries, from the cache while path's mtime is unchanged.
+    st = os.stat(path)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        return cached
+    size = files = 0
+    newest = st.st_mtime
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                entry_st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            size += entry_st.st_size
+            files += 1
+            newest = max(newest, entry_st.st_mtime)
+    result = (st.st_mtime_ns, size, files, newest, subdirs)
+    if len(_cache) >= MAX_CACHED:
+        _cache.clear()
+    _cache[path] = result
+    return result
+
+
+class Walk:
+    # Sizes of the given folders, computed in the background. poll() returns
+    # finished folders as (path, bytes, files, newest mtime); cancel() stops
+    # the walk at the next directory.
+    def __init__(self, paths):
+        self.results = queue.Queue()
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        # folder -> [bytes, files, newest mtime, directories pending]
+        self.totals = {}
+        self.remaining = len(paths)
+        executor = pool()
+        for path in paths:
+            self.totals[path] = [0, 0, 0.0, 1]
+            executor.submit(self._visit, path, path)
+
+    @property
+    def done(self):
+        return self.remaining == 0 or self.cancelled.is_set()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def poll(self):
+        results = []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def _visit(self, root, path):
+        if self.cancelled.is_set():
+            return
+        try:
+            mtime_ns, size, files, newest, subdirs = scan_own(path)
+        except OSError:
+            size = files = 0
+            newest = 0.0
+            subdirs = []
+        with self.lock:
+            total = self.totals[root]
+            total[0] += size
+            total[1] += files
+            total[2] = max(total[2], newest)
+            # This directory is done, its subfolders are now pending.
+            total[3] += len(subdirs) - 1
+            finished = total[3] == 0
+            if finished:
+                self.remaining -= 1
+        if finished:
+            self.results.put((root, total[0], total[1], total[2]))
+            return
+        executor = pool()
+        for subdir in subdirs:
+            if self.cancelled.is_set():
+                return
+            executor.submit(self._visit, root, subdir)
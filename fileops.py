@@ -0,0 +1,294 @@
+import os
+import stat
+import errno
+import queue
+import shutil
+import threading
+import time
+
+# Bulk delete, copy and move for My Computer, run one job at a time on a
+# worker thread. A job first walks its sources (one scandir per folder) to
+# learn how many items and bytes there are, then works through them while
+# the window polls its progress. Cancelling stops it at the next item, or
+# the next chunk of a file being copied; whatever was done stays done.
+#
+# File data is copied in the kernel with os.copy_file_range, or
+# os.sendfile where that isn't supported (older kernels, some filesystems),
+# and with plain reads and writes as a last resort.
+COPY_CHUNK = int(os.environ.get("PSEUDOOS_COPY_CHUNK", str(8 * 1024 * 1024)))
+# Errors that mean "this way of copying doesn't work here", not "the copy failed".
+UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.ENOTSUP}
+MAX_ERRORS = 100
+VERBS = {"delete": "Deleting", "copy": "Copying", "move": "Moving"}
+
+
+class Cancelled(Exception):
+    pass
+
+
+def walk(top, sizes):
+    # top and everything under it as (path, is_dir, size), each folder before
+    # its contents. Symlinks are items of their own and never followed.
+    st = os.lstat(top)
+    if not stat.S_ISDIR(st.st_mode):
+        return [(top, False, st.st_size)]
+    items = [(top, True, 0)]
+    stack = [top]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    items.append((entry.path, True, 0))
+                    stack.append(entry.path)
+                else:
+                    items.append((entry.path, False, entry.stat(follow_symlinks=False).st_size if sizes else 0))
+    return items
+
+
+def free_name(folder, name):
+    # name, or "name (2).ext", "name (3).ext"... if folder already has one.
+    stem, ext = os.path.splitext(name)
+    candidate, n = name, 1
+    while os.path.lexists(os.path.join(folder, candidate)):
+        n += 1
+        candidate = f"{stem} ({n}){ext}"
+    return os.path.join(folder, candidate)
+
+
+class FileJob:
+    def __init__(self, kind, paths, dest=None):
+        self.kind = kind
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.dest = os.path.abspath(dest) if dest else None
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        # queued, preparing, running, done or cancelled. The counters are
+        # written by the worker and only read elsewhere.
+        self.state = "queued"
+        self.total_items = self.done_items = 0
+        self.total_bytes = self.done_bytes = 0
+        self.started = None
+        self.errors = []
+        # Paths created or removed at the top level, for the caller's caches.
+        self.changed = []
+        self.copy_method = "copy_file_range" if hasattr(os, "copy_file_range") else "sendfile"
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def describe(self):
+        # One line of progress: counts, throughput and time left.
+        verb = VERBS[self.kind]
+        if self.state == "queued":
+            return f"{verb} {len(self.paths)} item(s): waiting"
+        if self.state == "preparing":
+            return f"{verb}: counting {self.total_items:,} items..."
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        text = f"{verb} {self.done_items:,}/{self.total_items:,} items"
+        if self.total_bytes:
+            done, total = self.done_bytes, self.total_bytes
+            text += f", {done / 2 ** 20:,.1f}/{total / 2 ** 20:,.1f} MB, {done / 2 ** 20 / elapsed:,.1f} MB/s"
+        else:
+            done, total = self.done_items, self.total_items
+            text += f", {done / elapsed:,.0f} items/s"
+        if done and total > done:
+            left = int((total - done) * elapsed / done)
+            text += f", {left // 60}:{left % 60:02d} left"
+        return text
+
+    def fail(self, path, e):
+        if len(self.errors) < MAX_ERRORS:
+            reason = e.strerror if isinstance(e, OSError) and e.strerror else e
+            self.errors.append(f"{os.path.basename(path) or path}: {reason}")
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise Cancelled()
+
+    # --- Worker thread ---
+    def run(self):
+        self.state = "preparing"
+        try:
+            if self.kind == "delete":
+                self.run_delete(self.paths)
+            elif self.kind == "copy":
+                self.run_copy([(path, free_name(self.dest, os.path.basename(path))) for path in self.paths])
+            elif self.kind == "move":
+                self.run_move()
+            self.state = "done"
+        except Cancelled:
+            self.state = "cancelled"
+
+    def plan(self, paths, sizes):
+        plans = []
+        for path in paths:
+            self.check()
+            try:
+                items = walk(path, sizes)
+            except OSError as e:
+                self.fail(path, e)
+                continue
+            plans.append((path, items))
+            self.total_items += len(items)
+            self.total_bytes += sum(item[2] for item in items)
+        return plans
+
+    def start(self):
+        self.state = "running"
+        self.started = time.perf_counter()
+
+    def run_delete(self, paths):
+        plans = self.plan(paths, False)
+        self.start()
+        for top, items in plans:
+            self.changed.append(top)
+            # Contents before the folders holding them.
+            for path, is_dir, size in reversed(items):
+                self.check()
+                try:
+                    if is_dir:
+                        os.rmdir(path)
+                    else:
+                        os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self.fail(path, e)
+                self.done_items += 1
+
+    def run_copy(self, pairs):
+        plans = self.plan([src for src, dst in pairs], True)
+        targets = dict(pairs)
+        self.start()
+        for top, items in plans:
+            dst_top = targets[top]
+            if dst_top == top or dst_top.startswith(top + os.sep):
+                self.fail(top, "cannot be copied into itself")
+                continue
+            self.changed.append(dst_top)
+            for path, is_dir, size in items:
+                self.check()
+                dst = dst_top + path[len(top):]
+                try:
+                    if is_dir:
+                        os.mkdir(dst)
+                        shutil.copymode(path, dst)
+                    elif os.path.islink(path):
+                        os.symlink(os.readlink(path), dst)
+                    else:
+                        self.copy_file(path, dst)
+                except Cancelled:
+                    raise
+                except OSError as e:
+                    self.fail(path, e)
+                self.done_items += 1
+            # Folders get their times last, once nothing more is written into them.
+            for path, is_dir, size in reversed(items):
+                if is_dir and os.path.isdir(dst_top + path[len(top):]):
+                    try:
+                        shutil.copystat(path, dst_top + path[len(top):])
+                    except OSError:
+                        pass
+
+    def copy_file(self, src, dst):
+        with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+            try:
+                while True:
+                    self.check()
+                    copied = self.copy_chunk(fsrc, fdst)
+                    if not copied:
+                        break
+                    self.done_bytes += copied
+            except BaseException:
+                fdst.close()
+                os.unlink(dst)
+                raise
+        shutil.copystat(src, dst)
+
+    def copy_chunk(self, fsrc, fdst):
+        # Bytes copied at the current offsets, 0 at the end of fsrc.
+        if self.copy_method == "copy_file_range":
+            try:
+                return os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_CHUNK)
+            except OSError as e:
+                if e.errno not in UNSUPPORTED or fdst.tell():
+                    raise
+                self.copy_method = "sendfile"
+        if self.copy_method == "sendfile":
+            try:
+                return os.sendfile(fdst.fileno(), fsrc.fileno(), None, COPY_CHUNK)
+            except (OSError, AttributeError) as e:
+                if isinstance(e, OSError) and e.errno not in UNSUPPORTED or fdst.tell():
+                    raise
+                self.copy_method = "read"
+        data = fsrc.read(COPY_CHUNK)
+        fdst.write(data)
+        return len(data)
+
+    def run_move(self):
+        # A rename within one filesystem is instant; anything else is a copy
+        # followed by a delete of the original.
+        self.total_items = len(self.paths)
+        self.start()
+        slow = []
+        for path in self.paths:
+            self.check()
+            dst = free_name(self.dest, os.path.basename(path))
+            if self.dest == path or self.dest.startswith(path + os.sep):
+                self.fail(path, "cannot be moved into itself")
+            elif os.path.dirname(path) != self.dest:
+                try:
+                    os.rename(path, dst)
+                    self.changed += [path, dst]
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        self.fail(path, e)
+                    else:
+                        slow.append((path, dst))
+            self.done_items += 1
+        if slow:
+            self.total_items = self.done_items = 0
+            self.state = "preparing"
+            self.run_copy(slow)
+            if not self.errors:
+                self.total_items = self.done_items = self.total_bytes = self.done_bytes = 0
+                self.state = "preparing"
+                self.run_delete([src for src, dst in slow])
+
+
+class FileOps:
+    # The job queue: jobs run in the order they were submitted.
+    def __init__(self):
+        self.jobs = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, kind, paths, dest=None):
+        job = FileJob(kind, paths, dest)
+        self.jobs.put(job)
+        return job
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                if job.cancelled.is_set():
+                    job.state = "cancelled"
+                else:
+                    job.run()
+            except Exception as e:
+                job.errors.append(str(e))
+                job.state = "done"
+            finally:
+                job.finished.set()
+
+
+_ops = None
+_ops_lock = threading.Lock()
+
+def get():
+    # One queue per process, shared by every My Computer window in it.
+    global _ops
+    with _ops_lock:
+        if _ops is None:
+            _ops = FileOps()
+        return _ops
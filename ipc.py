@@ -0,0 +1,165 @@
+import os
+import json
+import queue
+import socket
+import atexit
+import tempfile
+import threading
+import ticker
+
+# One Unix domain socket per (user, app) lets a second launch of a
+# single-instance app hand its arguments to the instance already running.
+ENABLED = hasattr(socket, "AF_UNIX")
+CONNECT_TIMEOUT = 1.0
+POLL_MS = 200
+
+
+def runtime_dir():
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    path = os.path.join(base, f"pseudoos-{uid}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def socket_path(username, app_name):
+    return os.path.join(runtime_dir(), f"{username}-{os.path.splitext(app_name)[0]}.sock")
+
+
+def forward(username, app_name, args):
+    # Returns True if a running instance accepted the launch.
+    if not ENABLED:
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(socket_path(username, app_name))
+            sock.sendall((json.dumps({"args": list(args)}) + "\n").encode("utf-8"))
+            reply = sock.makefile("r", encoding="utf-8").readline().strip()
+            return reply == "ok"
+    except (OSError, ValueError):
+        return False
+
+
+class InstanceServer:
+    def __init__(self, username, app_name, sock, path):
+        self.username = username
+        self.app_name = app_name
+        self.sock = sock
+        self.path = path
+        self.handlers = []
+        self.requests = queue.Queue()
+        self.lock = threading.Lock()
+        self.poll_job = None
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        atexit.register(self.close)
+
+    def add_handler(self, root, handler):
+        entry = (root, handler)
+        with self.lock:
+            self.handlers.append(entry)
+
+        def on_destroy(event):
+            if event.widget is root:
+                with self.lock:
+                    if entry in self.handlers:
+                        self.handlers.remove(entry)
+        root.bind("<Destroy>", on_destroy, add="+")
+        if self.poll_job is None:
+            # Scheduled on the interpreter's root, with no owner: a hosted
+            # window drops its own after callbacks once it is destroyed, and
+            # the poll has to outlive whichever window happens to be newest.
+            self.poll_job = ticker.get(root.nametowidget(".")).every(POLL_MS, self._poll)
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.settimeout(CONNECT_TIMEOUT)
+                    request = json.loads(conn.makefile("r", encoding="utf-8").readline())
+                    with self.lock:
+                        alive = bool(self.handlers)
+                    if alive:
+                        self.requests.put(request.get("args", []))
+                    conn.sendall(b"ok\n" if alive else b"gone\n")
+                except (OSError, ValueError):
+                    continue
+
+    def _poll(self):
+        # Runs on the Tk thread; hands queued launches to the newest window.
+        with self.lock:
+            handlers = list(self.handlers)
+        if not handlers:
+            self.poll_job.cancel()
+            self.poll_job = None
+            return
+        root, handler = handlers[-1]
+        while True:
+            try:
+                args = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                handler(args)
+            except Exception as e:
+                print(f"[ipc] {self.app_name} failed to handle launch {args}: {e}")
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+_servers = {}
+
+def serve(root, username, app_name, handler):
+    # Makes this process the running instance for (username, app_name).
+    # Safe to call once per window: later windows join the same server.
+    if not ENABLED:
+        return None
+    server = _servers.get((username, app_name))
+    if server is None:
+        path = socket_path(username, app_name)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(path)
+        except OSError:
+            # Either another instance owns it or the file is stale.
+            if forward_probe(path):
+                sock.close()
+                return None
+            try:
+                os.unlink(path)
+                sock.bind(path)
+            except OSError:
+                sock.close()
+                return None
+        sock.listen(8)
+        server = _servers[(username, app_name)] = InstanceServer(username, app_name, sock, path)
+    server.add_handler(root, handler)
+    return server
+
+
+def forward_probe(path):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(path)
+            return True
+    except OSError:
+        return False
+
+
+def raise_window(root):
+    root.deiconify()
+    root.lift()
+    root.focus_force()
@@ -0,0 +1,158 @@
+import os
+import json
+import stat
+import queue
+import hashlib
+import threading
+
+# Crash safety for Notes. Every insert and delete made in a note is appended
+# to a journal next to the user's files; full saves go to a temporary file
+# that is fsynced and renamed over the note, after which the journal starts
+# over from the saved text. All file I/O happens on one worker thread, in the
+# order the edits were made.
+JOURNAL_DIR = ".notes_journal"
+# Seconds without typing before a modified note is saved; "off" keeps the
+# journal but leaves saving to the user.
+AUTOSAVE_DELAY = os.environ.get("PSEUDOOS_NOTES_AUTOSAVE", "2.0")
+CLOSE_TIMEOUT = 10
+
+
+def parse_autosave_delay(value):
+    if value is None or value == "off":
+        return None
+    return float(value)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def journal_path(user_base, path):
+    name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(user_base, JOURNAL_DIR, name + ".jnl")
+
+
+def atomic_write(path, text):
+    tmp = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    # Make the rename itself durable.
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def read_journal(jpath):
+    # Returns (header, records). A torn last line from a crash is ignored.
+    try:
+        with open(jpath, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+    except OSError:
+        return None, []
+    try:
+        header = json.loads(lines[0])
+    except ValueError:
+        return None, []
+    records = []
+    for line in lines[1:]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            break
+    return header, records
+
+
+def pending_edits(user_base, path, text):
+    # Edits journaled against exactly this saved text, if any.
+    header, records = read_journal(journal_path(user_base, path))
+    if header is None or header.get("base") != content_hash(text):
+        return []
+    return records
+
+
+class Journal:
+    def __init__(self, user_base):
+        self.user_base = user_base
+        self.ops = queue.Queue()
+        self.results = queue.Queue()
+        self.file = None
+        self.jpath = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    # --- Called from the Tk thread ---
+    def start(self, path, text, keep=False):
+        # Journals edits to the note at path, whose saved text is text. With
+        # keep, an existing journal for it is appended to instead of reset.
+        self.ops.put(("start", path, text, keep))
+
+    def record(self, *record):
+        self.ops.put(("record", record))
+
+    def save(self, path, text):
+        self.ops.put(("save", path, text))
+
+    def discard(self):
+        self.ops.put(("discard",))
+
+    def close(self):
+        self.ops.put(("close",))
+        self.thread.join(CLOSE_TIMEOUT)
+
+    # --- Worker thread ---
+    def _run(self):
+        while True:
+            op = self.ops.get()
+            try:
+                if op[0] == "start":
+                    self._start(*op[1:])
+                elif op[0] == "record":
+                    if self.file is not None:
+                        self.file.write(json.dumps(op[1]) + "\n")
+                        self.file.flush()
+                elif op[0] == "save":
+                    atomic_write(op[1], op[2])
+                    self._start(op[1], op[2])
+                    self.results.put(("saved", op[1], None))
+                elif op[0] == "discard":
+                    self._close_file()
+                    if self.jpath and os.path.exists(self.jpath):
+                        os.remove(self.jpath)
+                    self.jpath = None
+                elif op[0] == "close":
+                    self._close_file()
+                    return
+            except Exception as e:
+                self.results.put((op[0], op[1] if op[0] == "save" else None, e))
+
+    def _start(self, path, text, keep=False):
+        self._close_file()
+        jpath = journal_path(self.user_base, path)
+        if self.jpath and self.jpath != jpath and os.path.exists(self.jpath):
+            os.remove(self.jpath)
+        self.jpath = jpath
+        if not keep or not os.path.exists(jpath):
+            os.makedirs(os.path.dirname(jpath), exist_ok=True)
+            tmp = jpath + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"path": os.path.abspath(path), "base": content_hash(text)}) + "\n")
+            os.replace(tmp, jpath)
+        self.file = open(jpath, "a", encoding="utf-8")
+
+    def _close_file(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -1,10 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
 import os
-import subprocess
 import sys
+import startup_trace
+import supervisor
+import sqlite3
+from userstore import UserStore, UserExistsError
 
-USER_FILE = "users.txt"
 USER_DIR = "users"
 
 class LoginScreen:
@@ -14,7 +16,9 @@ class LoginScreen:
         self.root.attributes("-fullscreen", True)
         self.root.configure(bg="black")
         self.root.option_add("*Font", ("Courier New", 18))
+        self.store = UserStore()
         self.build_ui()
+        self.report_store_problems()
 
     def build_ui(self):
         frame = tk.Frame(self.root, bg="black")
@@ -41,23 +45,37 @@ class LoginScreen:
         entry.pack(side="left", padx=10)
         return entry
 
-    def login(self):
+    def report_store_problems(self):
+        if self.store.problems:
+            messagebox.showwarning("User Store", "\n\n".join(self.store.problems))
+            self.store.problems.clear()
+
+    def login(self, quiet=False):
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
 
-        if not os.path.exists(USER_FILE):
-            messagebox.showerror("Error", "No accounts found. Please create one.")
+        try:
+            if not self.store.any_users():
+                messagebox.showerror("Error", "No accounts found. Please create one.")
+                return
+            ok = self.store.verify(username, password)
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Could not read the user store:\n{e}")
             return
+        self.report_store_problems()
 
-        with open(USER_FILE, "r") as f:
-            for line in f:
-                user, pw = line.strip().split("|")
-                if username == user and password == pw:
-                    messagebox.showinfo("Login Success", f"Welcome back, {username}!")
-                    self.launch_desktop(username)
-                    return
+        if ok:
+            if not quiet:
+                messagebox.showinfo("Login Success", f"Welcome back, {username}!")
+            self.launch_desktop(username)
+            return
         messagebox.showerror("Login Failed", "Invalid username or password.")
 
+    def auto_login(self, username, password):
+        self.username_entry.insert(0, username)
+        self.password_entry.insert(0, password)
+        self.login(quiet=True)
+
     def register(self):
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
@@ -66,16 +84,14 @@ class LoginScreen:
             messagebox.showerror("Error", "Username and password cannot be empty.")
             return
 
-        if os.path.exists(USER_FILE):
-            with open(USER_FILE, "r") as f:
-                for line in f:
-                    user, _ = line.strip().split("|")
-                    if username == user:
-                        messagebox.showerror("Error", "Username already exists.")
-                        return
-
-        with open(USER_FILE, "a") as f:
-            f.write(f"{username}|{password}\n")
+        try:
+            self.store.create(username, password)
+        except UserExistsError:
+            messagebox.showerror("Error", "Username already exists.")
+            return
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Could not save the account:\n{e}")
+            return
 
         os.makedirs(os.path.join(USER_DIR, username), exist_ok=True)
         messagebox.showinfo("Success", "Account created! You can now log in.")
@@ -84,14 +100,21 @@ class LoginScreen:
         desktop_script = os.path.join(os.path.dirname(__file__), "desktop.py")
         python_exec = "python3" if sys.platform != "win32" else "python"
         try:
-            subprocess.Popen([python_exec, desktop_script, username])
+            startup_trace.spawning("desktop")
+            supervisor.session().spawn([python_exec, desktop_script, username], "desktop")
             # Delay closing login window by 2 seconds
             self.root.after(2000, self.root.destroy)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to launch desktop: {e}")
 
 if __name__ == "__main__":
+    startup_trace.begin("login")
     root = tk.Tk()
+    startup_trace.watch_window(root)
     app = LoginScreen(root)
+    # Used by benchmarks/bench_startup.py to run the chain unattended.
+    autologin = os.environ.get("PSEUDOOS_AUTOLOGIN")
+    if autologin:
+        root.after_idle(app.auto_login, *autologin.split(":", 1))
     root.mainloop()
     
\ No newline at end of file
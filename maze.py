@@ -1,6 +1,6 @@
 import tkinter as tk
 import math
-from datetime import datetime
+import ticker
 
 class RetroExplorer(tk.Canvas):
     def __init__(self, master):
@@ -49,17 +49,15 @@ class RetroExplorer(tk.Canvas):
                                   activeforeground="#00FF00", font=("Courier New", 12))
         self.exit_btn.pack(side="right", padx=20)
 
-        self.bind_all('<KeyPress>', self.key_press)
-        self.bind_all('<KeyRelease>', self.key_release)
+        master.bind('<KeyPress>', self.key_press)
+        master.bind('<KeyRelease>', self.key_release)
         self.focus_set()
 
         self.update_clock()
         self.game_loop()
 
     def update_clock(self):
-        now = datetime.now()
-        self.clock_label.config(text=now.strftime("%A, %d %B %Y | %H:%M:%S"))
-        self.master.after(1000, self.update_clock)
+        ticker.get(self).bind_label(self.clock_label, "%A, %d %B %Y | %H:%M:%S")
 
     def exit_to_desktop(self):
         self.master.destroy()
@@ -148,6 +146,8 @@ class RetroExplorer(tk.Canvas):
         self.create_oval(w//2-5, h//2-5, w//2+5, h//2+5, outline="#00FF00")
 
     def game_loop(self):
+        if not self.winfo_exists():
+            return
         self.delete('all')
         self.move_player()
         self.raycast()
@@ -0,0 +1,258 @@
+import os
+import sys
+import json
+import stat
+import struct
+import threading
+from collections import OrderedDict
+
+# Snapshot of the users/ tree written at boot. Maps each directory to its own
+# mtime and its entries as [name, is_dir, size, mtime], so later readers can
+# tell whether a directory changed since the scan.
+SNAPSHOT_FILE = os.path.join("users", ".metadata_cache.json")
+# Directory listings kept per user by DirCache.
+MAX_DIRS = int(os.environ.get("PSEUDOOS_METACACHE_DIRS", "4096"))
+
+# inotify(7). Events on a watched directory name the entry that changed.
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+IN_DONT_FOLLOW = 0x2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW)
+EVENT = struct.Struct("iIII")
+
+
+def scan_dir(path):
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                st = entry.stat(follow_symlinks=False)
+                entries.append([entry.name, entry.is_dir(follow_symlinks=False), st.st_size, st.st_mtime])
+            except OSError:
+                continue
+    return entries
+
+
+def scan_tree(top):
+    snapshot = {}
+    stack = [os.path.abspath(top)]
+    while stack:
+        path = stack.pop()
+        try:
+            mtime = os.stat(path).st_mtime
+            entries = scan_dir(path)
+        except OSError:
+            continue
+        snapshot[path] = {"mtime": mtime, "entries": entries}
+        stack.extend(os.path.join(path, name) for name, is_dir, _, _ in entries if is_dir)
+    return snapshot
+
+
+def save_snapshot(snapshot, path=SNAPSHOT_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp, path)
+
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def entry_for(path):
+    # The [name, is_dir, size, mtime] entry scan_dir would give path.
+    st = os.lstat(path)
+    return [os.path.basename(path), stat.S_ISDIR(st.st_mode), st.st_size, st.st_mtime]
+
+
+class Inotify:
+    # Non-blocking inotify instance through ctypes; raises OSError where
+    # there is none.
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify needs Linux")
+        import ctypes
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        try:
+            self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except AttributeError:
+            raise OSError("no inotify in this libc")
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self.get_errno = ctypes.get_errno
+
+    def add_watch(self, path, mask):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(self.get_errno(), "inotify_add_watch", path)
+        return wd
+
+    def rm_watch(self, wd):
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self):
+        # Pending events as (wd, mask, name); one read when there are none.
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = EVENT.unpack_from(data, offset)
+                offset += EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                events.append((wd, mask, name))
+
+
+class DirCache:
+    # Directory listings for one user's apps, as scan_dir entries. With
+    # inotify each cached directory is watched and an event re-stats just
+    # the entry it names, so a create or delete costs one lstat instead of a
+    # rescan and a cached listing costs one (empty) read. Without inotify, or
+    # past the watch limit, a listing is checked against its directory's
+    # mtime: one stat, and a rescan when anything was added, removed or
+    # renamed. Folders unchanged since boot start from the boot snapshot.
+    def __init__(self, username):
+        self.base = os.path.abspath(os.path.join("users", username))
+        self.lock = threading.Lock()
+        # path -> [{name: entry}, directory mtime_ns, watch descriptor or None]
+        self.dirs = OrderedDict()
+        self.watches = {}
+        self.snapshot = None
+        try:
+            self.inotify = Inotify()
+        except OSError:
+            self.inotify = None
+
+    def listing(self, path):
+        # Entries of directory path, in no particular order; raises OSError
+        # like os.scandir. The list is the caller's to sort.
+        with self.lock:
+            return list(self._record(os.path.abspath(path))[0].values())
+
+    def lookup(self, path):
+        # path's entry from its parent's listing, or None if it isn't there.
+        path = os.path.abspath(path)
+        parent, name = os.path.split(path)
+        if not name:
+            return None
+        with self.lock:
+            try:
+                return self._record(parent)[0].get(name)
+            except OSError:
+                return None
+
+    def is_dir(self, path):
+        entry = self.lookup(path)
+        return entry is not None and entry[1]
+
+    def forget(self, path=None):
+        # Drops path and everything cached under it, or the whole cache.
+        with self.lock:
+            under = None if path is None else os.path.abspath(path)
+            for key in [k for k in self.dirs if under is None or k == under or k.startswith(under + os.sep)]:
+                self._drop(key)
+
+    def _record(self, path):
+        self._apply_events()
+        record = self.dirs.get(path)
+        if record is not None:
+            if record[2] is not None or os.stat(path).st_mtime_ns == record[1]:
+                self.dirs.move_to_end(path)
+                return record
+            self._drop(path)
+        wd = None
+        if self.inotify is not None:
+            # Watched before the scan, so nothing done during it is missed.
+            try:
+                wd = self.inotify.add_watch(path, WATCH_MASK)
+            except OSError:
+                pass
+        try:
+            st = os.stat(path)
+            entries = self._seeded(path, st.st_mtime)
+            if entries is None:
+                entries = scan_dir(path)
+        except OSError:
+            if wd is not None and wd not in self.watches:
+                self.inotify.rm_watch(wd)
+            raise
+        record = [{entry[0]: entry for entry in entries}, st.st_mtime_ns, wd]
+        if wd is not None:
+            # A directory reached by two paths shares one watch descriptor.
+            other = self.watches.get(wd)
+            if other is not None and other != path:
+                record[2] = None
+            else:
+                self.watches[wd] = path
+        self.dirs[path] = record
+        while len(self.dirs) > MAX_DIRS:
+            self._drop(next(iter(self.dirs)))
+        return record
+
+    def _seeded(self, path, mtime):
+        # The boot snapshot's entries for path, if the folder hasn't changed.
+        if self.snapshot is None:
+            self.snapshot = load_snapshot()
+        seen = self.snapshot.pop(path, None)
+        if seen is None or seen["mtime"] != mtime:
+            return None
+        return seen["entries"]
+
+    def _drop(self, path):
+        record = self.dirs.pop(path, None)
+        if record is not None and record[2] is not None and self.watches.get(record[2]) == path:
+            del self.watches[record[2]]
+            self.inotify.rm_watch(record[2])
+
+    def _apply_events(self):
+        if self.inotify is None:
+            return
+        for wd, mask, name in self.inotify.read():
+            if mask & IN_Q_OVERFLOW:
+                for path in list(self.dirs):
+                    self._drop(path)
+                continue
+            path = self.watches.get(wd)
+            if path is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                # Gone or moved, along with whatever was cached beneath it.
+                for key in [k for k in self.dirs if k == path or k.startswith(path + os.sep)]:
+                    self._drop(key)
+                continue
+            if not name:
+                continue
+            entries = self.dirs[path][0]
+            try:
+                entries[name] = entry_for(os.path.join(path, name))
+            except OSError:
+                entries.pop(name, None)
+
+
+_caches = {}
+
+def get(username):
+    # One cache per user in this process, shared by the apps hosted in it.
+    cache = _caches.get(username)
+    if cache is None:
+        cache = _caches[username] = DirCache(username)
+    return cache
@@ -2,8 +2,34 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog
 import os
 import sys
-import subprocess
-import shutil
+import time
+from operator import itemgetter
+import metacache
+import dirsizes
+import fileops
+import noteindex
+import ticker
+from apphost import launch_app
+
+# The listing comes from the user's metacache.DirCache as [name, is_dir,
+# size, mtime] entries and is sorted in memory. Only the rows that fit in the window
+# exist as widgets; scrolling rewrites their text instead of creating more.
+# Folder sizes, file counts and newest mtimes arrive from a dirsizes.Walk
+# and replace the folder's own size and mtime in its (copied) entry.
+SORT_KEYS = {"Name": itemgetter(0), "Size": itemgetter(2, 0), "Modified": itemgetter(3, 0)}
+WHEEL_ROWS = 3
+SIZES_POLL_MS = 100
+JOBS_POLL_MS = 200
+# Failed items listed in the message after a file operation.
+SHOWN_ERRORS = 10
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
 
 class MyComputer:
     def __init__(self, root, username):
@@ -12,6 +38,27 @@ class MyComputer:
         self.base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "users", self.username))
         self.current_path = self.base_dir
         self.history = []
+        self.meta = metacache.get(self.username)
+        self.entries = []
+        self.listed_path = None
+        self.sort_key = "Name"
+        self.sort_reverse = False
+        self.first_row = 0
+        # Recycled rows: [frame, select button, name button, info label,
+        # delete button, shown].
+        self.rows = []
+        self.row_height = None
+        # Folder name -> its entry, and file counts of folders walked so far.
+        self.folders = {}
+        self.folder_files = {}
+        self.size_walk = None
+        self.size_poll = None
+        # Names selected in the current folder, and what Copy or Cut took:
+        # ("copy" | "move", paths).
+        self.selected = set()
+        self.clipboard = None
+        self.file_jobs = []
+        self.jobs_poll = None
 
         self.root.title("My Computer - PseudoOS")
         self.root.attributes("-fullscreen", True)
@@ -41,48 +88,288 @@ class MyComputer:
         exit_btn = tk.Button(top, text="Exit", command=self.root.destroy, bg="black", fg="#00FF00")
         exit_btn.pack(side="right", padx=10)
 
-        self.content_frame = tk.Frame(self.root, bg="black")
-        self.content_frame.pack(fill="both", expand=True)
+        header = tk.Frame(self.root, bg="black")
+        header.pack(fill="x", padx=40)
+        self.sort_buttons = {}
+        for key in SORT_KEYS:
+            btn = tk.Button(header, text=key, command=lambda k=key: self.set_sort(k), bg="black", fg="#00FF00",
+                            relief="flat")
+            btn.pack(side="left", padx=5)
+            self.sort_buttons[key] = btn
+        for text, command in (("Select All", self.select_all), ("Select None", self.select_none),
+                              ("Copy", lambda: self.take_selection("copy")),
+                              ("Cut", lambda: self.take_selection("move")),
+                              ("Paste", self.paste), ("Delete Selected", self.delete_selected)):
+            tk.Button(header, text=text, command=command, bg="black", fg="#00FF00").pack(side="left", padx=5)
+        self.count_label = tk.Label(header, text="", fg="#00FF00", bg="black")
+        self.count_label.pack(side="right")
+        self.update_sort_buttons()
 
-    def load_directory(self):
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        self.jobs_frame = tk.Frame(self.root, bg="black")
+        self.jobs_label = tk.Label(self.jobs_frame, text="", fg="#00FF00", bg="black", anchor="w")
+        self.jobs_label.pack(side="left", fill="x", expand=True, padx=40)
+        tk.Button(self.jobs_frame, text="Cancel", command=self.cancel_job, bg="black",
+                  fg="#00FF00").pack(side="right", padx=40)
+
+        body = self.body = tk.Frame(self.root, bg="black")
+        body.pack(fill="both", expand=True)
+        self.scrollbar = tk.Scrollbar(body, command=self.scroll_rows)
+        self.scrollbar.pack(side="right", fill="y")
+        self.content_frame = tk.Frame(body, bg="black")
+        self.content_frame.pack(side="left", fill="both", expand=True, padx=40)
+        self.content_frame.bind("<Configure>", lambda e: self.refresh_rows())
+        self.content_frame.bind("<Destroy>", lambda e: self.stop_sizes())
+        self.bind_wheel(self.content_frame)
 
+    def load_directory(self):
         display_path = self.current_path.replace(self.base_dir, "Home")
         self.path_label.config(text=display_path)
 
         try:
-            items = os.listdir(self.current_path)
-            items.sort()
-        except Exception as e:
+            entries = self.meta.listing(self.current_path)
+        except OSError as e:
             messagebox.showerror("Error", str(e))
             return
+        # Folder entries are copied: their sizes are filled in here, and the
+        # originals belong to the shared cache.
+        self.entries = [list(entry) if entry[1] else entry for entry in entries]
+        self.entries.sort(key=SORT_KEYS[self.sort_key], reverse=self.sort_reverse)
+        # Reloading the same folder (after a delete, say) keeps its place.
+        if self.listed_path != self.current_path:
+            self.listed_path = self.current_path
+            self.first_row = 0
+            self.selected.clear()
+        elif self.selected:
+            self.selected.intersection_update(entry[0] for entry in self.entries)
+        self.update_count()
+        self.start_sizes()
+        self.refresh_rows()
+
+    # --- Folder sizes ---
+    def start_sizes(self):
+        self.stop_sizes()
+        self.folders = {entry[0]: entry for entry in self.entries if entry[1]}
+        self.folder_files = {}
+        if self.folders:
+            self.size_walk = dirsizes.Walk([os.path.join(self.current_path, name) for name in self.folders])
+            self.size_poll = ticker.get(self.root).every(SIZES_POLL_MS, self.poll_sizes, owner=self.content_frame)
+
+    def stop_sizes(self):
+        # Leaving the folder cancels whatever of its walk is left.
+        if self.size_walk is not None:
+            self.size_walk.cancel()
+            self.size_walk = None
+        if self.size_poll is not None:
+            self.size_poll.cancel()
+            self.size_poll = None
+
+    def poll_sizes(self):
+        walk = self.size_walk
+        results = walk.poll()
+        for path, size, files, newest in results:
+            entry = self.folders.get(os.path.basename(path))
+            if entry is not None:
+                entry[2] = size
+                entry[3] = newest
+                self.folder_files[entry[0]] = files
+        if walk.done:
+            self.stop_sizes()
+            if self.sort_key != "Name":
+                self.entries.sort(key=SORT_KEYS[self.sort_key], reverse=self.sort_reverse)
+        if results:
+            self.refresh_rows()
+
+    def set_sort(self, key):
+        self.sort_reverse = not self.sort_reverse if key == self.sort_key else False
+        self.sort_key = key
+        self.entries.sort(key=SORT_KEYS[key], reverse=self.sort_reverse)
+        self.first_row = 0
+        self.update_sort_buttons()
+        self.refresh_rows()
+
+    def update_sort_buttons(self):
+        for key, btn in self.sort_buttons.items():
+            mark = (" v" if self.sort_reverse else " ^") if key == self.sort_key else ""
+            btn.config(text=key + mark)
+
+    def update_count(self):
+        text = f"{len(self.entries):,} items"
+        if self.selected:
+            text += f", {len(self.selected):,} selected"
+        if self.clipboard:
+            text += f", {len(self.clipboard[1]):,} to {'copy' if self.clipboard[0] == 'copy' else 'move'}"
+        self.count_label.config(text=text)
+
+    # --- Rows ---
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll_rows("scroll", -WHEEL_ROWS if e.delta > 0 else WHEEL_ROWS, "units"))
+        widget.bind("<Button-4>", lambda e: self.scroll_rows("scroll", -WHEEL_ROWS, "units"))
+        widget.bind("<Button-5>", lambda e: self.scroll_rows("scroll", WHEEL_ROWS, "units"))
+
+    def make_row(self):
+        slot = len(self.rows)
+        frame = tk.Frame(self.content_frame, bg="black")
+        select_btn = tk.Button(frame, command=lambda: self.toggle_row(slot), fg="#00FF00", bg="black", relief="flat")
+        name_btn = tk.Button(frame, command=lambda: self.open_row(slot), fg="#00FF00", bg="black", anchor="w",
+                             relief="flat")
+        del_btn = tk.Button(frame, text="Delete", command=lambda: self.delete_row(slot), fg="red", bg="black")
+        info = tk.Label(frame, fg="#00FF00", bg="black")
+        del_btn.pack(side="right")
+        info.pack(side="right", padx=20)
+        select_btn.pack(side="left")
+        name_btn.pack(side="left", fill="x", expand=True)
+        for widget in (frame, select_btn, name_btn, info, del_btn):
+            self.bind_wheel(widget)
+        self.rows.append([frame, select_btn, name_btn, info, del_btn, False])
+
+    def visible_rows(self):
+        # (rows that fit entirely, rows with any part showing)
+        height = self.content_frame.winfo_height()
+        return max(1, height // self.row_height), max(1, -(-height // self.row_height))
+
+    def refresh_rows(self):
+        if self.row_height is None:
+            self.make_row()
+            self.rows[0][0].update_idletasks()
+            self.row_height = self.rows[0][0].winfo_reqheight() + 4
+        full, count = self.visible_rows()
+        while len(self.rows) < count:
+            self.make_row()
+        total = len(self.entries)
+        self.first_row = max(0, min(self.first_row, total - full))
+        for slot, row in enumerate(self.rows):
+            index = self.first_row + slot
+            if slot < count and index < total:
+                name, is_dir, size, mtime = self.entries[index]
+                row[1].config(text="[x]" if name in self.selected else "[ ]")
+                row[2].config(text=f"[Folder] {name}" if is_dir else f"[File]   {name}")
+                files = self.folder_files.get(name) if is_dir else None
+                if is_dir and files is None:
+                    info = f"{'...':>9}".ljust(41)
+                else:
+                    info = f"{format_size(size):>9} {'' if files is None else f'{files:,} files':>13}  "
+                    info += time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime))
+                row[3].config(text=info)
+                if not row[5]:
+                    row[0].place(x=0, y=slot * self.row_height, relwidth=1, height=self.row_height)
+                    row[5] = True
+            elif row[5]:
+                row[0].place_forget()
+                row[5] = False
+        if total:
+            self.scrollbar.set(self.first_row / total, min(1.0, (self.first_row + full) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_rows(self, action, amount, unit=None):
+        # Scrollbar command: ("moveto", fraction) or ("scroll", n, "units" | "pages").
+        full = self.visible_rows()[0]
+        if action == "moveto":
+            self.first_row = int(float(amount) * len(self.entries))
+        else:
+            self.first_row += int(amount) * (full if unit == "pages" else 1)
+        self.refresh_rows()
+
+    def row_path(self, slot):
+        index = self.first_row + slot
+        if index >= len(self.entries):
+            return None, False
+        name, is_dir, size, mtime = self.entries[index]
+        return os.path.join(self.current_path, name), is_dir
+
+    def open_row(self, slot):
+        path, is_dir = self.row_path(slot)
+        if path is None:
+            return
+        if is_dir:
+            self.open_folder(path)
+        else:
+            self.open_file(path)
+
+    def delete_row(self, slot):
+        path, is_dir = self.row_path(slot)
+        if path is not None:
+            self.delete_item(path)
+
+    # --- Selection and file operations: fileops runs them one at a time on
+    # its worker thread; the folder is reloaded once each job ends. ---
+    def toggle_row(self, slot):
+        index = self.first_row + slot
+        if index < len(self.entries):
+            self.selected ^= {self.entries[index][0]}
+            self.update_count()
+            self.refresh_rows()
+
+    def select_all(self):
+        self.selected = {entry[0] for entry in self.entries}
+        self.update_count()
+        self.refresh_rows()
+
+    def select_none(self):
+        self.selected.clear()
+        self.update_count()
+        self.refresh_rows()
+
+    def selected_paths(self):
+        return [os.path.join(self.current_path, name) for name in sorted(self.selected)]
+
+    def take_selection(self, kind):
+        if not self.selected:
+            messagebox.showinfo("Info", "Select some items first.")
+            return
+        self.clipboard = (kind, self.selected_paths())
+        self.selected.clear()
+        self.update_count()
+        self.refresh_rows()
+
+    def paste(self):
+        if not self.clipboard:
+            messagebox.showinfo("Info", "Copy or cut some items first.")
+            return
+        kind, paths = self.clipboard
+        if kind == "move":
+            # The originals are gone once moved.
+            self.clipboard = None
+            self.update_count()
+        self.start_job(kind, paths, self.current_path)
+
+    def delete_selected(self):
+        if not self.selected:
+            messagebox.showinfo("Info", "Select some items first.")
+            return
+        if messagebox.askyesno("Delete", f"Are you sure you want to delete {len(self.selected):,} item(s)?"):
+            paths = self.selected_paths()
+            self.selected.clear()
+            self.start_job("delete", paths)
 
-        for item in items:
-            full_path = os.path.join(self.current_path, item)
-            item_frame = tk.Frame(self.content_frame, bg="black")
-            item_frame.pack(fill="x", padx=40, pady=2)
-
-            if os.path.isdir(full_path):
-                btn = tk.Button(
-                    item_frame, text=f"[Folder] {item}",
-                    command=lambda p=full_path: self.open_folder(p),
-                    fg="#00FF00", bg="black", anchor="w", relief="flat"
-                )
-            else:
-                btn = tk.Button(
-                    item_frame, text=f"[File]   {item}",
-                    command=lambda p=full_path: self.open_file(p),
-                    fg="#00FF00", bg="black", anchor="w", relief="flat"
-                )
-            btn.pack(side="left", fill="x", expand=True)
-
-            del_btn = tk.Button(
-                item_frame, text="Delete",
-                command=lambda p=full_path: self.delete_item(p),
-                fg="red", bg="black"
-            )
-            del_btn.pack(side="right")
+    def start_job(self, kind, paths, dest=None):
+        self.file_jobs.append(fileops.get().submit(kind, paths, dest))
+        self.jobs_frame.pack(side="bottom", fill="x", pady=10, before=self.body)
+        if self.jobs_poll is None:
+            self.jobs_poll = ticker.get(self.root).every(JOBS_POLL_MS, self.poll_jobs, owner=self.jobs_frame)
+        self.poll_jobs()
+
+    def cancel_job(self):
+        if self.file_jobs:
+            self.file_jobs[0].cancel()
+
+    def poll_jobs(self):
+        while self.file_jobs and self.file_jobs[0].finished.is_set():
+            job = self.file_jobs.pop(0)
+            noteindex.changed(self.username, *job.changed)
+            self.load_directory()
+            if job.errors:
+                messagebox.showerror("Error", f"{job.kind.capitalize()} failed for {len(job.errors)} item(s):\n\n"
+                                     + "\n".join(job.errors[:SHOWN_ERRORS]))
+        if not self.file_jobs:
+            self.jobs_poll.cancel()
+            self.jobs_poll = None
+            self.jobs_frame.pack_forget()
+            return
+        text = self.file_jobs[0].describe()
+        if len(self.file_jobs) > 1:
+            text += f"  (+{len(self.file_jobs) - 1} queued)"
+        self.jobs_label.config(text=text)
 
     def open_folder(self, path):
         if not path.startswith(self.base_dir):
@@ -102,7 +389,7 @@ class MyComputer:
             messagebox.showwarning("Access Denied", "You cannot access files outside your own user directory.")
             return
         if path.endswith(".txt"):
-            subprocess.Popen(["python3", "notes.py", self.username, path])
+            launch_app("notes.py", self.username, path)
         else:
             messagebox.showinfo("Info", "Only .txt files are supported.")
 
@@ -113,14 +400,7 @@ class MyComputer:
 
         confirm = messagebox.askyesno("Delete", f"Are you sure you want to delete:\n\n{os.path.basename(path)}?")
         if confirm:
-            try:
-                if os.path.isdir(path):
-                    shutil.rmtree(path)
-                else:
-                    os.remove(path)
-                self.load_directory()
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not delete item:\n{e}")
+            self.start_job("delete", [path])
 
     def create_file(self):
         name = simpledialog.askstring("New File", "Enter file name (.txt will be added):")
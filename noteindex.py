@@ -0,0 +1,266 @@
+import os
+import re
+import json
+import queue
+import bisect
+import threading
+from collections import Counter
+
+# Per-user inverted index over the .txt files in users/<name>/notes. Each
+# term maps to the files containing it and how often it occurs there, and
+# each file keeps the line each of its terms first appears on.
+# Scans, rescans and single-file updates run in order on one worker thread;
+# a scan reuses the entries of files whose size and mtime are unchanged
+# since the snapshot written after the last scan.
+INDEX_FILE = ".notes_index.json"
+# Bigger files open in Notes' large-file mode and are left out of the index.
+MAX_INDEX_BYTES = 8 * 1024 * 1024
+# Shorter trailing words only match exactly; a one-letter prefix would merge
+# a large part of the vocabulary.
+PREFIX_MIN = 3
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    # Returns ({term: count}, {term: first line}). Both are built with C-level
+    # dict operations; walking the tokens in Python is several times slower.
+    counts = Counter()
+    first = {}
+    lines = text.lower().split("\n")
+    for lineno in range(len(lines), 0, -1):
+        words = WORD.findall(lines[lineno - 1])
+        counts.update(words)
+        first.update(dict.fromkeys(words, lineno))
+    return dict(counts), first
+
+
+def read_line(path, lineno):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for i, line in enumerate(f, 1):
+                if i == lineno:
+                    return line.rstrip("\n")
+    except OSError:
+        pass
+    return ""
+
+
+class NoteIndex:
+    def __init__(self, username):
+        self.username = username
+        self.user_base = os.path.abspath(os.path.join("users", username))
+        self.notes_dir = os.path.join(self.user_base, "notes")
+        self.index_file = os.path.join(self.user_base, INDEX_FILE)
+        self.lock = threading.Lock()
+        # path -> [mtime, size, {term: count}, {term: first line}]
+        self.files = {}
+        # term -> {path: count}
+        self.postings = {}
+        self.sorted_terms = None
+        self.ready = threading.Event()
+        self.ops = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    # --- Requests, from any thread ---
+    def rescan(self):
+        self.ops.put(("scan",))
+
+    def update(self, path):
+        # Re-reads path, or drops it if it is gone. Directories are walked.
+        self.ops.put(("update", os.path.abspath(path)))
+
+    def move(self, src, dst):
+        self.ops.put(("update", os.path.abspath(src)))
+        self.ops.put(("update", os.path.abspath(dst)))
+
+    # --- Worker thread ---
+    def _run(self):
+        while True:
+            op = self.ops.get()
+            try:
+                if op[0] == "scan":
+                    self._scan()
+                    self.ready.set()
+                elif op[0] == "update":
+                    self._update(op[1])
+            except Exception as e:
+                print(f"[noteindex] {op[0]} failed: {e}")
+                self.ready.set()
+
+    def _indexable(self, path):
+        return path.endswith(".txt") and path.startswith(self.notes_dir + os.sep)
+
+    def _walk(self, top):
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(top):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if not self._indexable(path):
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found[path] = (st.st_mtime, st.st_size)
+        return found
+
+    def _read_terms(self, path, size):
+        if size > MAX_INDEX_BYTES:
+            return {}, {}
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return tokenize(f.read())
+
+    def _scan(self):
+        if not self.files:
+            self._load_snapshot()
+        found = self._walk(self.notes_dir)
+        changed = [p for p in self.files if p not in found]
+        for path in changed:
+            self._remove(path)
+        for path, (mtime, size) in found.items():
+            entry = self.files.get(path)
+            if entry is None or entry[0] != mtime or entry[1] != size:
+                self._add(path, mtime, size)
+                changed.append(path)
+        if changed or not os.path.exists(self.index_file):
+            self._save_snapshot()
+
+    def _update(self, path):
+        if os.path.isdir(path):
+            for child, (mtime, size) in self._walk(path).items():
+                self._add(child, mtime, size)
+            return
+        under = path + os.sep
+        for child in [p for p in self.files if p == path or p.startswith(under)]:
+            self._remove(child)
+        if self._indexable(path) and os.path.isfile(path):
+            st = os.stat(path)
+            self._add(path, st.st_mtime, st.st_size)
+
+    def _add(self, path, mtime, size, counts=None, first=None):
+        if counts is None:
+            try:
+                counts, first = self._read_terms(path, size)
+            except OSError:
+                return
+        with self.lock:
+            self._remove_locked(path)
+            self.files[path] = [mtime, size, counts, first]
+            before = len(self.postings)
+            for term, count in counts.items():
+                self.postings.setdefault(term, {})[path] = count
+            if len(self.postings) != before:
+                self.sorted_terms = None
+
+    def _remove(self, path):
+        with self.lock:
+            self._remove_locked(path)
+
+    def _remove_locked(self, path):
+        entry = self.files.pop(path, None)
+        if entry is None:
+            return
+        for term in entry[2]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(path, None)
+                if not postings:
+                    del self.postings[term]
+                    self.sorted_terms = None
+
+    def _load_snapshot(self):
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        for path, (mtime, size, counts, first) in snapshot.get("files", {}).items():
+            self._add(path, mtime, size, counts, first)
+
+    def _save_snapshot(self):
+        with self.lock:
+            data = json.dumps({"files": self.files})
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.index_file)
+
+    # --- Queries ---
+    def search(self, query, limit=100, prefix=True):
+        # Files containing every word of the query, best first, as
+        # (path, hits, first line). With prefix, the last word also matches
+        # longer terms, so results can follow typing.
+        words = WORD.findall(query.lower())
+        if not words:
+            return []
+        with self.lock:
+            terms = [[w] for w in words]
+            if prefix and len(words[-1]) >= PREFIX_MIN:
+                terms[-1] = self._expand(words[-1])
+            groups = []
+            for group_terms in terms:
+                if len(group_terms) == 1:
+                    groups.append(self.postings.get(group_terms[0], {}))
+                    continue
+                merged = Counter()
+                for term in group_terms:
+                    merged.update(self.postings[term])
+                groups.append(merged)
+            paths = set(min(groups, key=len))
+            for group in groups:
+                paths.intersection_update(group)
+                if not paths:
+                    return []
+            results = sorted(((path, sum(group[path] for group in groups)) for path in paths),
+                             key=lambda r: (-r[1], r[0]))[:limit]
+            all_terms = [t for group_terms in terms for t in group_terms]
+            results = [(path, hits, min(self.files[path][3].get(t, 1 << 30) for t in all_terms))
+                       for path, hits in results]
+        return self._check(results)
+
+    def _expand(self, word):
+        # Every indexed term starting with word.
+        if self.sorted_terms is None:
+            self.sorted_terms = sorted(self.postings)
+        i = j = bisect.bisect_left(self.sorted_terms, word)
+        while j < len(self.sorted_terms) and self.sorted_terms[j].startswith(word):
+            j += 1
+        return self.sorted_terms[i:j] or [word]
+
+    def _check(self, results):
+        # Another process may have changed a file since it was indexed;
+        # those are queued for re-reading and dropped from this answer.
+        checked = []
+        for path, hits, line in results:
+            entry = self.files.get(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                self.update(path)
+                continue
+            if entry is None or entry[0] != st.st_mtime or entry[1] != st.st_size:
+                self.update(path)
+                continue
+            checked.append((path, hits, line))
+        return checked
+
+
+_indexes = {}
+
+def get(username):
+    # One index per user in this process, scanned on first use.
+    index = _indexes.get(username)
+    if index is None:
+        index = _indexes[username] = NoteIndex(username)
+        index.rescan()
+    return index
+
+
+def changed(username, *paths):
+    # Tells an index already open in this process about changed files or
+    # folders. Without one there is nothing to do: the first scan finds
+    # changes by size and mtime.
+    index = _indexes.get(username)
+    if index is not None:
+        for path in paths:
+            index.update(path)
@@ -1,8 +1,29 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
+import re
 import sys
 import time
+import queue
+import apphost
+import ipc
+import ticker
+import bigfile
+import journal
+import noteindex
+import textsearch
+
+# Large-file mode keeps this many blocks in the widget and shifts the window
+# when the view comes within EDGE of either end of it.
+WINDOW_BLOCKS = 4
+EDGE = 0.15
+INDEX_POLL_MS = 50
+SAVE_POLL_MS = 200
+SEARCH_DELAY_MS = 120
+SEARCH_RESULTS = 50
+FIND_DELAY_MS = 150
+# Upper bound on highlights drawn for one screenful.
+FIND_HIGHLIGHTS = 2000
 
 class NotesApp:
     def __init__(self, root, username, file_path=None):
@@ -29,17 +50,45 @@ class NotesApp:
         self.root.attributes("-fullscreen", True)
         self.root.configure(bg="black")
 
+        self.large = None
+        self.window = [0, 0]
+        self.shift_pending = False
+        self.journal = journal.Journal(self.user_base)
+        # The note the journal is recording edits for, if any.
+        self.journal_file = None
+        self.dirty = False
+        self.last_edit = 0
+        self.autosave_delay = journal.parse_autosave_delay(journal.AUTOSAVE_DELAY)
+        self.search_panel = None
+        # Bumped on every insert or delete so find can tell when its copy of
+        # the buffer is stale.
+        self.edit_serial = 0
+        self.find_bar = None
+        self.find_pattern = None
+        self.find_job = None
+        self.find_locked = False
+        self.find_after = None
+        self.find_copy = None
+        self.find_copy_serial = -1
+        self.highlight_pending = False
         self.build_ui()
+        self.install_edit_hook()
+        # The window manager's close button flushes edits like Exit does.
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
+        ticker.get(self.root).every(SAVE_POLL_MS, self.autosave_tick, owner=self.text_area)
 
         if self.current_file:
             self.load_file()
 
+        ipc.serve(self.root, self.username, "notes.py", self.handle_launch)
+
     def build_ui(self):
         self.text_area = tk.Text(self.root, wrap="word", bg="black", fg="#00FF00",
-                                 insertbackground="#00FF00", font=("Courier New", 14))
+                                 insertbackground="#00FF00", font=("Courier New", 14),
+                                 yscrollcommand=self.on_text_scroll)
         self.text_area.pack(expand=True, fill="both", padx=10, pady=10)
 
-        btn_frame = tk.Frame(self.root, bg="black")
+        btn_frame = self.btn_frame = tk.Frame(self.root, bg="black")
         btn_frame.pack(fill="x", pady=10)
 
         tk.Button(btn_frame, text="New", command=self.new_file,
@@ -48,10 +97,62 @@ class NotesApp:
                   bg="black", fg="#00FF00", font=("Courier New", 12), width=10).pack(side="left", padx=10)
         tk.Button(btn_frame, text="Save", command=self.save_file,
                   bg="black", fg="#00FF00", font=("Courier New", 12), width=10).pack(side="left", padx=10)
-        tk.Button(btn_frame, text="Exit", command=self.root.destroy,
+        tk.Button(btn_frame, text="Search", command=self.open_search_panel,
+                  bg="black", fg="#00FF00", font=("Courier New", 12), width=10).pack(side="left", padx=10)
+        tk.Button(btn_frame, text="Find", command=self.open_find_bar,
+                  bg="black", fg="#00FF00", font=("Courier New", 12), width=10).pack(side="left", padx=10)
+        tk.Button(btn_frame, text="Exit", command=self.close_window,
                   bg="black", fg="#00FF00", font=("Courier New", 12), width=10).pack(side="right", padx=10)
+        self.status = tk.Label(btn_frame, text="", bg="black", fg="#00FF00", font=("Courier New", 12))
+        self.status.pack(side="left", padx=10)
+        self.text_area.tag_configure("found", background="#005500")
+        self.root.bind("<Control-f>", self.open_find_bar)
+        # The Text class binding would also move the cursor forward.
+        self.text_area.bind("<Control-f>", lambda e: self.open_find_bar() or "break")
+        self.text_area.bind("<KeyRelease>", lambda e: self.schedule_highlight(), add="+")
+        self.text_area.bind("<Configure>", lambda e: self.schedule_highlight(), add="+")
+
+    def handle_launch(self, args):
+        # Another launch of Notes was forwarded to this instance.
+        if not args:
+            ipc.raise_window(self.root)
+            return
+        path = os.path.abspath(args[0])
+        if self.current_file is None and self.large is None and not self.text_area.get("1.0", "end-1c"):
+            if path.startswith(self.user_base):
+                self.current_file = path
+                self.load_file()
+            ipc.raise_window(self.root)
+            return
+        host = apphost.current_host()
+        if host is not None:
+            host.launch("notes.py", path)
+        else:
+            NotesApp(tk.Toplevel(self.root), self.username, path)
+
+    def close_window(self):
+        self.finish_edits()
+        self.journal.close()
+        self.close_large()
+        # In a standalone instance the Tk root also owns any extra note
+        # windows, so it is only hidden until the last of them is closed.
+        if isinstance(self.root, tk.Tk):
+            if self._note_windows(self.root):
+                self.root.withdraw()
+            else:
+                self.root.destroy()
+            return
+        master = self.root.master
+        self.root.destroy()
+        if isinstance(master, tk.Tk) and master.state() == "withdrawn" and not self._note_windows(master):
+            master.destroy()
+
+    def _note_windows(self, root):
+        return [w for w in root.winfo_children() if isinstance(w, tk.Toplevel)]
 
     def new_file(self):
+        self.finish_edits()
+        self.close_large()
         self.text_area.delete("1.0", tk.END)
         self.current_file = None
 
@@ -71,16 +172,566 @@ class NotesApp:
 
     def load_file(self):
         if self.current_file and os.path.exists(self.current_file):
+            self.finish_edits()
+            self.close_large()
+            if bigfile.is_large(self.current_file):
+                self.load_large_file()
+                return
             try:
                 with open(self.current_file, "r", encoding="utf-8") as f:
                     content = f.read()
                 self.text_area.delete("1.0", tk.END)
                 self.text_area.insert(tk.END, content)
+                edits = journal.pending_edits(self.user_base, self.current_file, content)
+                recover = bool(edits) and messagebox.askyesno(
+                    "Recover Note",
+                    f"{os.path.basename(self.current_file)} has {len(edits)} unsaved edit(s) from a "
+                    "session that did not close cleanly.\nRecover them?"
+                )
+                if recover:
+                    self.replay_edits(edits)
+                    self.last_edit = time.monotonic()
+                # The load's own delete and insert went through the edit
+                # hook; only recovered edits leave the note unsaved.
+                self.dirty = recover
+                self.journal.start(self.current_file, content, keep=recover)
+                self.journal_file = self.current_file
             except Exception as e:
                 messagebox.showerror("Error", f"Could not load file:\n{e}")
         else:
             messagebox.showwarning("Warning", "File not found or inaccessible.")
 
+    # --- Edit journal and autosave ---
+    def install_edit_hook(self):
+        # Puts a Tcl proc in front of the Text widget's command that passes
+        # every insert and delete, typed or programmatic, to on_widget_edit
+        # before forwarding it. The forwarding stays in Tcl so the widget's
+        # errors reach Tcl callers unchanged: Tk's own bindings catch them
+        # (copy with nothing selected runs "get sel.first sel.last"), while
+        # a TclError passing through a Python command would be re-raised
+        # from mainloop and end the app.
+        widget = str(self.text_area)
+        self.text_orig = widget + "_orig"
+        hook = widget + "_edit"
+        self.text_area.tk.call("rename", widget, self.text_orig)
+        self.text_area.tk.createcommand(hook, self.on_widget_edit)
+        self.text_area.tk.call("proc", widget, "args",
+                               f"if {{[lindex $args 0] in {{insert delete replace}}}} {{ {hook} {{*}}$args }}\n"
+                               f"{self.text_orig} {{*}}$args")
+        self.text_area.bind("<Destroy>", lambda e: self.remove_edit_hook(widget, hook), add="+")
+
+    def remove_edit_hook(self, widget, hook):
+        self.text_area.tk.call("rename", widget, "")
+        self.text_area.tk.deletecommand(hook)
+
+    def on_widget_edit(self, *args):
+        # An edit with an index the widget rejects fails in the widget too,
+        # so it is not recorded.
+        try:
+            self.record_edit(args)
+        except tk.TclError:
+            pass
+
+    def record_edit(self, args):
+        # Indices are resolved now so the journal replays without the marks
+        # and selection they may have referred to.
+        index = lambda i: str(self.text_area.tk.call(self.text_orig, "index", i))
+        start = index(args[1])
+        if args[0] == "insert":
+            records = [("i", start, "".join(args[2::2]))]
+        else:
+            records = [("d", start, index(args[2]) if len(args) > 2 else index(f"{args[1]}+1c"))]
+            if args[0] == "replace":
+                records.append(("i", start, "".join(args[3::2])))
+        self.edit_serial += 1
+        self.dirty = True
+        self.last_edit = time.monotonic()
+        if self.journal_file is None or self.large is not None:
+            return
+        for record in records:
+            self.journal.record(*record)
+
+    def replay_edits(self, records):
+        for record in records:
+            if record[0] == "i":
+                self.text_area.insert(record[1], record[2])
+            elif record[0] == "d":
+                self.text_area.delete(record[1], record[2])
+
+    def autosave_tick(self):
+        while True:
+            try:
+                kind, path, error = self.journal.results.get_nowait()
+            except queue.Empty:
+                break
+            if error is not None and kind == "save":
+                messagebox.showerror("Save Error", f"Could not save file:\n{error}")
+            elif error is not None:
+                print(f"[notes] journal {kind} failed: {error}")
+            else:
+                noteindex.changed(self.username, path)
+                self.root.title(f"PseudoOS Notes - Saved at {time.strftime('[%H:%M:%S]')}")
+        if (self.dirty and self.journal_file and self.large is None and self.autosave_delay is not None
+                and time.monotonic() - self.last_edit >= self.autosave_delay):
+            self._save_to_file(self.journal_file)
+
+    def finish_edits(self):
+        # Called before the buffer is replaced or closed: autosaves what is
+        # pending and drops the journal.
+        if self.dirty and self.journal_file and self.large is None and self.autosave_delay is not None:
+            self.journal.save(self.journal_file, self.text_area.get("1.0", "end-1c"))
+        self.journal.discard()
+        self.journal_file = None
+        self.dirty = False
+
+    # --- Search across notes ---
+    def open_search_panel(self):
+        if self.search_panel is not None and self.search_panel.winfo_exists():
+            self.search_panel.lift()
+            self.search_entry.focus_set()
+            return
+        self.index = noteindex.get(self.username)
+        # Picks up notes changed by other processes since the last scan.
+        self.index.rescan()
+        panel = self.search_panel = tk.Toplevel(self.root)
+        panel.title("Search Notes")
+        panel.configure(bg="black")
+        panel.geometry("800x500")
+        self.search_entry = tk.Entry(panel, bg="black", fg="#00FF00", insertbackground="#00FF00",
+                                     font=("Courier New", 14))
+        self.search_entry.pack(fill="x", padx=10, pady=10)
+        self.search_results = tk.Listbox(panel, bg="black", fg="#00FF00", selectbackground="#005500",
+                                         font=("Courier New", 12))
+        self.search_results.pack(expand=True, fill="both", padx=10)
+        self.search_status = tk.Label(panel, text="", bg="black", fg="#00FF00", font=("Courier New", 12))
+        self.search_status.pack(fill="x", pady=5)
+        self.search_hits = []
+        self.search_after = None
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
+        self.search_entry.bind("<Return>", lambda e: self.open_search_result())
+        self.search_results.bind("<Double-Button-1>", lambda e: self.open_search_result())
+        self.search_results.bind("<Return>", lambda e: self.open_search_result())
+        self.search_entry.focus_set()
+
+    def schedule_search(self, event=None):
+        if self.search_after is not None:
+            self.search_panel.after_cancel(self.search_after)
+        self.search_after = self.search_panel.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self.search_after = None
+        query = self.search_entry.get()
+        if not self.index.ready.is_set():
+            self.search_status.config(text="Indexing notes...")
+            self.search_after = self.search_panel.after(200, self.run_search)
+            return
+        start = time.perf_counter()
+        self.search_hits = self.index.search(query, limit=SEARCH_RESULTS)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.search_results.delete(0, tk.END)
+        for path, hits, line in self.search_hits:
+            rel = os.path.relpath(path, self.user_base)
+            self.search_results.insert(tk.END, f"{rel}:{line}  {noteindex.read_line(path, line).strip()[:80]}")
+        self.search_status.config(text=f"{len(self.search_hits)} note(s) in {elapsed:.1f} ms" if query.strip() else "")
+
+    def open_search_result(self):
+        selection = self.search_results.curselection()
+        if not self.search_hits:
+            return
+        path, hits, line = self.search_hits[selection[0] if selection else 0]
+        self.current_file = path
+        self.load_file()
+        if self.large is None:
+            self.text_area.mark_set("insert", f"{line}.0")
+            self.text_area.tag_remove("sel", "1.0", tk.END)
+            self.text_area.tag_add("sel", f"{line}.0", f"{line}.0 lineend")
+            self.text_area.see(f"{line}.0")
+        self.text_area.focus_set()
+
+    # --- Find and replace ---
+    # Counting, find-next and replace-all work on a Python copy of the
+    # buffer (or on the document's blocks in large-file mode); only the
+    # visible part of the widget is searched for highlighting.
+    def open_find_bar(self, event=None):
+        if self.find_bar is None:
+            opts = dict(bg="black", fg="#00FF00", font=("Courier New", 12))
+            bar = self.find_bar = tk.Frame(self.root, bg="black")
+            tk.Label(bar, text="Find:", **opts).pack(side="left", padx=(10, 2))
+            self.find_entry = tk.Entry(bar, width=24, insertbackground="#00FF00", **opts)
+            self.find_entry.pack(side="left")
+            tk.Label(bar, text="Replace:", **opts).pack(side="left", padx=(10, 2))
+            self.replace_entry = tk.Entry(bar, width=24, insertbackground="#00FF00", **opts)
+            self.replace_entry.pack(side="left")
+            self.find_regex = tk.BooleanVar(value=False)
+            self.find_case = tk.BooleanVar(value=False)
+            for text, var in (("Regex", self.find_regex), ("Case", self.find_case)):
+                tk.Checkbutton(bar, text=text, variable=var, command=self.schedule_find, selectcolor="black",
+                               activebackground="black", activeforeground="#00FF00", **opts).pack(side="left", padx=5)
+            for text, command in (("Next", self.find_next), ("Replace", self.replace_one),
+                                  ("All", self.replace_all), ("Close", self.close_find_bar)):
+                tk.Button(bar, text=text, command=command, width=8, **opts).pack(side="left", padx=5)
+            self.find_status = tk.Label(bar, text="", **opts)
+            self.find_status.pack(side="left", padx=10)
+            self.find_entry.bind("<KeyRelease>", self.schedule_find)
+            self.find_entry.bind("<Return>", lambda e: self.find_next())
+            self.find_entry.bind("<Escape>", lambda e: self.close_find_bar())
+            self.replace_entry.bind("<Return>", lambda e: self.replace_one())
+        self.find_bar.pack(fill="x", before=self.btn_frame)
+        self.find_entry.focus_set()
+        self.find_entry.select_range(0, tk.END)
+
+    def close_find_bar(self):
+        self.cancel_find_job()
+        self.find_pattern = None
+        self.text_area.tag_remove("found", "1.0", tk.END)
+        self.find_bar.pack_forget()
+        self.text_area.focus_set()
+
+    def cancel_find_job(self):
+        if self.find_job is not None:
+            self.find_job.cancel()
+            self.find_job = None
+        self.unlock_text()
+
+    def unlock_text(self):
+        if self.find_locked:
+            self.find_locked = False
+            self.text_area.config(state="normal")
+            if self.large is not None:
+                # The job may have rewritten blocks the window still shows.
+                self.show_large_block(self.window[0])
+
+    def schedule_find(self, event=None):
+        if event is not None and event.keysym in ("Return", "Escape"):
+            return
+        if self.find_after is not None:
+            self.root.after_cancel(self.find_after)
+        self.find_after = self.root.after(FIND_DELAY_MS, self.update_find)
+
+    def update_find(self):
+        self.find_after = None
+        self.cancel_find_job()
+        query = self.find_entry.get()
+        self.find_pattern = None
+        if query:
+            try:
+                self.find_pattern = textsearch.compile_query(query, self.find_regex.get(), self.find_case.get())
+            except re.error as e:
+                self.find_status.config(text=f"Bad pattern: {e}")
+        self.highlight_visible()
+        if self.find_pattern is None:
+            if not query:
+                self.find_status.config(text="")
+            return
+        progress = {"count": 0}
+        self.find_status.config(text="Counting...")
+        self.find_job = textsearch.SlicedJob(
+            self.root, textsearch.count_matches(self.find_pattern, self.find_segments(), progress),
+            lambda job: self.find_finished(job, f"{progress['count']} match(es)")
+        )
+
+    def find_finished(self, job, text):
+        self.find_job = None
+        self.unlock_text()
+        if self.large is not None and not self.large.done:
+            text += " so far (still indexing)"
+        self.find_status.config(text=f"{text} | {job.elapsed_ms():.0f} ms")
+        self.highlight_visible()
+
+    def buffer_copy(self):
+        if self.find_copy_serial != self.edit_serial:
+            self.find_copy = self.text_area.get("1.0", "end-1c")
+            self.find_copy_serial = self.edit_serial
+        return self.find_copy
+
+    def find_segments(self):
+        if self.large is None:
+            yield self.buffer_copy()
+            return
+        self.capture_large_window()
+        doc, i = self.large, 0
+        while i < len(doc.blocks):
+            yield doc.read_block(i)
+            i += 1
+
+    def schedule_highlight(self):
+        if self.find_pattern is None or self.highlight_pending:
+            return
+        self.highlight_pending = True
+        self.root.after_idle(self.highlight_visible)
+
+    def highlight_visible(self):
+        self.highlight_pending = False
+        if not self.text_area.winfo_exists():
+            return
+        self.text_area.tag_remove("found", "1.0", tk.END)
+        if self.find_pattern is None:
+            return
+        top = self.text_area.index("@0,0 linestart")
+        bottom = self.text_area.index(f"@0,{self.text_area.winfo_height()} lineend")
+        visible = self.text_area.get(top, bottom)
+        shown = 0
+        for match in self.find_pattern.finditer(visible):
+            if match.end() == match.start():
+                continue
+            self.text_area.tag_add("found", f"{top} + {match.start()} chars", f"{top} + {match.end()} chars")
+            shown += 1
+            if shown >= FIND_HIGHLIGHTS:
+                break
+
+    def offset_of(self, index):
+        return (self.text_area.count("1.0", index) or (0,))[0]
+
+    def select_match(self, start, end):
+        first, last = f"1.0 + {start} chars", f"1.0 + {end} chars"
+        self.text_area.tag_remove("sel", "1.0", tk.END)
+        self.text_area.tag_add("sel", first, last)
+        self.text_area.mark_set("insert", last)
+        self.text_area.see(first)
+        self.schedule_highlight()
+
+    def find_next(self):
+        if self.find_after is not None:
+            self.root.after_cancel(self.find_after)
+            self.update_find()
+        pattern = self.find_pattern
+        if pattern is None:
+            return
+        if self.large is None:
+            text = self.buffer_copy()
+            match = self.search_from(pattern, text, self.offset_of("insert")) or self.search_from(pattern, text, 0)
+            if match:
+                self.select_match(match.start(), match.end())
+            else:
+                self.find_status.config(text="No matches")
+            return
+        self.find_next_large(pattern)
+
+    def search_from(self, pattern, text, pos):
+        for match in pattern.finditer(text, pos):
+            if match.end() > match.start():
+                return match
+        return None
+
+    def find_next_large(self, pattern):
+        # Searches the rest of the window, then the blocks after it, then
+        # wraps around through the start of the file back into the window.
+        text = self.text_area.get("1.0", "end-1c")
+        match = self.search_from(pattern, text, self.offset_of("insert"))
+        if match:
+            self.select_match(match.start(), match.end())
+            return
+        doc = self.large
+        for i in list(range(self.window[1], len(doc.blocks))) + list(range(0, self.window[0])):
+            if self.search_from(pattern, doc.read_block(i), 0):
+                self.show_large_block(i)
+                match = self.search_from(pattern, self.text_area.get("1.0", "end-1c"), 0)
+                if match:
+                    self.select_match(match.start(), match.end())
+                return
+        match = self.search_from(pattern, text, 0)
+        if match:
+            self.select_match(match.start(), match.end())
+        else:
+            self.find_status.config(text="No matches")
+
+    def replace_one(self):
+        pattern = self.find_pattern
+        if pattern is None or not self.text_area.tag_ranges("sel"):
+            self.find_next()
+            return
+        match = pattern.fullmatch(self.text_area.get("sel.first", "sel.last"))
+        if match is None:
+            self.find_next()
+            return
+        template = textsearch.replacement_template(self.replace_entry.get(), self.find_regex.get())
+        start = self.text_area.index("sel.first")
+        self.text_area.delete("sel.first", "sel.last")
+        self.text_area.insert(start, match.expand(template))
+        self.find_next()
+
+    def replace_all(self):
+        if self.find_after is not None:
+            self.root.after_cancel(self.find_after)
+            self.update_find()
+        pattern = self.find_pattern
+        if pattern is None:
+            return
+        self.cancel_find_job()
+        template = textsearch.replacement_template(self.replace_entry.get(), self.find_regex.get())
+        progress = {"count": 0}
+        if self.large is None:
+            # One batched widget update instead of one per match.
+            start = time.perf_counter()
+            new_text, n = pattern.subn(template, self.buffer_copy())
+            if n:
+                insert = self.text_area.index("insert")
+                self.text_area.delete("1.0", "end-1c")
+                self.text_area.insert("1.0", new_text)
+                self.text_area.mark_set("insert", insert)
+                self.text_area.see("insert")
+            self.find_status.config(text=f"Replaced {n} | {(time.perf_counter() - start) * 1000:.0f} ms")
+            self.highlight_visible()
+            return
+        doc = self.large
+        if not doc.done:
+            messagebox.showinfo("Notes", "The file is still being indexed, try again in a moment.")
+            return
+        # Blocks are rewritten as patches in slices; the widget is locked,
+        # and the window kept where it is, until it is reloaded from them.
+        self.capture_large_window()
+        self.text_area.config(state="disabled")
+        self.find_locked = True
+        segments = ((i, doc.read_block(i)) for i in range(len(doc.blocks)))
+        self.find_status.config(text="Replacing...")
+        self.find_job = textsearch.SlicedJob(
+            self.root, textsearch.replace_segments(pattern, template, segments, doc.set_block, progress),
+            lambda job: self.replace_all_finished(job, progress["count"])
+        )
+
+    def replace_all_finished(self, job, count):
+        self.unlock_text()
+        self.find_finished(job, f"Replaced {count}")
+
+    # --- Large-file mode ---
+    # The file is memory-mapped and indexed into newline-aligned blocks on a
+    # background thread. The widget only ever holds the blocks in
+    # self.window, each starting at a "block<n>" mark, and edited blocks are
+    # handed back to the document as they scroll out.
+    def load_large_file(self):
+        try:
+            self.large = bigfile.LargeDocument(self.current_file)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not load file:\n{e}")
+            return
+        self.text_area.delete("1.0", tk.END)
+        self.text_area.config(state="disabled")
+        self.window = [0, 0]
+        self.large.start_indexing()
+        self.poll_large_index()
+
+    def poll_large_index(self):
+        doc = self.large
+        if doc is None or not self.text_area.winfo_exists():
+            return
+        if self.window[1] == 0 and (len(doc.blocks) >= WINDOW_BLOCKS or doc.done):
+            # Enough of the file is indexed to show its start.
+            self.text_area.config(state="normal")
+            while self.window[1] < min(WINDOW_BLOCKS, len(doc.blocks)):
+                self.append_block()
+            self.text_area.mark_set("insert", "1.0")
+            self.text_area.edit_modified(False)
+        self.update_large_status()
+        if not doc.done:
+            self.root.after(INDEX_POLL_MS, self.poll_large_index)
+
+    def update_large_status(self):
+        doc = self.large
+        if not doc.done:
+            self.status.config(text=f"Indexing {doc.progress() * 100:.0f}%")
+        elif doc.blocks:
+            first, last = self.window
+            percent = doc.blocks[first][0] * 100 / max(1, doc.size)
+            self.status.config(text=f"Blocks {first + 1}-{last} of {len(doc.blocks)} | {percent:.0f}%")
+
+    def block_range(self, i):
+        end = f"block{i + 1}" if i + 1 < self.window[1] else "end-1c"
+        return f"block{i}", end
+
+    def append_block(self):
+        i = self.window[1]
+        self.text_area.mark_set(f"block{i}", "end-1c")
+        self.text_area.mark_gravity(f"block{i}", "left")
+        self.text_area.insert("end-1c", self.large.read_block(i))
+        self.window[1] += 1
+
+    def prepend_block(self):
+        i = self.window[0] - 1
+        self.text_area.mark_gravity(f"block{i + 1}", "right")
+        self.text_area.insert("1.0", self.large.read_block(i))
+        self.text_area.mark_gravity(f"block{i + 1}", "left")
+        self.text_area.mark_set(f"block{i}", "1.0")
+        self.text_area.mark_gravity(f"block{i}", "left")
+        self.window[0] -= 1
+
+    def drop_block(self, i):
+        self.text_area.delete(*self.block_range(i))
+        self.text_area.mark_unset(f"block{i}")
+        if i == self.window[0]:
+            self.window[0] += 1
+        else:
+            self.window[1] -= 1
+
+    def show_large_block(self, i):
+        # Reloads the window so that it starts at block i.
+        self.capture_large_window()
+        self.text_area.delete("1.0", "end-1c")
+        for j in range(*self.window):
+            self.text_area.mark_unset(f"block{j}")
+        self.window = [i, i]
+        while self.window[1] < min(i + WINDOW_BLOCKS, len(self.large.blocks)):
+            self.append_block()
+        self.text_area.mark_set("insert", "1.0")
+        self.text_area.see("1.0")
+        self.text_area.edit_modified(False)
+        self.update_large_status()
+
+    def capture_large_window(self):
+        # Hands edited text in the widget back to the document.
+        if not self.text_area.edit_modified():
+            return
+        for i in range(*self.window):
+            self.large.set_block(i, self.text_area.get(*self.block_range(i)))
+        self.text_area.edit_modified(False)
+
+    def on_text_scroll(self, first, last):
+        self.schedule_highlight()
+        if self.large is None or self.window[1] == 0 or self.shift_pending or self.find_locked:
+            return
+        if float(last) > 1 - EDGE and self.window[1] < len(self.large.blocks):
+            self.shift_pending = True
+            self.root.after_idle(self.shift_window, 1)
+        elif float(first) < EDGE and self.window[0] > 0:
+            self.shift_pending = True
+            self.root.after_idle(self.shift_window, -1)
+
+    def shift_window(self, direction):
+        self.shift_pending = False
+        if self.large is None or self.find_locked:
+            return
+        self.capture_large_window()
+        # Pin the top visible line so dropping text above it doesn't jump.
+        self.text_area.mark_set("view", "@0,0")
+        if direction > 0:
+            self.append_block()
+            if self.window[1] - self.window[0] > WINDOW_BLOCKS:
+                self.drop_block(self.window[0])
+        else:
+            self.prepend_block()
+            if self.window[1] - self.window[0] > WINDOW_BLOCKS:
+                self.drop_block(self.window[1] - 1)
+        self.text_area.yview("view")
+        self.text_area.edit_modified(False)
+        self.update_large_status()
+
+    def save_large_file(self, path):
+        doc = self.large
+        if not doc.done:
+            messagebox.showinfo("Notes", "The file is still being indexed, try saving again in a moment.")
+            return False
+        self.capture_large_window()
+        doc.save(path)
+        return True
+
+    def close_large(self):
+        if self.large is not None:
+            self.cancel_find_job()
+            self.large.close()
+            self.large = None
+            self.window = [0, 0]
+            self.text_area.config(state="normal")
+            self.status.config(text="")
+
     def save_file(self):
         if self.current_file:
             self._save_to_file(self.current_file)
@@ -103,9 +754,17 @@ class NotesApp:
                 messagebox.showerror("Access Denied", "You can only save files in your own user folder.")
 
     def _save_to_file(self, path):
+        if self.large is None:
+            # Written by the journal's worker thread; autosave_tick updates
+            # the title once it is on disk.
+            self.journal.save(path, self.text_area.get("1.0", "end-1c"))
+            self.journal_file = path
+            self.dirty = False
+            return
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(self.text_area.get("1.0", tk.END))
+            if not self.save_large_file(path):
+                return
+            noteindex.changed(self.username, path)
             # Optionally, update title with a save confirmation message
             self.root.title(f"PseudoOS Notes - Saved at {time.strftime('[%H:%M:%S]')}")
         except Exception as e:
@@ -116,6 +775,9 @@ if __name__ == "__main__":
     username = sys.argv[1] if len(sys.argv) > 1 else "guest"
     file_path = sys.argv[2] if len(sys.argv) > 2 else None
 
+    if ipc.forward(username, "notes.py", [os.path.abspath(file_path)] if file_path else []):
+        sys.exit(0)
+
     root = tk.Tk()
     app = NotesApp(root, username, file_path)
     root.mainloop()
@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import messagebox
-import subprocess
 import sys
+import os
+import startup_trace
+import supervisor
 
 class SplashScreen:
     def __init__(self, master):
@@ -67,7 +69,9 @@ class SplashScreen:
 
     def boot_os(self):
         # Launch boot.py asynchronously
-        subprocess.Popen([sys.executable, "boot.py"])
+        startup_trace.spawning("boot")
+        boot_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "boot.py")
+        supervisor.session().spawn([sys.executable, boot_script], "boot")
         # Exit this screen after 2 seconds
         self.master.after(2000, lambda: exit(0))
 
@@ -78,6 +82,11 @@ class SplashScreen:
         self.master.destroy()
 
 if __name__ == "__main__":
+    startup_trace.begin("os")
     root = tk.Tk()
+    startup_trace.watch_window(root)
     app = SplashScreen(root)
+    # Used by benchmarks/bench_startup.py to run the chain unattended.
+    if os.environ.get("PSEUDOOS_AUTOBOOT"):
+        root.after_idle(app.boot_os)
     root.mainloop()
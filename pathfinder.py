@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
-import datetime
+import ticker
 import sys
 import subprocess
 import heapq
@@ -124,14 +124,16 @@ def reconstruct_path(visited, end):
     return path[::-1]
 
 # --- GUI Application ---
-class PathfinderOS(tk.Tk):
-    def __init__(self, username):
-        super().__init__()
+class PathfinderOS(tk.Frame):
+    def __init__(self, root, username):
+        super().__init__(root, bg="black")
+        self.root = root
         self.username = username
-        self.title("Pathfinder OS")
-        self.attributes("-fullscreen", True)
-        self.configure(bg="black")
-        self.option_add("*Font", ("Courier New", 14))
+        self.root.title("Pathfinder OS")
+        self.root.attributes("-fullscreen", True)
+        self.root.configure(bg="black")
+        self.root.option_add("*Font", ("Courier New", 14))
+        self.pack(expand=True, fill=tk.BOTH)
         
         self.algorithms = {
             "A* Search": astar,
@@ -176,7 +178,7 @@ class MainMenu(tk.Frame):
         
         tk.Button(container, text="Start", command=self.start_grid,
                  fg="#00FF00", bg="black").pack(pady=20)
-        tk.Button(container, text="Exit", command=self.parent.destroy,
+        tk.Button(container, text="Exit", command=self.parent.root.destroy,
                  fg="#00FF00", bg="black").pack(pady=10)
 
     def start_grid(self):
@@ -247,9 +249,7 @@ class GridFrame(tk.Frame):
             self.canvas.create_line(0, y, self.cols*self.cell_size, y, fill="#222")
 
     def update_clock(self):
-        time_str = datetime.datetime.now().strftime("%A, %d %B %Y  %H:%M:%S")
-        self.clock.config(text=time_str)
-        self.after(1000, self.update_clock)
+        ticker.get(self).bind_label(self.clock, "%A, %d %B %Y  %H:%M:%S")
 
     def setup_bindings(self):
         self.canvas.bind("<Button-1>", self.handle_click)
@@ -360,5 +360,6 @@ class GridFrame(tk.Frame):
 
 if __name__ == "__main__":
     username = sys.argv[1] if len(sys.argv) > 1 else "guest"
-    app = PathfinderOS(username)
-    app.mainloop()
\ No newline at end of file
+    root = tk.Tk()
+    app = PathfinderOS(root, username)
+    root.mainloop()
\ No newline at end of file
@@ -3,8 +3,11 @@ import time
 import random
 import os
 import sys
+import ticker
 from datetime import datetime
 
+CLOCK_FORMAT = "%A, %d %B %Y | %I:%M:%S %p"
+
 class PongGame:
     def __init__(self, root, username):
         self.root = root
@@ -28,6 +31,7 @@ class PongGame:
         self.difficulty = "Medium"
         self.difficulty_speeds = {"Easy": 5, "Medium": 7, "Hard": 10}
         self.ai_speed = {"Easy": 4, "Medium": 6, "Hard": 8}
+        self.clock_sub = None
 
         self.show_splash()
 
@@ -83,6 +87,12 @@ class PongGame:
 
         self.score_text = self.canvas.create_text(self.width // 2, 30, fill="#00FF00", font=("Courier New", 20), text="")
         self.time_text = self.canvas.create_text(self.width // 2, 60, fill="#00FF00", font=("Courier New", 14), text="")
+        # The elapsed/clock line only changes once a second, so it follows
+        # the shared clock tick instead of being reformatted every frame.
+        clock = ticker.get(self.root)
+        if self.clock_sub:
+            clock.unsubscribe(self.clock_sub)
+        self.clock_sub = clock.subscribe(CLOCK_FORMAT, self.update_time_text, owner=self.canvas)
 
         self.root.bind("<Up>", self.move_up)
         self.root.bind("<Down>", self.move_down)
@@ -143,14 +153,16 @@ class PongGame:
         elif ball_y_center > ai_center:
             self.canvas.move(self.ai_paddle, 0, self.ai_speed[self.difficulty])
 
-        elapsed = int(time.time() - self.start_time)
-        current_time = datetime.now().strftime("%A, %d %B %Y | %I:%M:%S %p")
-
         self.canvas.itemconfig(self.score_text, text=f"YOU: {self.player_score}   AI: {self.ai_score}")
-        self.canvas.itemconfig(self.time_text, text=f"Time Elapsed: {elapsed}s | {current_time}")
 
         self.root.after(20, self.update_game)
 
+    def update_time_text(self, current_time):
+        if not self.running:
+            return
+        elapsed = int(time.time() - self.start_time)
+        self.canvas.itemconfig(self.time_text, text=f"Time Elapsed: {elapsed}s | {current_time}")
+
     def reset_ball(self):
         self.canvas.moveto(self.ball, self.width // 2, self.height // 2)
         self.ball_dx *= -1
@@ -167,7 +179,7 @@ class PongGame:
         self.canvas.create_text(self.width//2, self.height//2 + 40, text="Press Q to Quit", fill="#00FF00", font=("Courier New", 16))
 
     def save_high_score(self):
-        timestamp = datetime.now().strftime("%A, %d %B %Y | %I:%M:%S %p")
+        timestamp = datetime.now().strftime(CLOCK_FORMAT)
         with open(self.high_score_file, "a") as f:
             f.write(f"🏆 {self.player_score} vs {self.ai_score} on {timestamp}\n")
 
@@ -0,0 +1,80 @@
+import os
+import time
+
+# Minimal /proc readers (Linux). Every function returns None or an empty
+# result for processes that have exited or cannot be read.
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def available():
+    return os.path.isdir("/proc/self")
+
+
+def pids():
+    try:
+        return [int(name) for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return []
+
+
+def boot_time():
+    with open("/proc/stat") as f:
+        for line in f:
+            if line.startswith("btime"):
+                return int(line.split()[1])
+    return 0
+
+
+def read_process(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            comm_end = f.read()
+        with open(f"/proc/{pid}/statm") as f:
+            statm = f.read().split()
+    except OSError:
+        return None
+    # The command name may contain spaces, so split after its closing paren.
+    fields = comm_end.rsplit(")", 1)[1].split()
+    return {
+        "pid": pid,
+        "state": fields[0],
+        "ppid": int(fields[1]),
+        "pgrp": int(fields[2]),
+        "cpu_ticks": int(fields[11]) + int(fields[12]),
+        "nice": int(fields[16]),
+        "threads": int(fields[17]),
+        "start_ticks": int(fields[19]),
+        "rss": int(statm[1]) * PAGE_SIZE,
+    }
+
+
+def cmdline(pid):
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return [arg.decode("utf-8", "replace") for arg in f.read().split(b"\0") if arg]
+    except OSError:
+        return []
+
+
+class CpuSampler:
+    # CPU % is the share of one core used since the previous sample.
+    def __init__(self):
+        self.last = {}
+        self.btime = boot_time() if available() else 0
+
+    def sample(self, info):
+        now = time.time()
+        prev = self.last.get(info["pid"])
+        self.last[info["pid"]] = (now, info["cpu_ticks"])
+        if prev is None or now <= prev[0]:
+            return 0.0
+        return (info["cpu_ticks"] - prev[1]) / CLK_TCK / (now - prev[0]) * 100
+
+    def uptime(self, info):
+        return max(0.0, time.time() - (self.btime + info["start_ticks"] / CLK_TCK))
+
+    def forget_missing(self, live_pids):
+        for pid in list(self.last):
+            if pid not in live_pids:
+                del self.last[pid]
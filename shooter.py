@@ -38,8 +38,8 @@ class DoomClone(tk.Canvas):
         }
         
         # Bind controls
-        self.bind_all('<KeyPress>', self.key_press)
-        self.bind_all('<KeyRelease>', self.key_release)
+        master.bind('<KeyPress>', self.key_press)
+        master.bind('<KeyRelease>', self.key_release)
         self.bind('<Button-1>', self.shoot)
         self.focus_set()
         
@@ -240,6 +240,8 @@ class DoomClone(tk.Canvas):
         self.create_text(20, 40, text=f"HEALTH: {self.health}", fill="#00FF00", anchor="w", font=("Courier", 14))
 
     def game_loop(self):
+        if not self.winfo_exists():
+            return
         self.delete('all')
         self.move_player()
         self.raycast()
@@ -1,13 +1,13 @@
 import tkinter as tk
 import time
-import os
-import sys
 import signal
-import platform
+import supervisor
 
 class ShutdownScreen:
-    def __init__(self, root):
+    def __init__(self, root, desktop=None):
         self.root = root
+        self.desktop = desktop
+        self.session = supervisor.session()
         self.root.title("Shutting Down")
         self.root.attributes("-fullscreen", True)
         self.root.configure(bg="black")
@@ -23,58 +23,85 @@ class ShutdownScreen:
 
         self.shutdown_sequence()
 
+    def print_line(self, text):
+        self.text.configure(state="normal")
+        self.text.insert(tk.END, text + "\n")
+        self.text.see(tk.END)
+        self.text.configure(state="disabled")
+
     def shutdown_sequence(self):
-        messages = [
-            "[ OK ] Closing active applications...",
-            "[ OK ] Sending shutdown signals...",
-            "[ OK ] Saving user session...",
-            "[ OK ] Unmounting virtual drives...",
-            "[ OK ] Disconnecting peripherals...",
-            "[ OK ] Terminating session handlers...",
-            "[ OK ] Killing orphan processes...",
-            "[ OK ] Writing system logs...",
-            "[ OK ] Stopping background daemons...",
-            "[ OK ] Releasing memory buffers...",
-            "[ OK ] Cleaning up temporary files...",
-            "[ OK ] Disabling user input...",
-            "[ OK ] Flushing DNS cache...",
-            "[ OK ] Terminating display server...",
-            "[ OK ] Logging out...",
-            "[ OK ] Powering down network interfaces...",
-            "[ OK ] Resetting hardware states...",
-            "[ OK ] Halting kernel modules...",
-            "[ OK ] Shutting down power management...",
-            "[ OK ] Stopping clock daemon...",
-            "[ OK ] Syncing system time...",
-            "[ OK ] De-initializing device tree...",
-            "[ OK ] Finalizing shutdown tasks...",
-            "[ OK ] Compressing memory swap...",
-            "[ OK ] Power circuits disengaged...",
-            "[ OK ] CPU halted...",
-            "[ OK ] PseudoOS safely halted."
+        # Each step returns the line to print once it has finished, or None
+        # while it is still waiting and should be polled again.
+        steps = [
+            self.close_applications,
+            self.stop_daemons,
+            self.send_shutdown_signals,
+            self.wait_for_exit,
+            self.kill_remaining,
+            self.reap_processes,
         ]
 
         def show_next(index=0):
-            if index < len(messages):
-                self.text.configure(state="normal")
-                self.text.insert(tk.END, messages[index] + "\n")
-                self.text.see(tk.END)
-                self.text.configure(state="disabled")
-                self.root.after(300, show_next, index + 1)
+            if index < len(steps):
+                line = steps[index]()
+                if line is None:
+                    self.root.after(100, show_next, index)
+                else:
+                    self.print_line(line)
+                    self.root.after_idle(show_next, index + 1)
             else:
-                self.terminate()
+                self.print_line("[ OK ] PseudoOS safely halted.")
+                self.root.after(500, self.terminate)
 
         show_next()
 
-    def terminate(self):
-        self.root.destroy()
-        time.sleep(0.5)
+    def close_applications(self):
+        windows = []
+        if self.desktop:
+            windows = [w for w in self.desktop.host.windows if w.alive]
+        for window in windows:
+            window.destroy()
+        return f"[ OK ] Closed {len(windows)} application window(s)"
+
+    def stop_daemons(self):
+        pool = self.desktop.pool if self.desktop else None
+        if pool is None:
+            return "[ OK ] No background daemons running"
+        idle = len(pool.idle)
+        pool.shutdown()
+        return f"[ OK ] Stopped app launcher pool ({idle} idle worker(s))"
+
+    def send_shutdown_signals(self):
+        self.deadline = time.time() + supervisor.SHUTDOWN_TIMEOUT
+        self.exited_before = len(self.session.exited)
+        count = self.session.signal_all(signal.SIGTERM)
+        return f"[ OK ] Sent SIGTERM to {count} process(es)"
 
-        # Cross-platform force exit
-        if platform.system() == "Windows":
-            os.system("taskkill /F /PID " + str(os.getpid()))
+    def wait_for_exit(self):
+        remaining = self.session.remaining()
+        if remaining and time.time() < self.deadline:
+            return None
+        if remaining:
+            return f"[WARN] {remaining} process(es) still running after {supervisor.SHUTDOWN_TIMEOUT:g}s"
+        return "[ OK ] All processes exited"
+
+    def kill_remaining(self):
+        if not self.session.remaining():
+            return "[ OK ] No orphan processes left"
+        count = self.session.signal_all(signal.SIGKILL)
+        return f"[ OK ] Killed {count} orphan process(es)"
+
+    def reap_processes(self):
+        if self.session.remaining() and time.time() < self.deadline + 1:
+            return None
+        reaped = len(self.session.exited) - self.exited_before
+        return f"[ OK ] Reaped {reaped} process(es), session closed"
+
+    def terminate(self):
+        if self.desktop:
+            self.desktop.root.destroy()
         else:
-            os.kill(os.getpid(), signal.SIGTERM)
+            self.root.destroy()
 
 
 if __name__ == "__main__":
@@ -3,6 +3,9 @@ import random
 import time
 import os
 import sys
+import ticker
+
+CLOCK_FORMAT = "%A, %d %B %Y | %H:%M:%S"
 
 class SnakeGame:
     def __init__(self, root, username):
@@ -36,9 +39,15 @@ class SnakeGame:
         self.paused = False
         self.pause_time = 0
 
+        self.clock_text = ""
+        ticker.get(self.root).subscribe(CLOCK_FORMAT, self.set_clock_text, owner=self.canvas)
+
         self.load_high_score()
         self.show_splash_screen()
 
+    def set_clock_text(self, text):
+        self.clock_text = text
+
     def show_splash_screen(self):
         self.canvas.delete("all")
 
@@ -158,13 +167,11 @@ class SnakeGame:
         elapsed = int(time.time() - self.start_time - self.pause_time)
         mins = elapsed // 60
         secs = elapsed % 60
-        current_time = time.strftime("%A, %d %B %Y | %H:%M:%S")
-
         info = (
             f"Score: {self.score}    |    "
             f"Time Alive: {mins}m {secs}s    |    "
             f"🏆 High Score: {self.high_score}    |    "
-            f"{current_time}"
+            f"{self.clock_text}"
         )
 
         self.canvas.create_text(
@@ -218,7 +225,7 @@ class SnakeGame:
     def save_high_score(self):
         if self.score > self.high_score:
             self.high_score = self.score
-            current_time = time.strftime("%A, %d %B %Y | %H:%M:%S")
+            current_time = time.strftime(CLOCK_FORMAT)
             with open(self.high_score_file, "w") as f:
                 f.write(f"{self.high_score} apples on {current_time}")
 
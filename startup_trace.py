@@ -0,0 +1,72 @@
+import os
+import json
+import time
+import atexit
+
+# Set PSEUDOOS_TRACE to a file path to record startup events from every
+# stage of the os.py -> boot.py -> login.py -> desktop.py chain. Each line
+# is a JSON object; events from all processes append to the same file.
+TRACE_FILE = os.environ.get("PSEUDOOS_TRACE")
+
+_stage = None
+
+
+def enabled():
+    return bool(TRACE_FILE)
+
+
+def emit(event, stage=None, **fields):
+    if not TRACE_FILE:
+        return
+    record = {"ts": time.time(), "pid": os.getpid(), "stage": stage or _stage, "event": event}
+    record.update(fields)
+    line = json.dumps(record) + "\n"
+    # One O_APPEND write per event keeps lines whole across processes.
+    fd = os.open(TRACE_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def begin(stage):
+    # Called from a stage's __main__ block, once its imports are done.
+    global _stage
+    _stage = stage
+    if TRACE_FILE:
+        emit("imports_done")
+        atexit.register(emit, "exit")
+
+
+def spawning(stage):
+    # Called by a launcher right before it starts the next stage.
+    emit("spawn", stage=stage, parent=_stage)
+
+
+def watch_window(root):
+    # Records when the stage's window is first mapped and when the event
+    # loop has gone idle after that, i.e. the UI is ready for input.
+    if not TRACE_FILE:
+        return
+
+    seen = []
+
+    def on_map(event):
+        if event.widget is not root or seen:
+            return
+        seen.append(True)
+        emit("mapped")
+        root.after_idle(emit, "ready")
+
+    root.bind("<Map>", on_map, add="+")
+
+
+def load(path):
+    events = []
+    with open(path) as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return events
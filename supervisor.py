@@ -0,0 +1,131 @@
+import os
+import procstat
+import time
+import signal
+import threading
+import subprocess
+
+# Seconds children get to exit after SIGTERM before they are killed.
+SHUTDOWN_TIMEOUT = float(os.environ.get("PSEUDOOS_SHUTDOWN_TIMEOUT", "5"))
+REAP_INTERVAL = 1.0
+
+
+class Child:
+    def __init__(self, proc, name, user=None):
+        self.proc = proc
+        self.name = name
+        self.user = user
+        self.started_at = time.time()
+        self.exited_at = None
+
+    @property
+    def pid(self):
+        return self.proc.pid
+
+    def alive(self):
+        return self.proc.poll() is None
+
+
+class Supervisor:
+    def __init__(self):
+        self.children = {}
+        self.exited = []
+        self.lock = threading.Lock()
+        self._reaper = None
+
+    def register(self, proc, name, user=None):
+        with self.lock:
+            child = self.children.get(proc.pid)
+            if child is not None and child.proc is proc:
+                child.name = name
+                child.user = user or child.user
+            else:
+                child = self.children[proc.pid] = Child(proc, name, user)
+        self._start_reaper()
+        return child
+
+    def spawn(self, args, name, user=None, **kwargs):
+        return self.register(subprocess.Popen(args, **kwargs), name, user).proc
+
+    def running(self):
+        with self.lock:
+            return [c for c in self.children.values() if c.exited_at is None]
+
+    def reap(self):
+        # poll() waits on exited children, so none of them stay zombies.
+        done = []
+        with self.lock:
+            for pid, child in list(self.children.items()):
+                if child.proc.poll() is not None:
+                    child.exited_at = time.time()
+                    del self.children[pid]
+                    done.append(child)
+            self.exited.extend(done)
+        return done
+
+    def _start_reaper(self):
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(REAP_INTERVAL)
+            self.reap()
+
+    def stragglers(self):
+        # Processes in our process group that were never registered, e.g.
+        # apps started by an app running in its own interpreter.
+        if not procstat.available():
+            return []
+        me = os.getpid()
+        if os.getpgrp() != me:
+            return []
+        known = {c.pid for c in self.running()}
+        pids = []
+        for pid in procstat.pids():
+            if pid in known or pid == me:
+                continue
+            info = procstat.read_process(pid)
+            if info and info["pgrp"] == me and info["state"] != "Z":
+                pids.append(pid)
+        return pids
+
+    def signal_all(self, sig):
+        count = 0
+        for child in self.running():
+            try:
+                child.proc.send_signal(sig)
+                count += 1
+            except OSError:
+                pass
+        for pid in self.stragglers():
+            try:
+                os.kill(pid, sig)
+                count += 1
+            except OSError:
+                pass
+        return count
+
+    def remaining(self):
+        self.reap()
+        return len(self.running()) + len(self.stragglers())
+
+
+def become_session_leader():
+    # Put the desktop in its own process group so every app it starts,
+    # and everything those apps start, can be found at shutdown.
+    if hasattr(os, "setpgid"):
+        try:
+            os.setpgid(0, 0)
+        except OSError:
+            pass
+
+
+_session = None
+
+def session():
+    global _session
+    if _session is None:
+        _session = Supervisor()
+    return _session
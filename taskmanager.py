@@ -0,0 +1,161 @@
+import tkinter as tk
+from tkinter import messagebox, simpledialog
+import os
+import sys
+import ipc
+import signal
+import apphost
+import procstat
+import supervisor
+import ticker
+
+REFRESH_MS = 1000
+# Helper processes that are not apps, by script name.
+WORKER_SCRIPTS = {"zygote.py": "zygote-worker", "calcworker.py": "calc-worker", "calcbatch.py": "calc-batch"}
+HEADER = f"{'PID':>7}  {'USER':<12}{'APP':<24}{'CPU%':>6}{'RSS MB':>9}{'THR':>5}{'NICE':>5}  UPTIME"
+
+class TaskManager:
+    def __init__(self, root, username):
+        self.root = root
+        self.username = username
+        self.sampler = procstat.CpuSampler()
+        self.rows = []
+
+        self.root.title("Task Manager - PseudoOS")
+        self.root.attributes("-fullscreen", True)
+        self.root.configure(bg="black")
+        self.root.option_add("*Font", ("Courier New", 14))
+
+        self.build_ui()
+        ipc.serve(self.root, self.username, "taskmanager.py", lambda args: ipc.raise_window(self.root))
+        if not procstat.available():
+            messagebox.showerror("Task Manager", "Process information is not available on this system.")
+            return
+        self.refresh()
+        ticker.get(self.root).every(REFRESH_MS, self.refresh, owner=self.listbox)
+
+    def build_ui(self):
+        top = tk.Frame(self.root, bg="black")
+        top.pack(fill="x", pady=10)
+
+        tk.Label(top, text="Running Applications", fg="#00FF00", bg="black").pack(side="left", padx=20)
+        tk.Button(top, text="Exit", command=self.root.destroy, bg="black", fg="#00FF00").pack(side="right", padx=10)
+        tk.Button(top, text="Renice", command=self.renice_selected, bg="black", fg="#00FF00").pack(side="right", padx=10)
+        tk.Button(top, text="Kill", command=self.kill_selected, bg="black", fg="red").pack(side="right", padx=10)
+
+        tk.Label(self.root, text=HEADER, fg="#00FF00", bg="black", anchor="w",
+                 font=("Courier New", 12, "bold")).pack(fill="x", padx=20)
+        self.listbox = tk.Listbox(self.root, bg="black", fg="#00FF00", selectbackground="#004400",
+                                  selectforeground="#00FF00", font=("Courier New", 12),
+                                  highlightthickness=0, activestyle="none")
+        self.listbox.pack(fill="both", expand=True, padx=20, pady=10)
+
+        self.status = tk.Label(self.root, text="", fg="#00FF00", bg="black", anchor="w")
+        self.status.pack(fill="x", padx=20, pady=5)
+
+    def collect(self):
+        # pid -> (app name, user). Children launched by this desktop session
+        # carry the user that launched them; anything else is found by its
+        # command line, where apps get the username as their first argument.
+        procs = {}
+        host = apphost.current_host()
+        if host is not None:
+            hosted = [w.script_name[:-3] for w in host.windows if w.alive]
+            name = "desktop" + (f" +{len(hosted)} hosted" if hosted else "")
+            procs[os.getpid()] = (name, host.username)
+        for child in supervisor.session().running():
+            procs[child.pid] = (child.name[:-3] if child.name.endswith(".py") else child.name,
+                                child.user or "-")
+
+        for pid in procstat.pids():
+            if pid in procs:
+                continue
+            args = procstat.cmdline(pid)
+            for i, arg in enumerate(args[1:3], 1):
+                if arg.endswith(".py") and os.path.dirname(os.path.abspath(arg)) == apphost.BASE_DIR:
+                    script = os.path.basename(arg)
+                    if script in WORKER_SCRIPTS:
+                        procs[pid] = (WORKER_SCRIPTS[script], "-")
+                    elif script in apphost.HOSTED_APPS or script == "desktop.py":
+                        user = args[i + 1] if len(args) > i + 1 else "guest"
+                        procs[pid] = (script[:-3], user)
+                    break
+        return procs
+
+    def refresh(self):
+        if not self.listbox.winfo_exists():
+            return
+        procs = self.collect()
+        rows = []
+        total_cpu = total_rss = 0
+        for pid, (name, user) in procs.items():
+            info = procstat.read_process(pid)
+            if info is None or info["state"] == "Z":
+                continue
+            cpu = self.sampler.sample(info)
+            total_cpu += cpu
+            total_rss += info["rss"]
+            rows.append((pid, user, name, cpu, info))
+        self.sampler.forget_missing(procs)
+        rows.sort(key=lambda r: -r[3])
+
+        selected = self.selected_pid()
+        top = self.listbox.yview()[0]
+        self.rows = rows
+        self.listbox.delete(0, tk.END)
+        for pid, user, name, cpu, info in rows:
+            self.listbox.insert(tk.END, (
+                f"{pid:>7}  {user[:11]:<12}{name[:23]:<24}{cpu:>6.1f}{info['rss'] / 1048576:>9.1f}"
+                f"{info['threads']:>5}{info['nice']:>5}  {self.format_uptime(self.sampler.uptime(info))}"
+            ))
+            if pid == selected:
+                self.listbox.selection_set(tk.END)
+        self.listbox.yview_moveto(top)
+        self.status.config(text=f"{len(rows)} process(es) | CPU {total_cpu:.1f}% | RSS {total_rss / 1048576:.1f} MB")
+
+    def format_uptime(self, seconds):
+        seconds = int(seconds)
+        hours, rem = divmod(seconds, 3600)
+        return f"{hours}:{rem // 60:02d}:{rem % 60:02d}"
+
+    def selected_pid(self):
+        sel = self.listbox.curselection()
+        if not sel or sel[0] >= len(self.rows):
+            return None
+        return self.rows[sel[0]][0]
+
+    def kill_selected(self):
+        pid = self.selected_pid()
+        if pid is None:
+            messagebox.showinfo("Task Manager", "Select a process first.")
+            return
+        if pid == os.getpid():
+            messagebox.showwarning("Task Manager", "Use Shutdown to stop the desktop.")
+            return
+        if messagebox.askyesno("Kill", f"Terminate process {pid}?"):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not kill process:\n{e}")
+
+    def renice_selected(self):
+        pid = self.selected_pid()
+        if pid is None:
+            messagebox.showinfo("Task Manager", "Select a process first.")
+            return
+        nice = simpledialog.askinteger("Renice", f"New nice value for {pid} (-20..19):",
+                                       minvalue=-20, maxvalue=19)
+        if nice is None:
+            return
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, nice)
+        except (OSError, AttributeError) as e:
+            messagebox.showerror("Error", f"Could not renice process:\n{e}")
+
+if __name__ == "__main__":
+    username = sys.argv[1] if len(sys.argv) > 1 else "guest"
+    if ipc.forward(username, "taskmanager.py", []):
+        sys.exit(0)
+    root = tk.Tk()
+    app = TaskManager(root, username)
+    root.mainloop()
@@ -3,7 +3,56 @@ from tkinter import messagebox
 import os
 import sys
 import time
-import subprocess
+import threading
+import collections
+import metacache
+import noteindex
+import fileops
+import ticker
+from apphost import launch_app
+
+# Output is buffered and drawn at most once per FLUSH_MS, in one insert, so
+# a command printing a line at a time costs a list append per line. Only
+# the last SCROLLBACK_LINES lines are kept, in the widget and in the buffer.
+SCROLLBACK_LINES = int(os.environ.get("PSEUDOOS_TERMINAL_SCROLLBACK", "10000"))
+FLUSH_MS = 33
+# Buffered writes past this many are cut down to the scrollback.
+COMPACT_WRITES = 4 * SCROLLBACK_LINES
+# Everything else runs as a job on its own thread; these change the
+# terminal itself (or open a window) and stay on the Tk thread.
+SHELL_COMMANDS = {"cd", "pwd", "clear", "whoami", "date", "notes", "exit", "jobs", "fg", "kill"}
+JOBS_POLL_MS = 50
+CAT_CHUNK = 1024 * 1024
+
+
+def tail_lines(text, count):
+    # The last count lines of text.
+    pos = len(text) - 1 if text.endswith("\n") else len(text)
+    for _ in range(count):
+        pos = text.rfind("\n", 0, pos)
+        if pos < 0:
+            return text
+    return text[pos + 1:]
+
+
+class TerminalJob:
+    # One command running on a worker thread, in the folder it was started
+    # from. Its output is queued for the window; once cancelled, its next
+    # write or check raises fileops.Cancelled.
+    def __init__(self, number, command, cwd):
+        self.number = number
+        self.command = command
+        self.cwd = cwd
+        self.cancelled = threading.Event()
+        self.thread = None
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise fileops.Cancelled()
+
 
 class Terminal:
     def __init__(self, root, username):
@@ -12,6 +61,18 @@ class Terminal:
         # Sandbox to user’s folder
         self.base_dir = os.path.abspath(os.path.join("users", self.username))
         self.current_dir = self.base_dir
+        self.pending = []
+        self.flush_after = None
+        self.last_flush = 0.0
+        # Listings for ls, tree and cd, shared with My Computer.
+        self.meta = metacache.get(self.username)
+        # Running jobs by number, the one holding the prompt, and their
+        # output as (job, text), with None once a job has finished.
+        self.jobs = {}
+        self.foreground = None
+        self.job_output = collections.deque()
+        self.jobs_poll = None
+        self.local = threading.local()
 
         self.root.title("PseudoOS Terminal")
         self.root.attributes("-fullscreen", True)
@@ -30,6 +91,8 @@ class Terminal:
         self.input_entry.pack(fill="x")
         self.input_entry.bind("<Return>", self.process_command)
         self.input_entry.focus_set()
+        self.root.bind("<Control-c>", self.interrupt)
+        self.output.bind("<Destroy>", lambda e: self.cancel_jobs())
 
         # On launch: show help then prompt
         self.show_commands()
@@ -53,27 +116,146 @@ class Terminal:
             "  whoami             – Show current user\n"
             "  date               – Show current date & time\n"
             "  grep <pat> <file>  – Search for pattern in file\n"
+            "  search <words>     – Search all notes for words\n"
             "  notes <file.txt>   – Open a text file in Notes app\n"
+            "  <command> &        – Run a command in the background\n"
+            "  jobs               – List background jobs\n"
+            "  fg [n]             – Wait for a background job\n"
+            "  kill <n>           – Stop a background job\n"
+            "  Ctrl+C             – Stop the running command\n"
             "  exit               – Close the terminal\n\n"
         )
         self.write_output(help_text)
 
-    def print_prompt(self):
+    def prompt(self):
         rel = os.path.relpath(self.current_dir, self.base_dir)
         if rel == ".":
             rel = "Home"
         else:
             rel = "Home/" + rel
-        prompt = f"{rel}> "
-        self.write_output(prompt, end="")
+        return f"{rel}> "
+
+    def print_prompt(self):
+        self.write_output(self.prompt(), end="")
         self.input_entry.delete(0, tk.END)
         self.input_entry.focus_set()
 
     def process_command(self, event):
+        # Input waits while a foreground job holds the prompt.
+        if self.foreground is not None:
+            return "break"
         cmd_line = self.input_entry.get().strip()
         self.write_output(cmd_line + "\n")
-        self.execute_command(cmd_line)
-        self.print_prompt()
+        background = cmd_line.endswith("&")
+        if background:
+            cmd_line = cmd_line[:-1].strip()
+        parts = cmd_line.split()
+        if parts and parts[0] not in SHELL_COMMANDS:
+            job = self.start_job(cmd_line)
+            if background:
+                self.write_output(f"[{job.number}] {cmd_line}\n")
+            else:
+                self.foreground = job
+        else:
+            self.execute_command(cmd_line)
+        if self.foreground is None:
+            self.print_prompt()
+        else:
+            self.input_entry.delete(0, tk.END)
+
+    def interrupt(self, event=None):
+        if self.foreground is not None:
+            self.foreground.cancel()
+            self.write_output("^C\n")
+        else:
+            self.write_output(self.input_entry.get() + "^C\n")
+            self.print_prompt()
+
+    def start_job(self, command):
+        job = TerminalJob(max(self.jobs, default=0) + 1, command, self.current_dir)
+        self.jobs[job.number] = job
+        job.thread = threading.Thread(target=self.run_job, args=(job,), daemon=True)
+        job.thread.start()
+        if self.jobs_poll is None:
+            self.jobs_poll = ticker.get(self.root).every(JOBS_POLL_MS, self.poll_jobs, owner=self.output)
+        return job
+
+    def run_job(self, job):
+        # Worker thread: write_output and check_job find the job through self.local.
+        self.local.job = job
+        try:
+            self.execute_command(job.command)
+        except fileops.Cancelled:
+            pass
+        except Exception as e:
+            self.job_output.append((job, f"Error: {e}\n"))
+        self.job_output.append((job, None))
+
+    def working_dir(self):
+        # A job resolves paths against the folder it was started from, even
+        # if cd has run since.
+        job = getattr(self.local, "job", None)
+        return job.cwd if job is not None else self.current_dir
+
+    def check_job(self):
+        # Stops a cancelled job at this point; does nothing on the Tk thread.
+        job = getattr(self.local, "job", None)
+        if job is not None:
+            job.check()
+
+    def poll_jobs(self):
+        while self.job_output:
+            job, text = self.job_output.popleft()
+            if text is not None:
+                # Whatever a job wrote before Ctrl+C or kill is dropped.
+                if not job.cancelled.is_set():
+                    self.write_output(text)
+                continue
+            del self.jobs[job.number]
+            if job is self.foreground:
+                self.foreground = None
+                self.print_prompt()
+                continue
+            state = "Terminated" if job.cancelled.is_set() else "Done"
+            notice = f"[{job.number}] {state}  {job.command}\n"
+            if self.foreground is None:
+                # The input line keeps whatever is being typed.
+                notice = "\n" + notice + self.prompt()
+            self.write_output(notice)
+        if not self.jobs:
+            self.jobs_poll.cancel()
+            self.jobs_poll = None
+
+    def cancel_jobs(self):
+        for job in self.jobs.values():
+            job.cancel()
+
+    def find_job(self, args):
+        # The job numbered args[0] ("2" or "%2"), or the newest one.
+        try:
+            job = self.jobs[int(args[0].lstrip("%"))] if args else self.jobs[max(self.jobs)]
+        except (ValueError, KeyError):
+            self.write_output("No such job\n")
+            return None
+        return job
+
+    def list_jobs(self):
+        for number, job in sorted(self.jobs.items()):
+            self.write_output(f"[{number}] Running  {job.command}\n")
+
+    def fg(self, args):
+        job = self.find_job(args)
+        if job is not None:
+            self.write_output(job.command + "\n")
+            self.foreground = job
+
+    def kill(self, args):
+        if not args:
+            self.write_output("Usage: kill <job>\n")
+            return
+        job = self.find_job(args)
+        if job is not None:
+            job.cancel()
 
     def execute_command(self, command):
         if not command:
@@ -103,6 +285,7 @@ class Terminal:
         elif cmd == "cat":
             self.cat(args)
         elif cmd == "clear":
+            self.pending.clear()
             self.output.config(state="normal")
             self.output.delete("1.0", tk.END)
             self.output.config(state="disabled")
@@ -112,8 +295,16 @@ class Terminal:
             self.write_output(time.strftime("%A, %d %B %Y | %H:%M:%S") + "\n")
         elif cmd == "grep":
             self.grep(args)
+        elif cmd == "search":
+            self.search(args)
         elif cmd == "notes":
             self.notes(args)
+        elif cmd == "jobs":
+            self.list_jobs()
+        elif cmd == "fg":
+            self.fg(args)
+        elif cmd == "kill":
+            self.kill(args)
         elif cmd == "exit":
             self.root.destroy()
         else:
@@ -122,32 +313,32 @@ class Terminal:
     def change_directory(self, args):
         target = self.base_dir if not args else os.path.join(self.current_dir, args[0])
         abs_t = os.path.abspath(target)
-        if abs_t.startswith(self.base_dir) and os.path.isdir(abs_t):
+        if abs_t.startswith(self.base_dir) and self.meta.is_dir(abs_t):
             self.current_dir = abs_t
         else:
             self.write_output("Access Denied or Directory not found\n")
 
     def list_directory(self):
         try:
-            for item in sorted(os.listdir(self.current_dir)):
+            for item in sorted(entry[0] for entry in self.meta.listing(self.working_dir())):
                 self.write_output(item + "\n")
         except Exception as e:
             self.write_output(f"Error: {e}\n")
 
     def tree_directory(self):
         def rec(p, indent=""):
-            for i in sorted(os.listdir(p)):
-                full = os.path.join(p, i)
-                self.write_output(indent + i + "\n")
-                if os.path.isdir(full):
-                    rec(full, indent + "    ")
-        rec(self.current_dir)
+            self.check_job()
+            for name, is_dir, size, mtime in sorted(self.meta.listing(p)):
+                self.write_output(indent + name + "\n")
+                if is_dir:
+                    rec(os.path.join(p, name), indent + "    ")
+        rec(self.working_dir())
 
     def mkdir(self, args):
         if not args:
             self.write_output("Usage: mkdir <folder>\n")
             return
-        path = os.path.abspath(os.path.join(self.current_dir, args[0]))
+        path = os.path.abspath(os.path.join(self.working_dir(), args[0]))
         if path.startswith(self.base_dir):
             try:
                 os.makedirs(path, exist_ok=False)
@@ -158,7 +349,7 @@ class Terminal:
         if not args:
             self.write_output("Usage: rmdir <folder>\n")
             return
-        path = os.path.abspath(os.path.join(self.current_dir, args[0]))
+        path = os.path.abspath(os.path.join(self.working_dir(), args[0]))
         if path.startswith(self.base_dir) and os.path.isdir(path):
             try:
                 os.rmdir(path)
@@ -169,10 +360,11 @@ class Terminal:
         if not args:
             self.write_output("Usage: rm <file>\n")
             return
-        path = os.path.abspath(os.path.join(self.current_dir, args[0]))
+        path = os.path.abspath(os.path.join(self.working_dir(), args[0]))
         if path.startswith(self.base_dir) and os.path.isfile(path):
             try:
                 os.remove(path)
+                noteindex.changed(self.username, path)
             except Exception as e:
                 self.write_output(f"Error: {e}\n")
 
@@ -180,31 +372,52 @@ class Terminal:
         if not args:
             self.write_output("Usage: touch <file>\n")
             return
-        path = os.path.abspath(os.path.join(self.current_dir, args[0]))
+        path = os.path.abspath(os.path.join(self.working_dir(), args[0]))
         if path.startswith(self.base_dir):
             open(path, "a").close()
+            noteindex.changed(self.username, path)
 
     def cp(self, args):
         if len(args) != 2:
             self.write_output("Usage: cp <src> <dst>\n")
             return
-        src = os.path.abspath(os.path.join(self.current_dir, args[0]))
-        dst = os.path.abspath(os.path.join(self.current_dir, args[1]))
+        src = os.path.abspath(os.path.join(self.working_dir(), args[0]))
+        dst = os.path.abspath(os.path.join(self.working_dir(), args[1]))
         if src.startswith(self.base_dir) and dst.startswith(self.base_dir):
+            if os.path.isdir(dst):
+                dst = os.path.join(dst, os.path.basename(src))
+            # Copied in chunks under a temporary name, so Ctrl+C stops it
+            # between chunks and leaves any existing dst as it was.
+            copier = fileops.FileJob("copy", [src], os.path.dirname(dst))
+            job = getattr(self.local, "job", None)
+            if job is not None:
+                copier.cancelled = job.cancelled
+            partial = fileops.free_name(os.path.dirname(dst), "." + os.path.basename(dst) + ".part")
             try:
-                import shutil; shutil.copy(src, dst)
+                copier.copy_file(src, partial)
+            except fileops.Cancelled:
+                raise
             except Exception as e:
                 self.write_output(f"Error: {e}\n")
+                return
+            try:
+                os.replace(partial, dst)
+            except OSError as e:
+                os.unlink(partial)
+                self.write_output(f"Error: {e}\n")
+                return
+            noteindex.changed(self.username, dst)
 
     def mv(self, args):
         if len(args) != 2:
             self.write_output("Usage: mv <src> <dst>\n")
             return
-        src = os.path.abspath(os.path.join(self.current_dir, args[0]))
-        dst = os.path.abspath(os.path.join(self.current_dir, args[1]))
+        src = os.path.abspath(os.path.join(self.working_dir(), args[0]))
+        dst = os.path.abspath(os.path.join(self.working_dir(), args[1]))
         if src.startswith(self.base_dir) and dst.startswith(self.base_dir):
             try:
                 os.rename(src, dst)
+                noteindex.changed(self.username, src, dst)
             except Exception as e:
                 self.write_output(f"Error: {e}\n")
 
@@ -212,21 +425,41 @@ class Terminal:
         if not args:
             self.write_output("Usage: cat <file>\n")
             return
-        path = os.path.abspath(os.path.join(self.current_dir, args[0]))
+        path = os.path.abspath(os.path.join(self.working_dir(), args[0]))
         if path.startswith(self.base_dir) and os.path.isfile(path):
             with open(path) as f:
-                self.write_output(f.read() + "\n")
+                for chunk in iter(lambda: f.read(CAT_CHUNK), ""):
+                    self.write_output(chunk)
+            self.write_output("\n")
 
     def grep(self, args):
         if len(args) != 2:
             self.write_output("Usage: grep <pattern> <file>\n")
             return
         pat, fname = args
-        path = os.path.abspath(os.path.join(self.current_dir, fname))
+        path = os.path.abspath(os.path.join(self.working_dir(), fname))
         if path.startswith(self.base_dir) and os.path.isfile(path):
-            for line in open(path):
-                if pat in line:
-                    self.write_output(line)
+            with open(path) as f:
+                for line in f:
+                    self.check_job()
+                    if pat in line:
+                        self.write_output(line)
+
+    def search(self, args):
+        if not args:
+            self.write_output("Usage: search <words>\n")
+            return
+        index = noteindex.get(self.username)
+        if not index.ready.is_set():
+            self.write_output("The notes index is still being built, try again in a moment\n")
+            return
+        start = time.perf_counter()
+        results = index.search(" ".join(args), limit=50, prefix=False)
+        elapsed = (time.perf_counter() - start) * 1000
+        for path, hits, line in results:
+            rel = os.path.relpath(path, self.base_dir)
+            self.write_output(f"{rel}:{line}: {noteindex.read_line(path, line).strip()}\n")
+        self.write_output(f"{len(results)} note(s) in {elapsed:.1f} ms\n")
 
     def notes(self, args):
         if not args:
@@ -235,16 +468,39 @@ class Terminal:
         fname = args[0]
         path = os.path.abspath(os.path.join(self.current_dir, fname))
         if path.startswith(self.base_dir) and path.endswith(".txt") and os.path.isfile(path):
-            subprocess.Popen(["python3", "notes.py", self.username, path])
+            launch_app("notes.py", self.username, path)
         else:
             self.write_output("Error: invalid or missing file\n")
 
     def write_output(self, text, end="\n"):
+        # text carries its own newline; end is kept for callers that pass it.
+        # In a job, the text is queued for the Tk thread instead.
+        job = getattr(self.local, "job", None)
+        if job is not None:
+            job.check()
+            self.job_output.append((job, text))
+            return
+        self.pending.append(text)
+        if len(self.pending) > COMPACT_WRITES:
+            self.pending = [tail_lines("".join(self.pending), SCROLLBACK_LINES)]
+        if self.flush_after is None:
+            wait = FLUSH_MS - (time.perf_counter() - self.last_flush) * 1000
+            self.flush_after = self.output.after(max(0, int(wait)), self.flush_output)
+
+    def flush_output(self):
+        self.flush_after = None
+        self.last_flush = time.perf_counter()
+        if not self.pending or not self.output.winfo_exists():
+            return
+        text = "".join(self.pending)
+        self.pending = []
+        if text.count("\n") > SCROLLBACK_LINES:
+            text = tail_lines(text, SCROLLBACK_LINES)
         self.output.config(state="normal")
-        self.output.insert(tk.END, text if end=="" else text)
-        if end == "":
-            # already included
-            pass
+        self.output.insert(tk.END, text)
+        lines = int(self.output.index("end-1c").split(".")[0])
+        if lines > SCROLLBACK_LINES:
+            self.output.delete("1.0", f"{lines - SCROLLBACK_LINES + 1}.0")
         self.output.config(state="disabled")
         self.output.see(tk.END)
 
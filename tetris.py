@@ -1,6 +1,10 @@
 import tkinter as tk
 import random
 import time
+import ticker
+
+
+CLOCK_FORMAT = "%A, %d %B %Y | %H:%M:%S"
 
 
 class InfiniteTetris:
@@ -42,9 +46,15 @@ class InfiniteTetris:
         ]
         self.colors = ["cyan", "yellow", "purple", "orange", "blue", "green", "red"]
 
+        self.clock_text = ""
+        ticker.get(self.root).subscribe(CLOCK_FORMAT, self.set_clock_text, owner=self.canvas)
+
         self.blink = True
         self.show_splash_screen()
 
+    def set_clock_text(self, text):
+        self.clock_text = text
+
     def show_splash_screen(self):
         self.canvas.delete("all")
         self.canvas.create_text(
@@ -187,11 +197,9 @@ class InfiniteTetris:
         elapsed = int(time.time() - self.start_time - self.pause_time)
         mins = elapsed // 60
         secs = elapsed % 60
-        current_time = time.strftime("%A, %d %B %Y | %H:%M:%S")
-
         info_text = (
             f"⏱ Elapsed: {mins}m {secs}s\n"
-            f"{current_time}"
+            f"{self.clock_text}"
         )
         self.canvas.create_text(
             self.width - 250,
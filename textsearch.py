@@ -0,0 +1,79 @@
+import re
+import time
+
+# Find and replace for Notes. Searches run over Python strings copied out of
+# the widget, or block by block for a file in large-file mode, so the Tk text
+# widget is only touched to highlight what is on screen and to apply results.
+# Long runs are cut into slices on the Tk event loop so the window keeps
+# repainting. In large-file mode a match cannot span two blocks.
+SLICE_SECONDS = 0.03
+# Counting yields back to the slicer this often on match-dense text.
+YIELD_EVERY = 2000
+
+
+def compile_query(query, regex=False, case=False):
+    flags = re.MULTILINE if case else re.MULTILINE | re.IGNORECASE
+    return re.compile(query if regex else re.escape(query), flags)
+
+
+def replacement_template(replacement, regex):
+    # A literal replacement must not expand backslashes or group references.
+    return replacement if regex else replacement.replace("\\", "\\\\")
+
+
+def count_matches(pattern, segments, progress):
+    # Generator: counts non-empty matches in each string from segments,
+    # adding to progress["count"] as it goes.
+    for text in segments:
+        found = 0
+        for match in pattern.finditer(text):
+            if match.end() > match.start():
+                found += 1
+                if found % YIELD_EVERY == 0:
+                    progress["count"] += YIELD_EVERY
+                    yield
+        progress["count"] += found % YIELD_EVERY
+        yield
+
+
+def replace_segments(pattern, template, segments, store, progress):
+    # Generator: segments yields (key, text); store(key, new_text) is called
+    # for each segment that changed.
+    for key, text in segments:
+        new_text, n = pattern.subn(template, text)
+        if n:
+            store(key, new_text)
+            progress["count"] += n
+        yield
+
+
+class SlicedJob:
+    def __init__(self, widget, steps, done):
+        self.widget = widget
+        self.steps = steps
+        self.done = done
+        self.after_id = None
+        self.started = time.perf_counter()
+        self.step()
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def step(self):
+        self.after_id = None
+        if not self.widget.winfo_exists():
+            return
+        deadline = time.perf_counter() + SLICE_SECONDS
+        try:
+            while time.perf_counter() < deadline:
+                next(self.steps)
+        except StopIteration:
+            self.done(self)
+            return
+        self.after_id = self.widget.after(1, self.step)
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        self.steps.close()
@@ -0,0 +1,174 @@
+import tkinter as tk
+import sys
+import math
+import time
+
+# One timer per Tk interpreter. Periodic jobs whose deadlines fall close
+# together run on the same wakeup, and wall-clock labels are refreshed from a
+# single once-a-second tick that formats each distinct format string once
+# and only touches widgets whose text actually changed.
+MAX_SLACK = 0.05
+
+
+class Job:
+    def __init__(self, ticker, period, func, args, owner, slack):
+        self.ticker = ticker
+        self.period = period
+        self.func = func
+        self.args = args
+        self.owner = owner
+        self.slack = slack
+        self.deadline = time.monotonic() + period
+        self.cancelled = False
+        self.running = False
+
+    def cancel(self):
+        self.cancelled = True
+        self.ticker.remove(self)
+
+
+class Ticker:
+    def __init__(self, root):
+        self.root = root
+        self.jobs = []
+        self.after_id = None
+        self.armed_for = None
+        self.formats = {}
+        self.clock_job = None
+        self.wakeups = 0
+
+    # --- Periodic jobs ---
+    def every(self, ms, func, *args, owner=None, slack=None):
+        period = ms / 1000.0
+        if slack is None:
+            slack = min(period * 0.1, MAX_SLACK)
+        job = Job(self, period, func, args, owner, slack)
+        self.jobs.append(job)
+        self._arm()
+        return job
+
+    def remove(self, job):
+        if job in self.jobs:
+            self.jobs.remove(job)
+        if not self.jobs and self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = self.armed_for = None
+
+    def _arm(self):
+        if not self.jobs:
+            return
+        deadline = min(job.deadline for job in self.jobs)
+        if self.after_id is not None:
+            if self.armed_for <= deadline:
+                return
+            self.root.after_cancel(self.after_id)
+        delay = max(0, math.ceil((deadline - time.monotonic()) * 1000))
+        self.armed_for = deadline
+        self.after_id = self.root.after(delay, self._run)
+
+    def _run(self):
+        self.after_id = self.armed_for = None
+        self.wakeups += 1
+        now = time.monotonic()
+        due = [j for j in self.jobs if j.deadline - j.slack <= now]
+        for job in due:
+            job.deadline += job.period
+            if job.deadline <= now:
+                job.deadline = now + job.period
+        # Re-armed before anything runs: a job that opens a modal dialog
+        # doesn't return until it closes, and the other jobs (and its own
+        # later ticks, skipped while it is still running) must go on.
+        self._arm()
+        for job in due:
+            if job.cancelled or job.running:
+                continue
+            if job.owner is not None and not self._exists(job.owner):
+                job.cancel()
+                continue
+            job.running = True
+            try:
+                job.func(*job.args)
+            except tk.TclError:
+                # Usually a widget that went away without telling us.
+                job.cancel()
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+            finally:
+                job.running = False
+
+    def _exists(self, widget):
+        try:
+            return bool(widget.winfo_exists())
+        except tk.TclError:
+            return False
+
+    # --- Wall clock ---
+    def text(self, fmt):
+        # Current time in the given format, reusing the tick's result.
+        entry = self.formats.get(fmt)
+        if entry is None or entry["stamp"] != int(time.time()):
+            return time.strftime(fmt)
+        return entry["text"]
+
+    def subscribe(self, fmt, callback, owner=None):
+        entry = self.formats.setdefault(fmt, {"text": None, "stamp": None, "subs": []})
+        sub = [callback, owner]
+        entry["subs"].append(sub)
+        entry["text"], entry["stamp"] = time.strftime(fmt), int(time.time())
+        callback(entry["text"])
+        self._start_clock()
+        return sub
+
+    def unsubscribe(self, sub):
+        for entry in self.formats.values():
+            if sub in entry["subs"]:
+                entry["subs"].remove(sub)
+
+    def bind_label(self, label, fmt, prefix=""):
+        # Re-binding a label replaces its previous subscription.
+        for entry in self.formats.values():
+            entry["subs"][:] = [s for s in entry["subs"] if s[1] is not label]
+        return self.subscribe(fmt, lambda text: label.config(text=prefix + text), owner=label)
+
+    def _start_clock(self):
+        if self.clock_job is None:
+            self.clock_job = self.every(1000, self._tick, slack=0)
+            self._align_clock()
+
+    def _align_clock(self):
+        # Fire just after each wall-clock second so displays never lag.
+        frac = time.time() % 1.0
+        self.clock_job.deadline = time.monotonic() + (1.0 - frac) + 0.005
+        self._arm()
+
+    def _tick(self):
+        now = time.localtime()
+        stamp = int(time.mktime(now))
+        for fmt, entry in list(self.formats.items()):
+            entry["subs"][:] = [s for s in entry["subs"] if s[1] is None or self._exists(s[1])]
+            if not entry["subs"]:
+                del self.formats[fmt]
+                continue
+            text = time.strftime(fmt, now)
+            entry["stamp"] = stamp
+            if text == entry["text"]:
+                continue
+            entry["text"] = text
+            for sub in list(entry["subs"]):
+                try:
+                    sub[0](text)
+                except tk.TclError:
+                    entry["subs"].remove(sub)
+        if not self.formats:
+            self.clock_job.cancel()
+            self.clock_job = None
+        else:
+            self._align_clock()
+
+
+def get(widget):
+    root = widget.nametowidget(".")
+    ticker = getattr(root, "_pseudoos_ticker", None)
+    if ticker is None:
+        ticker = root._pseudoos_ticker = Ticker(root)
+    return ticker
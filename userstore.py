@@ -0,0 +1,386 @@
+import os
+import time
+import hmac
+import hashlib
+import struct
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+STORE_FILE = "users.db"
+LEGACY_FILE = "users.txt"
+# PBKDF2-SHA256 rounds for new passwords. Each record keeps its own count,
+# so raising this only affects accounts created or logged into afterwards.
+KDF_ITERATIONS = int(os.environ.get("PSEUDOOS_KDF_ITERATIONS", "200000"))
+SALT_BYTES = 16
+HASH_BYTES = 32
+# PBKDF2 rounds for accounts imported from users.txt. Cheap enough that a
+# large file imports in seconds per ten thousand accounts; verify raises
+# each one to KDF_ITERATIONS on its first login like any other old record.
+LEGACY_KDF_ITERATIONS = int(os.environ.get("PSEUDOOS_LEGACY_KDF_ITERATIONS", "1000"))
+SHRED_CHUNK = 1024 * 1024
+# PRAGMA user_version once users.txt has been imported.
+LEGACY_IMPORTED = 1
+# Compact when at least this share of the database file is free pages.
+COMPACT_FREE_RATIO = 0.25
+
+
+class UserExistsError(Exception):
+    pass
+
+
+def hash_password(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+def shred(path):
+    # Overwrites a file of plaintext passwords before removing it. Best
+    # effort: copy-on-write filesystems and SSDs may keep the old blocks.
+    try:
+        with open(path, "r+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            for offset in range(0, size, SHRED_CHUNK):
+                f.write(b"\0" * min(SHRED_CHUNK, size - offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def read_varint(data, pos):
+    # SQLite's varint at data[pos:]; returns (value, position after it).
+    value = 0
+    for i in range(8):
+        byte = data[pos + i]
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, pos + i + 1
+    return (value << 8) | data[pos + 8], pos + 9
+
+
+def decode_record(payload):
+    # The column values of one SQLite record.
+    size, pos = read_varint(payload, 0)
+    types = []
+    while pos < size:
+        kind, pos = read_varint(payload, pos)
+        types.append(kind)
+    values = []
+    pos = size
+    for kind in types:
+        if kind in (0, 8, 9):
+            values.append(None if kind == 0 else kind - 8)
+        elif kind <= 6:
+            width = (0, 1, 2, 3, 4, 6, 8)[kind]
+            values.append(int.from_bytes(payload[pos:pos + width], "big", signed=True))
+            pos += width
+        elif kind == 7:
+            values.append(struct.unpack(">d", payload[pos:pos + 8])[0])
+            pos += 8
+        else:
+            width = (kind - 12) // 2
+            value = payload[pos:pos + width]
+            if len(value) != width:
+                raise ValueError("record runs past its cell")
+            values.append(value.decode("utf-8") if kind % 2 else value)
+            pos += width
+    return values
+
+
+def scan_pages(path):
+    # Account rows found by reading the database file's pages directly,
+    # without its b-tree, as sqlite3's .recover does: accounts is a WITHOUT
+    # ROWID table, so its rows are the cells of index pages, leaf (type 10)
+    # and interior (type 2, after a 4-byte child page number) alike.
+    # Records too big for one page, and anything that doesn't decode as an
+    # account, are skipped; the write-ahead log is not read.
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < 100 or not data.startswith(b"SQLite format 3\0"):
+        return
+    page_size = int.from_bytes(data[16:18], "big")
+    page_size = 65536 if page_size == 1 else page_size
+    usable = page_size - data[20]
+    max_local = (usable - 12) * 64 // 255 - 23
+    for start in range(0, len(data) - page_size + 1, page_size):
+        page = data[start:start + page_size]
+        header = 100 if start == 0 else 0
+        if page[header] not in (2, 10):
+            continue
+        interior = page[header] == 2
+        cells = int.from_bytes(page[header + 3:header + 5], "big")
+        pointers = header + (12 if interior else 8)
+        for i in range(cells):
+            try:
+                pointer = int.from_bytes(page[pointers + 2 * i:pointers + 2 * i + 2], "big")
+                size, pos = read_varint(page, pointer + (4 if interior else 0))
+                if size > max_local:
+                    continue
+                row = decode_record(page[pos:pos + size])
+            except (IndexError, ValueError, struct.error):
+                continue
+            if (len(row) == 5 and isinstance(row[0], str) and isinstance(row[1], bytes) and len(row[1]) == SALT_BYTES
+                    and isinstance(row[2], bytes) and len(row[2]) == HASH_BYTES
+                    and isinstance(row[3], int) and row[3] >= 1 and isinstance(row[4], float)):
+                yield tuple(row)
+
+
+def salvage_accounts(path):
+    # (rows, rows found only in raw pages, lost key range, user_version)
+    # from a damaged store. Rows are first read through SQLite in key order
+    # from both ends, which also sees the write-ahead log, until damage
+    # stops each scan. The rows between the two stopping points (the lost
+    # range, None if there was none) are then looked for in the file's
+    # pages directly.
+    found = {}
+    lost = None
+    version = 0
+    try:
+        db = sqlite3.connect(path, timeout=10, isolation_level=None)
+    except sqlite3.DatabaseError:
+        db = None
+    if db is not None:
+        try:
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+        except sqlite3.DatabaseError:
+            pass
+        low = high = None
+        for descending in (False, True):
+            sql = "SELECT username, salt, hash, iterations, created FROM accounts"
+            if descending:
+                sql += (" WHERE username > ?" if low is not None else "") + " ORDER BY username DESC"
+            else:
+                sql += " ORDER BY username"
+            try:
+                for row in db.execute(sql, (low,) if descending and low is not None else ()):
+                    found[row[0]] = row
+                    if descending:
+                        high = row[0]
+                    else:
+                        low = row[0]
+            except sqlite3.DatabaseError:
+                lost = (low, high)
+                continue
+            break
+        db.close()
+    else:
+        lost = (None, None)
+    from_pages = 0
+    if lost is not None:
+        try:
+            for row in scan_pages(path):
+                if row[0] not in found:
+                    found[row[0]] = row
+                    from_pages += 1
+        except OSError:
+            pass
+    return list(found.values()), from_pages, lost, version
+
+
+class UserStore:
+    def __init__(self, path=STORE_FILE, iterations=KDF_ITERATIONS, legacy_path=LEGACY_FILE):
+        self.path = path
+        self.iterations = iterations
+        # Problems found while reading the store; callers decide how to
+        # show them. Nothing here raises for a bad record.
+        self.problems = []
+        try:
+            self.db = self._open()
+        except sqlite3.DatabaseError as e:
+            self.db = self._quarantine(e)
+        if legacy_path and any(os.path.exists(legacy_path + suffix) for suffix in ("", ".migrating", ".migrated")):
+            self.migrate_legacy(legacy_path)
+
+    def _open(self):
+        # SQLite takes the file locks; concurrent writers wait up to the
+        # timeout instead of failing.
+        db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS accounts ("
+                " username TEXT PRIMARY KEY, salt BLOB NOT NULL, hash BLOB NOT NULL,"
+                " iterations INTEGER NOT NULL, created REAL NOT NULL) WITHOUT ROWID"
+            )
+        except sqlite3.DatabaseError:
+            db.close()
+            raise
+        return db
+
+    def _quarantine(self, error):
+        # A damaged store is moved aside rather than taking down the login
+        # screen, and every account that can still be read from it is
+        # copied into a new one; the caller reports what was lost through
+        # self.problems.
+        moved = f"{self.path}.corrupt-{int(time.time())}"
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.replace(self.path + suffix, moved + suffix)
+        rows, from_pages, lost, version = salvage_accounts(moved)
+        db = self._open()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            before = db.total_changes
+            db.executemany("INSERT OR IGNORE INTO accounts VALUES (?, ?, ?, ?, ?)", rows)
+            recovered = db.total_changes - before
+            db.execute(f"PRAGMA user_version = {int(version)}")
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        message = (f"User store {self.path} was damaged ({error}). {recovered} account(s) were recovered "
+                   f"into a new store; the damaged file was moved to {moved}.")
+        if recovered < len(rows):
+            message += f" {len(rows) - recovered} unreadable record(s) were dropped."
+        if lost is not None:
+            low, high = (repr(key) if key is not None else "the " + end for key, end in zip(lost, ("start", "end")))
+            message += (f" Accounts between {low} and {high} could not be read through the table; "
+                        f"{from_pages} of them were found by reading its pages directly.")
+        self.report(message)
+        return db
+
+    def report(self, message):
+        self.problems.append(message)
+        print(f"[userstore] {message}")
+
+    def close(self):
+        self.db.close()
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+
+    def any_users(self):
+        # Cheaper than count() on a large store: stops at the first row.
+        return self.db.execute("SELECT 1 FROM accounts LIMIT 1").fetchone() is not None
+
+    def exists(self, username):
+        row = self.db.execute("SELECT 1 FROM accounts WHERE username = ?", (username,)).fetchone()
+        return row is not None
+
+    def _record(self, username, password, iterations=None):
+        iterations = iterations or self.iterations
+        salt = os.urandom(SALT_BYTES)
+        return (username, salt, hash_password(password, salt, iterations), iterations, time.time())
+
+    def create(self, username, password):
+        try:
+            self.db.execute("INSERT INTO accounts VALUES (?, ?, ?, ?, ?)", self._record(username, password))
+        except sqlite3.IntegrityError:
+            raise UserExistsError(username)
+
+    def create_many(self, accounts, iterations=None):
+        # Inserts (username, password) pairs in one transaction and returns
+        # the number added; names that already exist are left alone.
+        records = [self._record(u, p, iterations) for u, p in accounts]
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            added = self._insert_many(records)
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return added
+
+    def _insert_many(self, records):
+        before = self.db.total_changes
+        self.db.executemany("INSERT OR IGNORE INTO accounts VALUES (?, ?, ?, ?, ?)", records)
+        return self.db.total_changes - before
+
+    def verify(self, username, password):
+        row = self.db.execute(
+            "SELECT salt, hash, iterations FROM accounts WHERE username = ?", (username,)
+        ).fetchone()
+        if row is None:
+            # Spend the same KDF time so unknown names aren't distinguishable.
+            hash_password(password, b"\0" * SALT_BYTES, self.iterations)
+            return False
+        salt, stored, iterations = row
+        if (not isinstance(salt, bytes) or not isinstance(stored, bytes) or len(stored) != HASH_BYTES
+                or not isinstance(iterations, int) or iterations < 1):
+            self.report(f"Skipped corrupt account record for {username!r}")
+            return False
+        if not hmac.compare_digest(hash_password(password, salt, iterations), stored):
+            return False
+        if iterations != self.iterations:
+            self.db.execute(
+                "UPDATE accounts SET salt = ?, hash = ?, iterations = ? WHERE username = ?",
+                self._record(username, password)[1:4] + (username,)
+            )
+        return True
+
+    def legacy_imported(self):
+        return self.db.execute("PRAGMA user_version").fetchone()[0] >= LEGACY_IMPORTED
+
+    def migrate_legacy(self, legacy_path=LEGACY_FILE):
+        # One-shot import of the old "user|password" file. The file is
+        # claimed by renaming it to .migrating, its passwords are hashed
+        # outside the write lock on a thread per CPU (PBKDF2 releases the
+        # GIL), and the rows go in under the lock in the same transaction
+        # that marks the import done. Only then is the file shredded, so a
+        # concurrent importer that read it mid-shred finds the mark and
+        # drops what it read; a run cut short leaves .migrating to be
+        # imported again. Returns (added, skipped).
+        claimed = legacy_path + ".migrating"
+        # Left by versions that kept the plaintext file after importing it.
+        shred(legacy_path + ".migrated")
+        if self.legacy_imported():
+            shred(claimed)
+            if os.path.exists(legacy_path):
+                self.report(f"{legacy_path} was left alone: accounts were already imported from an earlier one")
+            return 0, 0
+        try:
+            os.replace(legacy_path, claimed)
+        except FileNotFoundError:
+            pass
+        accounts, skipped = [], 0
+        try:
+            with open(claimed, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    user, sep, pw = line.rstrip("\n").partition("|")
+                    if not sep or not user.strip() or "|" in pw:
+                        skipped += int(bool(line.strip()))
+                        continue
+                    accounts.append((user.strip(), pw.strip()))
+        except FileNotFoundError:
+            # Another process has finished the import.
+            return 0, 0
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            records = list(pool.map(lambda account: self._record(*account, LEGACY_KDF_ITERATIONS), accounts))
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if self.legacy_imported():
+                self.db.execute("ROLLBACK")
+                shred(claimed)
+                return 0, 0
+            added = self._insert_many(records)
+            self.db.execute(f"PRAGMA user_version = {LEGACY_IMPORTED}")
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        shred(claimed)
+        if skipped:
+            self.report(f"Skipped {skipped} malformed line(s) in {legacy_path}")
+        return added, skipped
+
+    def compact(self):
+        # Run at boot: checks the store's integrity, then folds the
+        # write-ahead log back into the main file and vacuums once enough of
+        # it is free pages. Returns True if it vacuumed. The check reads the
+        # whole file, so it happens here rather than on every open; opening
+        # only fails on damage SQLite notices straight away.
+        try:
+            if self.db.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                raise sqlite3.DatabaseError("integrity check failed")
+        except sqlite3.DatabaseError as e:
+            self.db.close()
+            self.db = self._quarantine(e)
+            return False
+        self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        pages = self.db.execute("PRAGMA page_count").fetchone()[0]
+        free = self.db.execute("PRAGMA freelist_count").fetchone()[0]
+        if pages and free / pages >= COMPACT_FREE_RATIO:
+            self.db.execute("VACUUM")
+            self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return True
+        return False
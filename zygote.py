@@ -0,0 +1,167 @@
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+import supervisor
+
+from apphost import BASE_DIR, PYTHON_EXEC
+
+# Pool configuration. A refill delay of "off" disables automatic refills;
+# idle workers older than the timeout are evicted to give memory back.
+POOL_SIZE = int(os.environ.get("PSEUDOOS_POOL_SIZE", "2"))
+POOL_REFILL_DELAY = os.environ.get("PSEUDOOS_POOL_REFILL_DELAY", "1.0")
+POOL_IDLE_TIMEOUT = float(os.environ.get("PSEUDOOS_POOL_IDLE_TIMEOUT", "600"))
+
+PRELOAD_MODULES = [
+    "tkinter", "tkinter.messagebox", "tkinter.filedialog", "tkinter.simpledialog",
+    "math", "heapq", "random", "shutil", "datetime", "collections",
+    "calculator", "notes", "terminal", "my_computer", "snake", "pong",
+    "tetris", "pathfinder", "maze", "shooter", "taskmanager",
+]
+
+
+def parse_refill_delay(value):
+    if value is None or value == "off":
+        return None
+    return float(value)
+
+
+class Worker:
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [PYTHON_EXEC, os.path.join(BASE_DIR, "zygote.py"), "--worker"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1
+        )
+        supervisor.session().register(self.proc, "zygote-worker")
+        self.spawned_at = time.time()
+        self.ready_at = None
+        self.requested_at = None
+        self.started_at = None
+        self.ready = threading.Event()
+        self.started = threading.Event()
+        threading.Thread(target=self._read_status, daemon=True).start()
+
+    def _read_status(self):
+        # The worker reports "ready <ts>" once warm and "started <ts>" once
+        # the app's first frame is on screen, then drops the pipe.
+        for line in self.proc.stdout:
+            parts = line.split()
+            if parts and parts[0] == "ready":
+                self.ready_at = float(parts[1])
+                self.ready.set()
+            elif parts and parts[0] == "started":
+                self.started_at = float(parts[1])
+                self.started.set()
+        self.proc.stdout.close()
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def idle_since(self):
+        return self.ready_at or self.spawned_at
+
+    def launch_latency(self):
+        if self.started_at is None or self.requested_at is None:
+            return None
+        return self.started_at - self.requested_at
+
+    def hand_off(self, script_name, username, args):
+        command = {"script": script_name, "username": username, "args": list(args)}
+        self.proc.stdin.write(json.dumps(command) + "\n")
+        self.proc.stdin.close()
+        return self.proc
+
+    def terminate(self):
+        if self.alive():
+            self.proc.terminate()
+
+
+class WorkerPool:
+    def __init__(self, size=POOL_SIZE, refill_delay=POOL_REFILL_DELAY, idle_timeout=POOL_IDLE_TIMEOUT):
+        self.size = size
+        self.refill_delay = parse_refill_delay(refill_delay)
+        self.idle_timeout = idle_timeout
+        self.idle = []
+        self.last_worker = None
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self.fill()
+        threading.Thread(target=self._evict_loop, daemon=True).start()
+
+    def fill(self):
+        if self._stop.is_set():
+            return
+        with self.lock:
+            self.idle = [w for w in self.idle if w.alive()]
+            while len(self.idle) < self.size:
+                self.idle.append(Worker())
+
+    def acquire(self):
+        with self.lock:
+            self.idle = [w for w in self.idle if w.alive()]
+            ready = [w for w in self.idle if w.ready.is_set()]
+            worker = (ready or self.idle or [None])[0]
+            if worker is not None:
+                self.idle.remove(worker)
+        if worker is None:
+            worker = Worker()
+        if self.refill_delay is not None and self.size > 0:
+            timer = threading.Timer(self.refill_delay, self.fill)
+            timer.daemon = True
+            timer.start()
+        return worker
+
+    def launch(self, script_name, username, *args):
+        requested_at = time.time()
+        worker = self.acquire()
+        worker.requested_at = requested_at
+        self.last_worker = worker
+        return worker.hand_off(script_name, username, args)
+
+    def _evict_loop(self):
+        while not self._stop.wait(min(self.idle_timeout, 30)):
+            now = time.time()
+            with self.lock:
+                stale = [w for w in self.idle if now - w.idle_since() > self.idle_timeout]
+                self.idle = [w for w in self.idle if w not in stale]
+            for worker in stale:
+                worker.terminate()
+
+    def shutdown(self):
+        self._stop.set()
+        with self.lock:
+            workers, self.idle = self.idle, []
+        for worker in workers:
+            worker.terminate()
+
+
+def worker_main():
+    import importlib
+    import tkinter as tk
+
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+    from apphost import HOSTED_APPS
+
+    root = tk.Tk()
+    root.withdraw()
+    print(f"ready {time.time()}", flush=True)
+
+    line = sys.stdin.readline()
+    if not line:
+        return
+    command = json.loads(line)
+    root.deiconify()
+    HOSTED_APPS[command["script"]](root, command["username"], tuple(command["args"]))
+    root.wait_visibility()
+    print(f"started {time.time()}", flush=True)
+    # Nobody reads our stdout from here on; send app output to stderr.
+    os.dup2(2, 1)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--worker"]:
+        worker_main()